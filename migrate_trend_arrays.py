@@ -0,0 +1,65 @@
+"""
+Migration: Backfill binary arrays on cached trends
+==================================================
+
+LongitudinalTrend now stores its series a second time as packed binary
+arrays (times_blob: int64 unix microseconds, values_blob: float64), which
+the trend analyzers read with np.frombuffer instead of parsing ISO strings.
+
+Opening the database adds the new columns automatically, but trends
+computed before that have them set to NULL and fall back to parsing the
+JSON columns until they are recalculated. This script fills them in from
+the existing JSON time_points/values.
+
+Run once after upgrading:
+
+    python migrate_trend_arrays.py
+
+Safe to re-run — it only touches trends whose binary arrays are missing.
+"""
+
+import sys
+from pathlib import Path
+
+# Make sure the project root is on the path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from openpace.database.connection import init_database, get_db_session
+from openpace.database.models import LongitudinalTrend
+
+
+def migrate():
+    init_database()
+    session = get_db_session()
+
+    trends = session.query(LongitudinalTrend).filter(
+        (LongitudinalTrend.times_blob.is_(None)) |
+        (LongitudinalTrend.values_blob.is_(None))
+    ).all()
+    print(f"Found {len(trends)} trend(s) without binary arrays.\n")
+
+    updated = 0
+    failed = 0
+    for trend in trends:
+        try:
+            trend.set_arrays(trend.time_points, trend.values)
+        except (TypeError, ValueError) as e:
+            print(f"  [Trend {trend.trend_id}] Could not convert "
+                  f"{trend.variable_name}: {e}")
+            failed += 1
+            continue
+        updated += 1
+
+    session.commit()
+
+    print("Migration complete.")
+    print(f"  Trends updated : {updated}")
+    print(f"  Trends failed  : {failed}")
+    if failed:
+        print()
+        print("NOTE: Failed trends keep working from their JSON columns and")
+        print("  get binary arrays the next time they are recalculated.")
+
+
+if __name__ == '__main__':
+    migrate()
@@ -0,0 +1,88 @@
+"""
+Migration: Remove duplicate cached trends
+=========================================
+
+LongitudinalTrend now has a unique index on (patient_id, variable_name)
+(uq_trend_patient_variable), and trend writes upsert on it. Databases
+written by earlier versions can hold more than one trend row for the same
+patient and variable. Opening such a database leaves the unique index
+uncreated and logs a warning, and recalculating trends fails until the
+duplicates are gone.
+
+This script keeps the most recently computed trend of each (patient,
+variable) pair (latest computed_at, then highest trend_id) and deletes
+the older rows. It then reopens the database so the unique index is
+created. Trends are a cache of values derived from observations, so no
+observation data is touched.
+
+Run once after upgrading:
+
+    python migrate_trend_duplicates.py [path/to/openpace.db]
+
+Safe to re-run — when no duplicates are left it only checks the index.
+"""
+
+import sys
+from pathlib import Path
+
+from sqlalchemy import inspect
+
+# Make sure the project root is on the path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from openpace.database.connection import init_database, get_db_session, close_database, db_manager
+from openpace.database.models import LongitudinalTrend
+
+UNIQUE_INDEX = "uq_trend_patient_variable"
+
+
+def migrate(database_path: str = None):
+    init_database(database_path)
+    session = get_db_session()
+
+    rows = session.query(
+        LongitudinalTrend.trend_id,
+        LongitudinalTrend.patient_id,
+        LongitudinalTrend.variable_name,
+    ).order_by(
+        LongitudinalTrend.patient_id,
+        LongitudinalTrend.variable_name,
+        LongitudinalTrend.computed_at.desc(),
+        LongitudinalTrend.trend_id.desc(),
+    ).all()
+
+    # Rows are newest first within each (patient, variable) group, so every
+    # row after the first of its group is an older duplicate
+    stale_ids = []
+    previous_key = None
+    for trend_id, patient_id, variable_name in rows:
+        key = (patient_id, variable_name)
+        if key == previous_key:
+            stale_ids.append(trend_id)
+            print(f"  [Trend {trend_id}] Older duplicate of {variable_name} "
+                  f"for patient {patient_id}")
+        previous_key = key
+    print(f"Found {len(stale_ids)} duplicate trend(s).\n")
+
+    if stale_ids:
+        session.query(LongitudinalTrend).filter(
+            LongitudinalTrend.trend_id.in_(stale_ids)
+        ).delete(synchronize_session=False)
+        session.commit()
+    session.close()
+
+    # Reopening runs the schema upgrade, which creates the unique index now
+    # that no rows violate it
+    close_database()
+    init_database(database_path)
+    index_names = {index['name'] for index in inspect(db_manager.engine).get_indexes(
+        LongitudinalTrend.__tablename__
+    )}
+
+    print("Migration complete.")
+    print(f"  Trends deleted : {len(stale_ids)}")
+    print(f"  Unique index   : {'present' if UNIQUE_INDEX in index_names else 'MISSING'}")
+
+
+if __name__ == '__main__':
+    migrate(sys.argv[1] if len(sys.argv) > 1 else None)
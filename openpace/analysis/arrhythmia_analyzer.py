@@ -8,9 +8,10 @@ and calculates progression rates for atrial fibrillation and other arrhythmias.
 from typing import Dict, Any, List, Optional
 from datetime import datetime, timedelta
 import numpy as np
-from scipy import stats
 
 from openpace.database.models import LongitudinalTrend
+from openpace.utils.arrays import rolling_mean
+from openpace.utils.regression import linregress
 
 
 class ArrhythmiaAnalyzer:
@@ -53,18 +54,17 @@ class ArrhythmiaAnalyzer:
                 'current_points': len(trend.values)
             }
 
-        time_points = [datetime.fromisoformat(tp) for tp in trend.time_points]
+        # Timestamps stay ISO strings; only the endpoints are parsed
+        time_points = trend.time_points
+        start = datetime.fromisoformat(time_points[0])
+        end = datetime.fromisoformat(time_points[-1])
         values = np.array(trend.values)
 
         # Calculate rolling average (if enough points)
         rolling_avg = None
         if len(values) >= 3:
             window = min(window_days, len(values))
-            rolling_avg = np.convolve(
-                values,
-                np.ones(window) / window,
-                mode='valid'
-            )
+            rolling_avg = rolling_mean(values, window)
 
         # Identify burden episodes by level
         episodes = ArrhythmiaAnalyzer._categorize_episodes(time_points, values)
@@ -98,37 +98,35 @@ class ArrhythmiaAnalyzer:
             'time_metrics': time_metrics,
             'data_points': len(values),
             'observation_period': {
-                'start': time_points[0].isoformat(),
-                'end': time_points[-1].isoformat(),
-                'days': (time_points[-1] - time_points[0]).days
+                'start': start.isoformat(),
+                'end': end.isoformat(),
+                'days': (end - start).days
             }
         }
 
     @staticmethod
-    def _categorize_episodes(time_points: List[datetime],
+    def _categorize_episodes(time_points: List[str],
                             values: np.ndarray) -> Dict[str, Any]:
         """Categorize burden episodes by severity level."""
-        minimal_episodes = []
-        low_episodes = []
-        moderate_episodes = []
-        high_episodes = []
-
-        for i, (tp, val) in enumerate(zip(time_points, values)):
-            episode = {
-                'timestamp': tp.isoformat(),
-                'burden_percent': float(val)
-            }
+        # Level per value in one vectorized pass: 0 minimal, 1 low,
+        # 2-3 moderate (below MODERATE or HIGH), 4 high
+        levels = np.searchsorted(
+            [ArrhythmiaAnalyzer.MINIMAL_BURDEN, ArrhythmiaAnalyzer.LOW_BURDEN,
+             ArrhythmiaAnalyzer.MODERATE_BURDEN, ArrhythmiaAnalyzer.HIGH_BURDEN],
+            values, side='right'
+        )
+        burdens = values.tolist()
 
-            if val < ArrhythmiaAnalyzer.MINIMAL_BURDEN:
-                minimal_episodes.append(episode)
-            elif val < ArrhythmiaAnalyzer.LOW_BURDEN:
-                low_episodes.append(episode)
-            elif val < ArrhythmiaAnalyzer.MODERATE_BURDEN:
-                moderate_episodes.append(episode)
-            elif val < ArrhythmiaAnalyzer.HIGH_BURDEN:
-                moderate_episodes.append(episode)
-            else:
-                high_episodes.append(episode)
+        def episodes_where(mask: np.ndarray) -> List[Dict[str, Any]]:
+            return [
+                {'timestamp': time_points[i], 'burden_percent': float(burdens[i])}
+                for i in np.flatnonzero(mask).tolist()
+            ]
+
+        minimal_episodes = episodes_where(levels == 0)
+        low_episodes = episodes_where(levels == 1)
+        moderate_episodes = episodes_where((levels == 2) | (levels == 3))
+        high_episodes = episodes_where(levels == 4)
 
         return {
             'minimal': {
@@ -165,8 +163,8 @@ class ArrhythmiaAnalyzer:
             }
 
         # Linear regression
-        slope, intercept, r_value, p_value, std_err = stats.linregress(
-            range(len(values)),
+        slope, intercept, r_value, p_value, std_err = linregress(
+            np.arange(len(values)),
             values
         )
 
@@ -197,7 +195,7 @@ class ArrhythmiaAnalyzer:
 
     @staticmethod
     def _classify_burden(values: np.ndarray,
-                        time_points: List[datetime]) -> Dict[str, Any]:
+                        time_points: List[str]) -> Dict[str, Any]:
         """Classify burden pattern clinically."""
         mean_burden = np.mean(values)
         max_burden = np.max(values)
@@ -231,7 +229,7 @@ class ArrhythmiaAnalyzer:
         }
 
     @staticmethod
-    def _calculate_time_metrics(time_points: List[datetime],
+    def _calculate_time_metrics(time_points: List[str],
                                values: np.ndarray) -> Dict[str, Any]:
         """Calculate time-based metrics."""
         # Count days above thresholds
@@ -6,12 +6,13 @@ Uses linear regression to estimate when battery will reach critical threshold.
 """
 
 from typing import Dict, Any, Optional
-from datetime import datetime, timedelta
-from scipy import stats
+from datetime import timedelta
+import numpy as np
 
 from openpace.database.models import LongitudinalTrend
 from openpace.constants import BatteryThresholds, StatisticalThresholds, TimeWindows
 from openpace.exceptions import AnalysisError, InsufficientDataError
+from openpace.utils.regression import linregress
 
 
 class BatteryAnalyzer:
@@ -53,14 +54,14 @@ class BatteryAnalyzer:
                 actual_points=len(trend.values)
             )
 
-        # Convert time points to days since first observation
-        time_points = [datetime.fromisoformat(tp) for tp in trend.time_points]
-        start_time = time_points[0]
-        days = [(tp - start_time).total_seconds() / StatisticalThresholds.SECONDS_PER_DAY
-                for tp in time_points]
+        # Convert time points to days since first observation (one vector
+        # subtraction on the stored datetime64 times)
+        times, values = trend.load_arrays()
+        start_time = times[0].item()
+        days = (times - times[0]) / np.timedelta64(1, 's') / StatisticalThresholds.SECONDS_PER_DAY
 
         # Linear regression
-        slope, intercept, r_value, p_value, std_err = stats.linregress(days, trend.values)
+        slope, intercept, r_value, p_value, std_err = linregress(days, values)
 
         # Predict ERI date
         eri_date = None
@@ -115,7 +116,7 @@ class BatteryAnalyzer:
             'remaining_capacity_percent': remaining_capacity,
             'confidence': confidence,
             'data_points': len(trend.values),
-            'observation_period_days': max(days),
+            'observation_period_days': float(days.max()),
         }
 
     @staticmethod
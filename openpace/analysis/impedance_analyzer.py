@@ -10,6 +10,7 @@ from datetime import datetime
 import numpy as np
 
 from openpace.database.models import LongitudinalTrend
+from openpace.utils.regression import linregress
 
 
 class ImpedanceAnalyzer:
@@ -52,12 +53,21 @@ class ImpedanceAnalyzer:
 
         anomalies = []
         values = trend.values
-        time_points = [datetime.fromisoformat(tp) for tp in trend.time_points]
-
-        # Calculate differences between consecutive measurements
-        for i in range(1, len(values)):
+        value_array = np.asarray(values, dtype=np.float64)
+
+        # Consecutive differences and all threshold checks in one vector
+        # pass; anomalies are sparse, so only flagged points are visited
+        deltas = np.diff(value_array)
+        current = value_array[1:]
+        flagged = ((deltas > ImpedanceAnalyzer.FRACTURE_THRESHOLD) |
+                   (deltas < ImpedanceAnalyzer.FAILURE_THRESHOLD) |
+                   (current < ImpedanceAnalyzer.NORMAL_RANGE_MIN) |
+                   (current > ImpedanceAnalyzer.NORMAL_RANGE_MAX))
+
+        for i in (np.flatnonzero(flagged) + 1).tolist():
             delta = values[i] - values[i-1]
             current_value = values[i]
+            timestamp = datetime.fromisoformat(trend.time_points[i]).isoformat()
 
             # Check for fracture (sudden increase)
             if delta > ImpedanceAnalyzer.FRACTURE_THRESHOLD:
@@ -68,7 +78,7 @@ class ImpedanceAnalyzer:
                 )
                 anomalies.append({
                     'type': 'possible_fracture',
-                    'timestamp': time_points[i].isoformat(),
+                    'timestamp': timestamp,
                     'previous_value': values[i-1],
                     'current_value': current_value,
                     'delta': delta,
@@ -86,7 +96,7 @@ class ImpedanceAnalyzer:
                 )
                 anomalies.append({
                     'type': 'possible_insulation_failure',
-                    'timestamp': time_points[i].isoformat(),
+                    'timestamp': timestamp,
                     'previous_value': values[i-1],
                     'current_value': current_value,
                     'delta': delta,
@@ -99,7 +109,7 @@ class ImpedanceAnalyzer:
             if current_value < ImpedanceAnalyzer.NORMAL_RANGE_MIN:
                 anomalies.append({
                     'type': 'below_normal_range',
-                    'timestamp': time_points[i].isoformat(),
+                    'timestamp': timestamp,
                     'previous_value': values[i-1],
                     'current_value': current_value,
                     'delta': delta,
@@ -111,7 +121,7 @@ class ImpedanceAnalyzer:
             elif current_value > ImpedanceAnalyzer.NORMAL_RANGE_MAX:
                 anomalies.append({
                     'type': 'above_normal_range',
-                    'timestamp': time_points[i].isoformat(),
+                    'timestamp': timestamp,
                     'previous_value': values[i-1],
                     'current_value': current_value,
                     'delta': delta,
@@ -211,13 +221,14 @@ class ImpedanceAnalyzer:
 
         # Basic statistics
         values = np.array(trend.values)
-        time_points = [datetime.fromisoformat(tp) for tp in trend.time_points]
+        # Only the observation period endpoints are needed
+        first_time = datetime.fromisoformat(trend.time_points[0])
+        last_time = datetime.fromisoformat(trend.time_points[-1])
 
         # Calculate trend direction
         if len(values) >= 3:
-            from scipy import stats as scipy_stats
-            slope, intercept, r_value, p_value, std_err = scipy_stats.linregress(
-                range(len(values)),
+            slope, intercept, r_value, p_value, std_err = linregress(
+                np.arange(len(values)),
                 values
             )
             trend_direction = 'increasing' if slope > 5 else ('decreasing' if slope < -5 else 'stable')
@@ -260,9 +271,9 @@ class ImpedanceAnalyzer:
             'recommendation': recommendation,
             'data_points': len(values),
             'observation_period': {
-                'start': time_points[0].isoformat(),
-                'end': time_points[-1].isoformat(),
-                'days': (time_points[-1] - time_points[0]).days
+                'start': first_time.isoformat(),
+                'end': last_time.isoformat(),
+                'days': (last_time - first_time).days
             }
         }
 
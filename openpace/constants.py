@@ -110,6 +110,10 @@ class EGMConstants:
     # Butterworth filter order
     FILTER_ORDER = 4
 
+    # Long-recording filtering (samples)
+    STREAMING_FILTER_THRESHOLD = 1_000_000  # Above this, filter block-wise
+    STREAMING_FILTER_BLOCK_SIZE = 65536     # Samples per filter block
+
 
 # =============================================================================
 # STATISTICAL ANALYSIS THRESHOLDS
@@ -4,13 +4,79 @@ Database Connection Management
 Handles SQLite database initialization and session management.
 """
 
+import json
+import logging
 import os
 from pathlib import Path
-from sqlalchemy import create_engine, event
+from sqlalchemy import create_engine, event, inspect, text
 from sqlalchemy.orm import sessionmaker, Session
 from sqlalchemy.pool import StaticPool
 from openpace.database.models import Base
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+logger = logging.getLogger(__name__)
+
+
+def _json_serializer(obj) -> str:
+    """
+    Serialize JSON column values, with orjson when it is installed.
+
+    NumPy arrays and scalars are accepted; values orjson rejects (e.g.
+    integers wider than 64 bits) go through the json module instead.
+    """
+    try:
+        return orjson.dumps(
+            obj, option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+        ).decode()
+    except TypeError:
+        return json.dumps(obj)
+
+
+def _json_deserializer(text: str):
+    """
+    Parse JSON column values, with orjson when it is installed.
+
+    Rows written by the json module may contain NaN/Infinity, which orjson
+    rejects; those fall back to json.loads.
+    """
+    try:
+        return orjson.loads(text)
+    except orjson.JSONDecodeError:
+        return json.loads(text)
+
+
+# Per-connection SQLite settings. Temporary tables/indexes (sorts, GROUP BY)
+# stay in memory and the page cache is raised to 64 MiB (negative = KiB).
+# synchronous/journal_mode keep their durable defaults: file databases hold
+# clinical data, and :memory: databases do not sync or journal to disk anyway.
+_SQLITE_PRAGMAS = (
+    "PRAGMA foreign_keys=ON",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA cache_size=-64000",
+)
+
+
+# Unique indexes that rows of an existing database may violate: a query
+# counting the duplicate groups, and the migration script that removes
+# them. The schema upgrade never deletes rows; it leaves such an index
+# uncreated and logs a warning until the migration has been run.
+_UNIQUE_INDEX_CHECKS = {
+    "uq_trend_patient_variable": (
+        "SELECT COUNT(*) FROM (SELECT 1 FROM longitudinal_trends "
+        "GROUP BY patient_id, variable_name HAVING COUNT(*) > 1)",
+        "migrate_trend_duplicates.py",
+    ),
+}
+
+# Older indexes made redundant by a new one, dropped once it exists
+_REPLACED_INDEXES = {
+    "uq_trend_patient_variable": "idx_trend_patient_variable",
+}
+
 
 class DatabaseManager:
     """
@@ -52,21 +118,85 @@ class DatabaseManager:
             # Use StaticPool for SQLite to avoid threading issues
             connect_args={"check_same_thread": False},
             poolclass=StaticPool,
+            **self._json_options(),
         )
 
-        # Enable foreign key constraints for SQLite
+        # Enable foreign key constraints and memory settings for SQLite
         @event.listens_for(self._engine, "connect")
         def set_sqlite_pragma(dbapi_conn, connection_record):
             cursor = dbapi_conn.cursor()
-            cursor.execute("PRAGMA foreign_keys=ON")
+            for pragma in _SQLITE_PRAGMAS:
+                cursor.execute(pragma)
             cursor.close()
 
         # Create all tables
         Base.metadata.create_all(self._engine)
+        self._upgrade_schema()
 
         # Create session factory
         self._session_factory = sessionmaker(bind=self._engine)
 
+    @staticmethod
+    def _json_options() -> dict:
+        """
+        Engine JSON (de)serializers for JSON columns.
+
+        Returns:
+            create_engine() keyword arguments; empty (stdlib json) when
+            orjson is not installed
+        """
+        if orjson is None:
+            return {}
+        return {
+            "json_serializer": _json_serializer,
+            "json_deserializer": _json_deserializer,
+        }
+
+    def _upgrade_schema(self):
+        """
+        Add columns and indexes introduced after a database was created.
+
+        create_all() only creates missing tables, so nullable columns added
+        to an existing model (e.g. LongitudinalTrend.times_blob) are added
+        here with ALTER TABLE (existing rows get NULL), and new indexes
+        (e.g. idx_observation_transmission_variable_time) are created.
+        A unique index is skipped with a warning while existing rows
+        violate it (see _UNIQUE_INDEX_CHECKS); no rows are deleted here.
+        """
+        with self._engine.begin() as conn:
+            # Inspect on the same connection: with StaticPool a separate
+            # inspector connection would roll this transaction back
+            inspector = inspect(conn)
+            for table in Base.metadata.sorted_tables:
+                existing = {col['name'] for col in inspector.get_columns(table.name)}
+                for column in table.columns:
+                    if column.name in existing or not column.nullable:
+                        continue
+                    col_type = column.type.compile(dialect=self._engine.dialect)
+                    conn.execute(text(
+                        f'ALTER TABLE {table.name} ADD COLUMN {column.name} {col_type}'
+                    ))
+
+                existing_indexes = {index['name'] for index in inspector.get_indexes(table.name)}
+                for index in table.indexes:
+                    if index.name in existing_indexes:
+                        continue
+                    if index.name in _UNIQUE_INDEX_CHECKS:
+                        count_sql, migration = _UNIQUE_INDEX_CHECKS[index.name]
+                        duplicates = conn.execute(text(count_sql)).scalar()
+                        if duplicates:
+                            logger.warning(
+                                f"Unique index {index.name} not created: {table.name} "
+                                f"has duplicate rows in {duplicates} group(s). "
+                                f"Run {migration} to remove them."
+                            )
+                            continue
+                    index.create(conn)
+                    if index.name in _REPLACED_INDEXES:
+                        conn.execute(text(
+                            f'DROP INDEX IF EXISTS {_REPLACED_INDEXES[index.name]}'
+                        ))
+
     def _get_default_database_path(self) -> str:
         """
         Get the default database path.
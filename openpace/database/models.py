@@ -5,6 +5,8 @@ SQLAlchemy ORM models for storing pacemaker data from HL7 messages.
 """
 
 from datetime import datetime
+from typing import Tuple
+import numpy as np
 from sqlalchemy import (
     Column,
     Integer,
@@ -18,9 +20,10 @@ from sqlalchemy import (
     ForeignKey,
     JSON,
     Index,
+    text,
 )
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import relationship, validates
 
 Base = declarative_base()
 
@@ -228,6 +231,10 @@ class Observation(Base):
         Index("idx_observation_variable", "variable_name"),
         Index("idx_observation_time", "observation_time"),
         Index("idx_observation_transmission", "transmission_id"),
+        # Covers per-patient trend queries (joined through transmissions);
+        # value_numeric is included so they never touch the table
+        Index("idx_observation_transmission_variable_time",
+              "transmission_id", "variable_name", "observation_time", "value_numeric"),
     )
 
     def __repr__(self):
@@ -244,7 +251,11 @@ class LongitudinalTrend(Base):
     trend charts. Trends are cached and invalidated when new data is imported.
 
     The time_points and values arrays are parallel arrays stored as JSON,
-    allowing efficient storage and retrieval of time series data.
+    allowing efficient storage and retrieval of time series data. The same
+    series is also stored as packed binary arrays (times_blob, values_blob)
+    that load_arrays() reads back without any parsing. Assigning time_points
+    or values clears the binary copy until set_arrays() is called again, and
+    clears the stored battery depletion fit so analyzers refit the new series.
 
     Attributes:
         trend_id: Auto-incrementing unique identifier (primary key)
@@ -252,10 +263,16 @@ class LongitudinalTrend(Base):
         variable_name: Variable being trended (e.g., "battery_voltage")
         time_points: JSON array of ISO 8601 timestamp strings
         values: JSON array of numeric values (parallel to time_points)
+        times_blob: Packed int64 microseconds since the Unix epoch (parallel to values)
+        values_blob: Packed float64 values
         min_value: Minimum value in the dataset
         max_value: Maximum value in the dataset
         mean_value: Mean (average) of all values
         std_dev: Standard deviation of values
+        slope: Battery depletion regression slope in V/day (battery_voltage only)
+        intercept: Regression intercept in V at the first time point
+        r_squared: Coefficient of determination of the regression
+        eri_date: Predicted date the battery reaches ERI (None if not depleting)
         start_date: Date of first observation in trend
         end_date: Date of last observation in trend
         computed_at: Timestamp when trend was computed (for cache invalidation)
@@ -285,12 +302,22 @@ class LongitudinalTrend(Base):
     time_points = Column(JSON, nullable=False)  # Array of ISO timestamps
     values = Column(JSON, nullable=False)  # Array of numeric values
 
+    # Same series as packed binary arrays (NULL for rows written before they existed)
+    times_blob = Column(LargeBinary, nullable=True)  # int64 unix microseconds
+    values_blob = Column(LargeBinary, nullable=True)  # float64 values
+
     # Statistics
     min_value = Column(Float, nullable=True)
     max_value = Column(Float, nullable=True)
     mean_value = Column(Float, nullable=True)
     std_dev = Column(Float, nullable=True)
 
+    # Battery depletion fit, computed when the trend is written
+    slope = Column(Float, nullable=True)
+    intercept = Column(Float, nullable=True)
+    r_squared = Column(Float, nullable=True)
+    eri_date = Column(DateTime, nullable=True)
+
     # Timestamps
     start_date = Column(DateTime, nullable=False)
     end_date = Column(DateTime, nullable=False)
@@ -298,9 +325,68 @@ class LongitudinalTrend(Base):
 
     # Indexes
     __table_args__ = (
-        Index("idx_trend_patient_variable", "patient_id", "variable_name"),
+        # One trend per patient and variable; trend writes upsert on it
+        Index("uq_trend_patient_variable", "patient_id", "variable_name", unique=True),
+        # Upcoming ERI dates across patients (battery trends with a prediction)
+        Index("idx_trend_battery_eri", "eri_date",
+              sqlite_where=text("variable_name = 'battery_voltage' AND eri_date IS NOT NULL")),
     )
 
+    @validates('time_points', 'values')
+    def _clear_arrays(self, key, series):
+        """Drop the binary copy and the stored fit when the JSON series is replaced."""
+        self.times_blob = None
+        self.values_blob = None
+        self.slope = self.intercept = self.r_squared = self.eri_date = None
+        return series
+
+    def set_arrays(self, times, values):
+        """
+        Store the binary copy of the series.
+
+        Args:
+            times: Observation times (datetimes, ISO strings or datetime64)
+            values: Numeric values, parallel to times
+        """
+        self.times_blob, self.values_blob = LongitudinalTrend.pack_arrays(times, values)
+
+    @staticmethod
+    def pack_arrays(times, values) -> Tuple[bytes, bytes]:
+        """
+        Pack a series into the (times_blob, values_blob) column values.
+
+        Args:
+            times: Observation times (datetimes, ISO strings or datetime64)
+            values: Numeric values, parallel to times
+
+        Returns:
+            Tuple of (int64 unix-microsecond bytes, float64 bytes)
+        """
+        times = np.asarray(times, dtype='datetime64[us]')
+        return (times.view(np.int64).tobytes(),
+                np.asarray(values, dtype=np.float64).tobytes())
+
+    def load_arrays(self) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Load the series as NumPy arrays.
+
+        Reads the binary columns without copying; rows that predate them
+        fall back to parsing the JSON columns.
+
+        Returns:
+            Tuple of (datetime64[us] times, float64 values), both read-only
+        """
+        if self.times_blob is not None and self.values_blob is not None:
+            times = np.frombuffer(self.times_blob, dtype=np.int64).view('datetime64[us]')
+            values = np.frombuffer(self.values_blob, dtype=np.float64)
+            return times, values
+
+        times = np.array(self.time_points, dtype='datetime64[us]')
+        values = np.array(self.values, dtype=np.float64)
+        times.flags.writeable = False
+        values.flags.writeable = False
+        return times, values
+
     def __repr__(self):
         return f"<LongitudinalTrend(patient={self.patient_id}, var={self.variable_name}, points={len(self.time_points)})>"
 
@@ -0,0 +1,53 @@
+"""
+Shared Database Queries
+
+Lookups issued on every timeline reload, built as lambda statements so
+SQLAlchemy caches their compiled SQL by the lambda's code location and only
+re-binds the parameters on later calls.
+"""
+
+from typing import List, Optional
+from sqlalchemy import lambda_stmt, select
+from sqlalchemy.orm import Session, joinedload
+
+from openpace.database.models import Transmission, LongitudinalTrend
+
+
+def latest_transmission(session: Session, patient_id: str,
+                        with_observations: bool = False) -> Optional[Transmission]:
+    """
+    Most recent transmission of a patient.
+
+    Args:
+        session: Database session
+        patient_id: Patient identifier
+        with_observations: Eagerly load the transmission's observations
+
+    Returns:
+        Transmission, or None if the patient has none
+    """
+    stmt = lambda_stmt(lambda: select(Transmission))
+    if with_observations:
+        stmt += lambda s: s.options(joinedload(Transmission.observations))
+    stmt += lambda s: s.where(
+        Transmission.patient_id == patient_id
+    ).order_by(Transmission.transmission_date.desc()).limit(1)
+
+    return session.execute(stmt).unique().scalars().first()
+
+
+def patient_trends(session: Session, patient_id: str) -> List[LongitudinalTrend]:
+    """
+    All stored trends of a patient.
+
+    Args:
+        session: Database session
+        patient_id: Patient identifier
+
+    Returns:
+        List of LongitudinalTrend
+    """
+    stmt = lambda_stmt(lambda: select(LongitudinalTrend).where(
+        LongitudinalTrend.patient_id == patient_id
+    ))
+    return list(session.execute(stmt).scalars())
@@ -29,7 +29,7 @@ from PyQt6.QtGui import QAction
 
 from openpace.database.connection import init_database, get_db_session
 from openpace.hl7.parser import HL7Parser
-from openpace.database.models import Transmission
+from openpace.database.queries import latest_transmission
 from openpace.gui.widgets.timeline_view import TimelineView
 from openpace.gui.widgets.settings_panel import SettingsPanel
 from openpace.gui.layouts import LayoutMode, LayoutSerializer
@@ -582,9 +582,7 @@ class MainWindow(QMainWindow):
             return
 
         # Query most recent transmission
-        most_recent_transmission = self.db_session.query(Transmission).filter_by(
-            patient_id=current_patient_id
-        ).order_by(Transmission.transmission_date.desc()).first()
+        most_recent_transmission = latest_transmission(self.db_session, current_patient_id)
 
         if not most_recent_transmission:
             QMessageBox.information(
@@ -416,7 +416,7 @@ class EGMViewerWidget(QWidget):
 
             # Redetect peaks on filtered signal
             peaks = EGMProcessor.detect_peaks(
-                filtered.tolist(),
+                filtered,
                 self.egm_data['sample_rate']
             )
             self.egm_data['peaks'] = peaks
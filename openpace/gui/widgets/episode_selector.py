@@ -155,7 +155,7 @@ class EpisodeSelectorWidget(QWidget):
             observations = self.session.query(Observation).join(
                 Observation.transmission
             ).filter(
-                Observation.transmission.has(patient_id=patient_id),
+                Transmission.patient_id == patient_id,
                 Observation.value_blob.isnot(None)  # Only observations with EGM blobs
             ).order_by(
                 Observation.observation_time.desc()
@@ -5,6 +5,7 @@ Displays device programming parameters in an organized, medical-record style for
 Shows bradycardia pacing, tachycardia therapy, sensing, and lead configuration settings.
 """
 
+import functools
 from typing import List, Dict, Any, Optional
 from datetime import datetime
 from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel,
@@ -13,6 +14,22 @@ from PyQt6.QtCore import Qt, pyqtSignal
 from PyQt6.QtGui import QFont
 
 
+@functools.lru_cache(maxsize=256, typed=True)
+def _format_numeric(value: float, unit: Optional[str]) -> str:
+    """
+    Display string of a numeric setting; settings repeat the same few
+    (value, unit) pairs across transmissions (e.g. "60.0 bpm").
+
+    Args:
+        value: Numeric value (typed cache: 60 and 60.0 format differently)
+        unit: Unit of measurement, or None
+
+    Returns:
+        Value followed by its unit, if any
+    """
+    return f"{value} {unit}" if unit else str(value)
+
+
 class SettingsPanel(QWidget):
     """
     Widget displaying pacemaker device settings in a medical-record format.
@@ -39,6 +56,10 @@ class SettingsPanel(QWidget):
         self.transmission = None
         self.settings_data = {}
 
+        # Extracted settings by transmission_id; a transmission's observations
+        # do not change after import, so reloading it skips the extraction
+        self._settings_cache: Dict[int, Dict[str, Dict[str, Any]]] = {}
+
         # Setup UI
         self._init_ui()
 
@@ -149,8 +170,13 @@ class SettingsPanel(QWidget):
             f"Settings from transmission on {trans_date.strftime('%Y-%m-%d %H:%M')}"
         )
 
-        # Extract settings from observations
-        self._extract_settings_from_observations(transmission.observations)
+        # Extract settings from observations (once per transmission)
+        cached = self._settings_cache.get(transmission.transmission_id)
+        if cached is not None:
+            self.settings_data = cached
+        else:
+            self._extract_settings_from_observations(transmission.observations)
+            self._settings_cache[transmission.transmission_id] = self.settings_data
 
         # Populate UI groups
         self._populate_device_info()
@@ -174,11 +200,7 @@ class SettingsPanel(QWidget):
 
             # Get value (numeric or text)
             if obs.value_numeric is not None:
-                value = obs.value_numeric
-                if obs.unit:
-                    value_str = f"{value} {obs.unit}"
-                else:
-                    value_str = str(value)
+                value_str = _format_numeric(obs.value_numeric, obs.unit)
             elif obs.value_text:
                 value_str = obs.value_text
             else:
@@ -464,6 +486,7 @@ class SettingsPanel(QWidget):
         """Clear all settings data."""
         self.transmission = None
         self.settings_data = {}
+        self._settings_cache.clear()
         self.timestamp_label.setText("No data loaded")
 
         # Clear all groups
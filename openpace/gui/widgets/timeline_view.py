@@ -15,10 +15,11 @@ from PyQt6.QtWidgets import (
 )
 from PyQt6.QtCore import Qt, pyqtSignal, QSize, QPoint, QTimer, QRect
 from PyQt6.QtGui import QIcon, QPainter, QColor, QPen
-from sqlalchemy.orm import Session, joinedload
+from sqlalchemy.orm import Session
 from sqlalchemy import func
 
 from openpace.database.models import Patient, Transmission, LongitudinalTrend
+from openpace.database.queries import latest_transmission, patient_trends
 from openpace.processing.trend_calculator import TrendCalculator
 from openpace.gui.layouts import GridLayoutManager, LayoutMode, LayoutSerializer
 from openpace.config import get_config
@@ -678,9 +679,7 @@ class TimelineView(QWidget):
                 calculator = TrendCalculator(self.session)
                 trends = calculator.calculate_all_trends(patient_id)
             else:
-                trends = self.session.query(LongitudinalTrend).filter_by(
-                    patient_id=patient_id
-                ).all()
+                trends = patient_trends(self.session, patient_id)
 
             # Organize trends by variable
             trends_by_var = {t.variable_name: t for t in trends}
@@ -786,12 +785,10 @@ class TimelineView(QWidget):
             self._load_episodes(patient_id)
 
             # Load device settings from most recent transmission
-            # Use joinedload to eagerly load observations
-            most_recent_transmission = self.session.query(Transmission).options(
-                joinedload(Transmission.observations)
-            ).filter_by(
-                patient_id=patient_id
-            ).order_by(Transmission.transmission_date.desc()).first()
+            # Eagerly load observations (one joined query)
+            most_recent_transmission = latest_transmission(
+                self.session, patient_id, with_observations=True
+            )
 
             if most_recent_transmission:
                 print(f"[DEBUG] Loading settings from transmission {most_recent_transmission.transmission_id} with {len(most_recent_transmission.observations)} observations")
@@ -817,29 +814,34 @@ class TimelineView(QWidget):
         """
         from openpace.database.models import Observation
 
-        # Query all numeric observations for this patient
-        observations = self.session.query(Observation).join(
+        # Query all numeric observations for this patient as plain
+        # (variable, time, value) rows; no Observation instances are built
+        rows = self.session.query(
+            Observation.variable_name,
+            Observation.observation_time,
+            Observation.value_numeric,
+        ).join(
             Observation.transmission
         ).filter(
-            Observation.transmission.has(patient_id=patient_id),
+            Transmission.patient_id == patient_id,
             Observation.value_numeric.isnot(None)
         ).all()
 
-        # Group observations by variable name
-        obs_by_var = {}
-        for obs in observations:
-            if obs.variable_name not in obs_by_var:
-                obs_by_var[obs.variable_name] = []
-            obs_by_var[obs.variable_name].append(obs)
+        # Group into parallel (times, values) lists by variable name
+        series_by_var = {}
+        for var_name, observation_time, value in rows:
+            if var_name not in series_by_var:
+                series_by_var[var_name] = ([], [])
+            times, values = series_by_var[var_name]
+            times.append(observation_time)
+            values.append(value)
 
-        print(f"[DEBUG] Raw observation variables: {list(obs_by_var.keys())}")
+        print(f"[DEBUG] Raw observation variables: {list(series_by_var.keys())}")
 
         # Load battery data - try multiple variable names (prefer longevity/percentage over voltage)
         for var in ['battery_longevity', 'battery_percentage', 'battery_voltage']:
-            if var in obs_by_var:
-                obs_list = obs_by_var[var]
-                time_points = [obs.observation_time for obs in obs_list]
-                values = [obs.value_numeric for obs in obs_list]
+            if var in series_by_var:
+                time_points, values = series_by_var[var]
                 # Determine measurement type from variable name
                 if var == 'battery_longevity':
                     measurement_type = 'longevity'
@@ -852,37 +854,29 @@ class TimelineView(QWidget):
                 break
 
         # Load atrial impedance
-        if 'lead_impedance_atrial' in obs_by_var:
-            obs_list = obs_by_var['lead_impedance_atrial']
-            time_points = [obs.observation_time for obs in obs_list]
-            values = [obs.value_numeric for obs in obs_list]
+        if 'lead_impedance_atrial' in series_by_var:
+            time_points, values = series_by_var['lead_impedance_atrial']
             self.atrial_impedance_widget.set_data("Atrial", time_points, values)
             print(f"[DEBUG] Loaded atrial impedance: {len(values)} points")
 
         # Load ventricular impedance
-        if 'lead_impedance_ventricular' in obs_by_var:
-            obs_list = obs_by_var['lead_impedance_ventricular']
-            time_points = [obs.observation_time for obs in obs_list]
-            values = [obs.value_numeric for obs in obs_list]
+        if 'lead_impedance_ventricular' in series_by_var:
+            time_points, values = series_by_var['lead_impedance_ventricular']
             self.vent_impedance_widget.set_data("Ventricular", time_points, values)
             print(f"[DEBUG] Loaded ventricular impedance: {len(values)} points")
 
         # Load AFib burden
-        if 'afib_burden_percent' in obs_by_var:
-            obs_list = obs_by_var['afib_burden_percent']
-            time_points = [obs.observation_time for obs in obs_list]
-            values = [obs.value_numeric for obs in obs_list]
+        if 'afib_burden_percent' in series_by_var:
+            time_points, values = series_by_var['afib_burden_percent']
             self.burden_widget.set_data("AFib", time_points, values)
             print(f"[DEBUG] Loaded AFib burden: {len(values)} points")
 
         # Load heart rate data
-        hr_var = 'heart_rate_mean' if 'heart_rate_mean' in obs_by_var else 'heart_rate'
-        if hr_var in obs_by_var:
-            obs_list = obs_by_var[hr_var]
-            time_points = [obs.observation_time for obs in obs_list]
-            values = [obs.value_numeric for obs in obs_list]
-            hr_max = [obs.value_numeric for obs in obs_by_var.get('heart_rate_max', [])] or None
-            hr_min = [obs.value_numeric for obs in obs_by_var.get('heart_rate_min', [])] or None
+        hr_var = 'heart_rate_mean' if 'heart_rate_mean' in series_by_var else 'heart_rate'
+        if hr_var in series_by_var:
+            time_points, values = series_by_var[hr_var]
+            hr_max = series_by_var.get('heart_rate_max', (None, None))[1]
+            hr_min = series_by_var.get('heart_rate_min', (None, None))[1]
             self.heart_rate_widget.set_heart_rate_data(time_points, values, hr_max, hr_min)
             print(f"[DEBUG] Loaded heart rate: {len(values)} points")
 
@@ -891,29 +885,27 @@ class TimelineView(QWidget):
         upper_rate = self.heart_rate_widget.DEFAULT_UPPER_RATE
 
         for var in ['lower_rate_limit', 'set_brady_lowrate']:
-            if var in obs_by_var:
-                obs_list = obs_by_var[var]
-                if obs_list and obs_list[-1].value_numeric:
-                    lower_rate = obs_list[-1].value_numeric
+            if var in series_by_var:
+                values = series_by_var[var][1]
+                if values and values[-1]:
+                    lower_rate = values[-1]
                     break
 
         for var in ['upper_rate_limit', 'set_brady_max_tracking_rate', 'set_brady_max_sensor_rate']:
-            if var in obs_by_var:
-                obs_list = obs_by_var[var]
-                if obs_list and obs_list[-1].value_numeric:
-                    upper_rate = obs_list[-1].value_numeric
+            if var in series_by_var:
+                values = series_by_var[var][1]
+                if values and values[-1]:
+                    upper_rate = values[-1]
                     break
 
         self.heart_rate_widget.set_rate_limits(lower_rate, upper_rate)
         print(f"[DEBUG] Rate limits: {lower_rate} - {upper_rate} bpm")
 
         # Load device settings from most recent transmission
-        # Use joinedload to eagerly load observations
-        most_recent_transmission = self.session.query(Transmission).options(
-            joinedload(Transmission.observations)
-        ).filter_by(
-            patient_id=patient_id
-        ).order_by(Transmission.transmission_date.desc()).first()
+        # Eagerly load observations (one joined query)
+        most_recent_transmission = latest_transmission(
+            self.session, patient_id, with_observations=True
+        )
 
         if most_recent_transmission:
             print(f"[DEBUG] Loading settings from transmission {most_recent_transmission.transmission_id} with {len(most_recent_transmission.observations)} observations")
@@ -936,7 +928,7 @@ class TimelineView(QWidget):
         episode_obs = self.session.query(Observation).join(
             Observation.transmission
         ).filter(
-            Observation.transmission.has(patient_id=patient_id),
+            Transmission.patient_id == patient_id,
             Observation.variable_name.like('episode_%')
         ).all()
 
@@ -1016,7 +1008,7 @@ class TimelineView(QWidget):
         alert_obs = self.session.query(Observation).join(
             Observation.transmission
         ).filter(
-            Observation.transmission.has(patient_id=patient_id),
+            Transmission.patient_id == patient_id,
             Observation.variable_name.like('alert_%')
         ).order_by(Observation.observation_time).all()
 
@@ -15,6 +15,7 @@ import re
 import logging
 from datetime import datetime
 from typing import Dict, List, Optional
+from sqlalchemy import insert
 from sqlalchemy.orm import Session
 
 from openpace.database.models import Patient, Transmission, Observation
@@ -30,6 +31,13 @@ from openpace.constants import FileLimits
 # Configure logging
 logger = logging.getLogger(__name__)
 
+# Observation columns written by the bulk insert in parse_message (all but the
+# autoincrement primary key)
+_OBSERVATION_COLUMNS = tuple(
+    attr.key for attr in Observation.__mapper__.column_attrs
+    if attr.key != 'observation_id'
+)
+
 
 class DataSanitizer:
     """
@@ -89,7 +97,7 @@ class DataSanitizer:
                 )
             )
 
-        logger.debug(f"Sanitized patient ID: '{patient_id}' -> '{sanitized}'")
+        logger.debug("Sanitized patient ID: '%s' -> '%s'", patient_id, sanitized)
         return sanitized
 
     @classmethod
@@ -132,7 +140,7 @@ class DataSanitizer:
                 )
             )
 
-        logger.debug(f"Sanitized patient name: '{patient_name}' -> '{sanitized}'")
+        logger.debug("Sanitized patient name: '%s' -> '%s'", patient_name, sanitized)
         return sanitized.strip()
 
     @classmethod
@@ -205,8 +213,13 @@ class HL7Parser:
         if not hl7_message_text:
             raise HL7ValidationError("HL7 message cannot be empty")
 
-        # Check message size to prevent DoS through memory exhaustion
-        message_size = len(hl7_message_text.encode('utf-8'))
+        # Check message size to prevent DoS through memory exhaustion.
+        # ASCII text (the norm for HL7) is one byte per character, so the
+        # message is only encoded to count its bytes when it is not ASCII
+        if hl7_message_text.isascii():
+            message_size = len(hl7_message_text)
+        else:
+            message_size = len(hl7_message_text.encode('utf-8'))
         if message_size < FileLimits.MIN_HL7_MESSAGE_SIZE:
             raise HL7ValidationError(
                 f"HL7 message too small ({message_size} bytes). "
@@ -330,7 +343,8 @@ class HL7Parser:
         # '_datetime' with a TS/DT value, e.g. Boston Scientific msmt_battery_datetime).
         # Their parsed value is stored in datetime_by_sub_id[sub_id] and applied to all
         # subsequent OBX rows in the same sub-group (tier-2 in the resolution hierarchy).
-        obx_count = 0
+        # Observations are collected and inserted in one batch after the walk
+        observations = []
         try:
             obr_segments = list(msg.segments('OBR'))
         except Exception:
@@ -379,8 +393,7 @@ class HL7Parser:
                         if parsed_dt and sub_id:
                             datetime_by_sub_id[sub_id] = parsed_dt
 
-                    self.session.add(observation)
-                    obx_count += 1
+                    observations.append(observation)
         else:
             # No OBR segments — fall back to simple loop with MSH date only
             datetime_by_sub_id: dict = {}
@@ -402,12 +415,23 @@ class HL7Parser:
                         if parsed_dt and sub_id:
                             datetime_by_sub_id[sub_id] = parsed_dt
 
-                    self.session.add(observation)
-                    obx_count += 1
-
+                    observations.append(observation)
+
+        # Insert every row in one executemany on the table instead of flushing
+        # each Observation through the unit of work (the ORM bulk path drops
+        # None values, which splits numeric and text rows into separate
+        # statements). The transmission's collection is expired so it loads
+        # the new rows on next access.
+        if observations:
+            self.session.execute(insert(Observation.__table__), [
+                {column: getattr(observation, column) for column in _OBSERVATION_COLUMNS}
+                for observation in observations
+            ])
+            self.session.expire(transmission, ['observations'])
         self.session.commit()
 
-        print(f"[OK] Parsed transmission {transmission.transmission_id}: {obx_count} observations")
+        print(f"[OK] Parsed transmission {transmission.transmission_id}: "
+              f"{len(observations)} observations")
         return transmission
 
     def parse_msh(self, msh_segment) -> Dict:
@@ -7,9 +7,15 @@ Medtronic uses a combination of LOINC codes and proprietary MDC
 (Medical Device Communication) codes in their CareLink transmissions.
 """
 
+import array
+import sys
+from types import MappingProxyType
 from typing import Optional, Dict
 from openpace.hl7.translators.base_translator import VendorTranslator, GenericTranslator
 
+# Typical Medtronic dual-chamber channel layout
+_CHANNELS_AV = ('Atrial', 'Ventricular')
+
 
 class MedtronicTranslator(VendorTranslator):
     """
@@ -20,7 +26,7 @@ class MedtronicTranslator(VendorTranslator):
 
     # Medtronic-specific code mappings
     # These are examples - actual codes may vary by device model
-    MEDTRONIC_CODES = {
+    MEDTRONIC_CODES = MappingProxyType({
         # Battery codes
         "MDC_BATTERY_VOLTAGE": "battery_voltage",
         "MDC_BATTERY_REMAINING": "battery_percent",
@@ -74,13 +80,14 @@ class MedtronicTranslator(VendorTranslator):
         # Alerts
         "MDC_ALERT_COUNT": "alert_count",
         "MDC_LEAD_NOISE": "lead_noise_detected",
-    }
+    })
+
+    # Fallback to generic translator for LOINC codes (stateless, shared)
+    generic_translator = GenericTranslator()
 
     def __init__(self):
         super().__init__()
         self.vendor_name = "Medtronic"
-        # Fallback to generic translator for LOINC codes
-        self.generic_translator = GenericTranslator()
 
     def map_observation_id(self, vendor_code: str, observation_text: str = "") -> Optional[str]:
         """
@@ -178,6 +185,9 @@ class MedtronicTranslator(VendorTranslator):
         2. Binary with header + samples
         3. XML/HL7 CDA format
 
+        Binary samples are returned as an ``array.array('h')``; use
+        ``list(samples)`` where a plain list is required (e.g. JSON).
+
         Args:
             blob: Base64-decoded binary EGM data
 
@@ -224,13 +234,11 @@ class MedtronicTranslator(VendorTranslator):
             sample_count = len(samples_data) // 2
 
             # Parse as signed 16-bit integers (big-endian typical for medical devices)
-            import struct
-            samples = []
-            for i in range(sample_count):
-                offset = i * 2
-                if offset + 2 <= len(samples_data):
-                    value = struct.unpack('>h', samples_data[offset:offset+2])[0]
-                    samples.append(value)
+            # into a typed buffer rather than a list of boxed ints
+            samples = array.array('h')
+            samples.frombytes(samples_data[:sample_count * 2])
+            if sys.byteorder == 'little':
+                samples.byteswap()
 
             # Typical Medtronic sample rate is 1000 Hz or 512 Hz
             sample_rate = 1000  # Hz - would be in header
@@ -241,7 +249,7 @@ class MedtronicTranslator(VendorTranslator):
                 'samples': samples,
                 'sample_rate': sample_rate,
                 'sample_count': len(samples),
-                'channels': ['Atrial', 'Ventricular'],  # Typical
+                'channels': _CHANNELS_AV,  # Typical
                 'note': 'Simplified parsing - may need device-specific adjustments'
             }
 
@@ -5,18 +5,28 @@ Decodes and processes electrogram waveforms from pacemaker transmissions.
 Includes signal processing, peak detection, and RR interval calculation.
 """
 
-from typing import Dict, List, Optional, Tuple, Any
+from typing import Callable, Dict, List, Optional, Sequence, Tuple, Any
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from bisect import bisect_left
+import functools
+import multiprocessing
 import struct
 import base64
 import logging
 import numpy as np
 from scipy import signal
 
-from openpace.constants import EGMConstants
+from openpace.constants import EGMConstants, StatisticalThresholds
 from openpace.exceptions import EGMDecodeError
 
 logger = logging.getLogger(__name__)
 
+# Shared, immutable channel layouts referenced by decoded EGM dictionaries
+_CHANNELS_COMBINED = ('Combined',)
+
+# Sorted once so the nearest common sample rate can be found by bisection
+_COMMON_RATES_SORTED = tuple(sorted(EGMConstants.COMMON_SAMPLE_RATES))
+
 
 class EGMDecoder:
     """
@@ -44,15 +54,48 @@ class EGMDecoder:
         if not blob or len(blob) == 0:
             return None
 
-        # Detect format
-        if blob.startswith(b'%PDF'):
-            return EGMDecoder._decode_pdf_egm(blob)
-        elif blob.startswith(b'<?xml') or blob.startswith(b'<'):
+        # Detect format from the leading magic bytes
+        handler = _MAGIC_HANDLERS.get(blob[:4])
+        if handler is not None:
+            return handler(blob)
+        elif blob[:1] == b'<':
             return EGMDecoder._decode_xml_egm(blob)
         else:
             # Assume raw binary
             return EGMDecoder._decode_binary_egm(blob, vendor)
 
+    @staticmethod
+    def decode_many(blobs: Sequence[bytes], vendor: str = 'Generic',
+                    max_workers: Optional[int] = None,
+                    chunksize: int = 32) -> List[Optional[Dict[str, Any]]]:
+        """
+        Decode a batch of EGM blobs across worker processes.
+
+        Each blob is decoded independently, so the batch fans out across
+        cores. Processes are used rather than threads because the sample
+        parsing is Python-level work that would contend for the GIL.
+        Batches of a single blob (or max_workers=1) are decoded in-process.
+
+        Args:
+            blobs: Binary EGM blobs
+            vendor: Device manufacturer (applied to every blob)
+            max_workers: Worker process count (defaults to CPU count)
+            chunksize: Blobs handed to a worker per task
+
+        Returns:
+            Decoded EGM dictionaries (or None) in input order
+        """
+        decode = functools.partial(EGMDecoder.decode_blob, vendor=vendor)
+
+        if len(blobs) <= 1 or max_workers == 1:
+            return [decode(blob) for blob in blobs]
+
+        # Spawn (not fork) workers: the parent may already be running native
+        # thread pools (e.g. Numba kernels) that do not survive a fork
+        with ProcessPoolExecutor(max_workers=max_workers,
+                                 mp_context=multiprocessing.get_context('spawn')) as executor:
+            return list(executor.map(decode, blobs, chunksize=chunksize))
+
     @staticmethod
     def _decode_binary_egm(blob: bytes, vendor: str) -> Dict[str, Any]:
         """
@@ -81,7 +124,7 @@ class EGMDecoder:
             # Choose based on which gives more reasonable values
             # EGM typically ranges from -5mV to +5mV (or -5000 to +5000 in μV)
             samples = samples_be
-            if max(abs(min(samples_le)), abs(max(samples_le))) < max(abs(min(samples_be)), abs(max(samples_be))):
+            if EGMDecoder._peak_abs(samples_le) < EGMDecoder._peak_abs(samples_be):
                 samples = samples_le
 
             # Typical sample rates: 256Hz, 512Hz, 1000Hz
@@ -95,7 +138,7 @@ class EGMDecoder:
                 'sample_count': len(samples),
                 'sample_rate': sample_rate,
                 'duration_seconds': len(samples) / sample_rate,
-                'channels': ['Combined'],  # Single channel assumed
+                'channels': _CHANNELS_COMBINED,  # Single channel assumed
                 'unit': 'μV',  # Microvolts
             }
 
@@ -103,6 +146,19 @@ class EGMDecoder:
             logger.error(f"Failed to decode binary EGM: {e}")
             return {'error': str(e), 'size': len(blob)}
 
+    @staticmethod
+    def _peak_abs(samples: np.ndarray) -> int:
+        """
+        Largest absolute sample value, using two vectorized reductions.
+
+        Args:
+            samples: Numpy array of samples
+
+        Returns:
+            Peak absolute amplitude
+        """
+        return max(-int(samples.min()), int(samples.max()))
+
     @staticmethod
     def _parse_samples(blob: bytes, byteorder: str,
                       header_size: int = EGMConstants.TYPICAL_HEADER_SIZE) -> np.ndarray:
@@ -151,12 +207,16 @@ class EGMDecoder:
         assumed_duration = EGMConstants.DEFAULT_STRIP_DURATION
         estimated_rate = sample_count / assumed_duration
 
-        # Find closest common rate
-        closest_rate = min(
-            EGMConstants.COMMON_SAMPLE_RATES,
-            key=lambda r: abs(r - estimated_rate)
-        )
-        return closest_rate
+        # Find closest common rate (ties resolve to the lower rate)
+        i = bisect_left(_COMMON_RATES_SORTED, estimated_rate)
+        if i == 0:
+            return _COMMON_RATES_SORTED[0]
+        if i == len(_COMMON_RATES_SORTED):
+            return _COMMON_RATES_SORTED[-1]
+
+        lower = _COMMON_RATES_SORTED[i - 1]
+        upper = _COMMON_RATES_SORTED[i]
+        return lower if estimated_rate - lower <= upper - estimated_rate else upper
 
     @staticmethod
     def _decode_pdf_egm(blob: bytes) -> Dict[str, Any]:
@@ -197,6 +257,13 @@ class EGMDecoder:
         }
 
 
+# Format dispatch keyed on the first four bytes of a blob
+_MAGIC_HANDLERS: Dict[bytes, Callable[[bytes], Dict[str, Any]]] = {
+    b'%PDF': EGMDecoder._decode_pdf_egm,
+    b'<?xm': EGMDecoder._decode_xml_egm,
+}
+
+
 class EGMProcessor:
     """
     Signal processing for EGM waveforms.
@@ -211,8 +278,13 @@ class EGMProcessor:
         """
         Apply bandpass filter to remove noise.
 
+        A float64 ndarray is used as-is; lists are still accepted but are
+        converted (copied) on every call. Recordings longer than
+        EGMConstants.STREAMING_FILTER_THRESHOLD samples are filtered
+        block-wise in a single forward pass (not zero-phase).
+
         Args:
-            samples: Raw EGM samples
+            samples: Raw EGM samples (ndarray preferred)
             sample_rate: Samples per second
             lowcut: Low cutoff frequency (Hz)
             highcut: High cutoff frequency (Hz)
@@ -221,16 +293,16 @@ class EGMProcessor:
             Filtered signal as numpy array
         """
         try:
-            # Convert to numpy array
-            signal_array = np.array(samples)
+            # View as float array (no copy when already float64 ndarray)
+            signal_array = np.asarray(samples, dtype=np.float64)
 
-            # Design bandpass filter
-            nyquist = sample_rate / 2
-            low = lowcut / nyquist
-            high = highcut / nyquist
+            # Very long recordings: single forward pass in fixed-size blocks
+            if len(signal_array) > EGMConstants.STREAMING_FILTER_THRESHOLD:
+                sos = EGMProcessor._bandpass_design(sample_rate, lowcut, highcut, 'sos')
+                return EGMProcessor._filter_blocks(sos, signal_array)
 
-            # Butterworth filter
-            b, a = signal.butter(EGMConstants.FILTER_ORDER, [low, high], btype='band')
+            # Butterworth filter (designed once per rate and band)
+            b, a = EGMProcessor._bandpass_design(sample_rate, lowcut, highcut, 'ba')
 
             # Apply filter
             filtered = signal.filtfilt(b, a, signal_array)
@@ -239,7 +311,87 @@ class EGMProcessor:
 
         except Exception as e:
             logger.error(f"Failed to filter signal: {e}")
-            return np.array(samples)
+            return np.asarray(samples)
+
+    @staticmethod
+    @functools.lru_cache(maxsize=64)
+    def _bandpass_design(sample_rate: int, lowcut: float, highcut: float,
+                         output: str) -> Any:
+        """
+        Design the Butterworth bandpass filter (memoized; do not mutate).
+
+        Args:
+            sample_rate: Samples per second
+            lowcut: Low cutoff frequency (Hz)
+            highcut: High cutoff frequency (Hz)
+            output: 'ba' for (b, a) coefficients or 'sos' for sections
+
+        Returns:
+            Filter coefficients in the requested form (shared between calls)
+        """
+        nyquist = sample_rate / 2
+        return signal.butter(EGMConstants.FILTER_ORDER, [lowcut / nyquist, highcut / nyquist],
+                             btype='band', output=output)
+
+    @staticmethod
+    def _filter_blocks(sos: np.ndarray, signal_array: np.ndarray,
+                       block_size: int = EGMConstants.STREAMING_FILTER_BLOCK_SIZE) -> np.ndarray:
+        """
+        Forward-filter a long signal block by block, carrying filter state.
+
+        Unlike filtfilt this is not zero-phase, but it avoids materializing
+        padded and reversed copies of the whole recording. The initial state
+        is scaled to the first sample to suppress the start-up transient.
+
+        Args:
+            sos: Second-order sections filter design
+            signal_array: Signal to filter
+            block_size: Samples processed per block
+
+        Returns:
+            Filtered signal as numpy array
+        """
+        filtered = np.empty_like(signal_array)
+        zi = signal.sosfilt_zi(sos) * signal_array[0]
+
+        for start in range(0, len(signal_array), block_size):
+            stop = start + block_size
+            filtered[start:stop], zi = signal.sosfilt(sos, signal_array[start:stop], zi=zi)
+
+        return filtered
+
+    @staticmethod
+    def filter_channels(signals: Dict[str, Sequence[float]], sample_rate: int,
+                        lowcut: float = EGMConstants.BANDPASS_LOW_CUTOFF,
+                        highcut: float = EGMConstants.BANDPASS_HIGH_CUTOFF,
+                        max_workers: Optional[int] = None) -> Dict[str, np.ndarray]:
+        """
+        Bandpass-filter several EGM channels (e.g. atrial, ventricular, shock).
+
+        Channels are filtered on a thread pool: the scipy filter loops run
+        in compiled code that releases the GIL, so channels proceed in
+        parallel without the process start-up and copying of decode_many.
+        A single channel (or max_workers=1) is filtered in the caller's
+        thread.
+
+        Args:
+            signals: Raw samples per channel name (ndarray preferred)
+            sample_rate: Samples per second (shared by all channels)
+            lowcut: Low cutoff frequency (Hz)
+            highcut: High cutoff frequency (Hz)
+            max_workers: Worker thread count (defaults to the executor's)
+
+        Returns:
+            Filtered signal per channel name, in input order
+        """
+        def filter_channel(samples):
+            return EGMProcessor.filter_signal(samples, sample_rate, lowcut, highcut)
+
+        if len(signals) <= 1 or max_workers == 1:
+            return {name: filter_channel(samples) for name, samples in signals.items()}
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            return dict(zip(signals, executor.map(filter_channel, signals.values())))
 
     @staticmethod
     def detect_peaks(samples: List[float], sample_rate: int,
@@ -247,8 +399,11 @@ class EGMProcessor:
         """
         Detect R-peaks (QRS complexes) in EGM.
 
+        A float64 ndarray is used as-is; lists are still accepted but are
+        converted (copied) on every call.
+
         Args:
-            samples: EGM samples
+            samples: EGM samples (ndarray preferred)
             sample_rate: Samples per second
             min_distance_ms: Minimum time between peaks (milliseconds)
 
@@ -256,7 +411,7 @@ class EGMProcessor:
             List of peak indices
         """
         try:
-            signal_array = np.array(samples)
+            signal_array = np.asarray(samples, dtype=np.float64)
 
             # Convert min distance to samples
             min_distance_samples = int((min_distance_ms / 1000) * sample_rate)
@@ -280,7 +435,7 @@ class EGMProcessor:
         Calculate RR intervals from peak indices.
 
         Args:
-            peaks: List of peak indices
+            peaks: List (or array) of peak indices
             sample_rate: Samples per second
 
         Returns:
@@ -289,13 +444,9 @@ class EGMProcessor:
         if len(peaks) < 2:
             return []
 
-        rr_intervals = []
-        for i in range(1, len(peaks)):
-            interval_samples = peaks[i] - peaks[i-1]
-            interval_ms = (interval_samples / sample_rate) * 1000
-            rr_intervals.append(interval_ms)
-
-        return rr_intervals
+        # Consecutive index differences in one vector pass
+        interval_samples = np.diff(np.asarray(peaks, dtype=np.int64))
+        return ((interval_samples / sample_rate) * 1000).tolist()
 
     @staticmethod
     def calculate_heart_rate(rr_intervals: List[float]) -> Dict[str, float]:
@@ -303,28 +454,34 @@ class EGMProcessor:
         Calculate heart rate statistics from RR intervals.
 
         Args:
-            rr_intervals: RR intervals in milliseconds
+            rr_intervals: RR intervals in milliseconds (list or array)
 
         Returns:
-            Dictionary with HR statistics (bpm)
+            Dictionary with HR statistics (bpm) and the time-domain HRV
+            measures sdnn and rmssd (ms; None with fewer than 2 intervals)
         """
-        if not rr_intervals:
+        if len(rr_intervals) == 0:
             return {}
 
-        # Convert RR intervals to heart rates
+        # Convert RR intervals to heart rates in one vector pass
         # HR (bpm) = 60000 ms/min / RR_interval_ms
-        from openpace.constants import StatisticalThresholds
-        heart_rates = [StatisticalThresholds.MS_PER_MINUTE / rr for rr in rr_intervals if rr > 0]
+        rr = np.asarray(rr_intervals, dtype=np.float64)
+        rr = rr[rr > 0]
 
-        if not heart_rates:
+        if len(rr) == 0:
             return {}
 
+        heart_rates = StatisticalThresholds.MS_PER_MINUTE / rr
+        has_variability = len(rr) >= 2
+
         return {
-            'mean_hr': np.mean(heart_rates),
-            'min_hr': np.min(heart_rates),
-            'max_hr': np.max(heart_rates),
-            'std_hr': np.std(heart_rates),
+            'mean_hr': heart_rates.mean(),
+            'min_hr': heart_rates.min(),
+            'max_hr': heart_rates.max(),
+            'std_hr': heart_rates.std(),
             'median_hr': np.median(heart_rates),
+            'sdnn': rr.std(ddof=1) if has_variability else None,
+            'rmssd': np.sqrt(np.mean(np.diff(rr) ** 2)) if has_variability else None,
         }
 
     @staticmethod
@@ -348,7 +505,7 @@ class EGMProcessor:
         filtered_samples = EGMProcessor.filter_signal(samples, sample_rate)
 
         # Detect peaks
-        peaks = EGMProcessor.detect_peaks(filtered_samples.tolist(), sample_rate)
+        peaks = EGMProcessor.detect_peaks(filtered_samples, sample_rate)
 
         # Calculate RR intervals
         rr_intervals = EGMProcessor.calculate_rr_intervals(peaks, sample_rate)
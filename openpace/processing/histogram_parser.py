@@ -5,12 +5,297 @@ Parses rate histograms, activity histograms, and time-in-zone data from HL7 mess
 These histograms show distribution of heart rates, pacing rates, and patient activity levels.
 """
 
-from typing import Dict, List, Optional, Tuple, Any
+from array import array
+from collections import OrderedDict
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple, Any
+import copy
+import functools
 import json
 import logging
+import re
+import threading
+
+import numpy as np
+
+try:
+    from orjson import loads as _json_loads
+except ImportError:
+    _json_loads = json.loads
 
 logger = logging.getLogger(__name__)
 
+# One "label:value" token of a pipe- or comma-delimited histogram. Tokens
+# start at the beginning of the string or after a delimiter and run up to
+# the next delimiter; the value is converted by _token_value, so tokens
+# whose value is not a float are skipped whole.
+_TOKEN_RE = re.compile(r'(?<![^|,])([^|,:]*):([^|,]*)')
+
+# Record separator joining histograms for batch parsing, and the token
+# pattern that also treats it as a delimiter
+_BATCH_SEP = '\x1e'
+_BATCH_TOKEN_RE = re.compile(r'(?<![^|,\x1e])([^|,:\x1e]*):([^|,\x1e]*)')
+
+# Distinct raw histogram strings remembered per histogram type
+_PARSE_CACHE_SIZE = 4096
+
+_NAN = float('nan')
+
+# Bin kind tags (see _bin_layout)
+_KIND_RANGE = ord('R')
+_KIND_NUMERIC = ord('N')
+
+# Below this many counts, percentages are computed without NumPy
+_SMALL_COUNTS = 32
+
+# Distinct delimited histogram layouts with a generated parser
+_SCHEMA_PARSER_CACHE_SIZE = 128
+
+# Generated parsers keyed by (delimiter, delimiter count, first "label:" prefix)
+_schema_parsers: 'OrderedDict[Tuple[str, int, str], Callable]' = OrderedDict()
+_schema_parsers_lock = threading.Lock()
+
+
+def _detect_format(histogram_data: str) -> str:
+    """
+    Sniff the histogram encoding without attempting to parse it.
+
+    Returns:
+        'empty', 'json' (starts with '{' or '['), or a delimited format
+        from _delimited_format
+    """
+    stripped = histogram_data.lstrip()
+    if not stripped:
+        return 'empty'
+    if stripped[0] in '{[':
+        return 'json'
+    return _delimited_format(histogram_data)
+
+
+def _delimited_format(histogram_data: str) -> str:
+    """
+    Classify a non-JSON histogram string.
+
+    Returns:
+        'piped' (contains '|'), 'csv' (contains ',' and ':') or 'unknown'
+    """
+    if '|' in histogram_data:
+        return 'piped'
+    if ',' in histogram_data and ':' in histogram_data:
+        return 'csv'
+    return 'unknown'
+
+
+def _load_json_object(histogram_data: str) -> Optional[Dict[str, Any]]:
+    """
+    Decode a JSON histogram object, or return None if the data is not one.
+
+    Only called for data that _detect_format sniffed as JSON; a decode
+    failure here means the input is malformed.
+    """
+    try:
+        data = _json_loads(histogram_data)
+    except (ValueError, TypeError) as e:
+        logger.debug(f"Malformed JSON histogram: {e}")
+        return None
+
+    return data if isinstance(data, dict) else None
+
+
+def _bin_layout(bins: List[Any]) -> Tuple[bytes, array]:
+    """
+    Tag each bin's kind and compute its numeric midpoint.
+
+    Kinds are b'R' (range tuple), b'N' (point value) or b'L' (label). The
+    midpoint is the range midpoint, the point value, or NaN for labels.
+    Midpoints are returned as a typed ``array('d')`` so NumPy consumers
+    can view them without copying.
+
+    Args:
+        bins: Parsed bins
+
+    Returns:
+        Tuple of (kinds, midpoints)
+    """
+    kinds = bytearray(b'L' * len(bins))
+    mids = array('d', bytes(8 * len(bins)))
+    for i, bin_val in enumerate(bins):
+        if isinstance(bin_val, tuple):
+            kinds[i] = _KIND_RANGE
+            mids[i] = (bin_val[0] + bin_val[1]) / 2
+        elif isinstance(bin_val, (int, float)):
+            kinds[i] = _KIND_NUMERIC
+            mids[i] = bin_val
+        else:
+            mids[i] = _NAN
+    return bytes(kinds), mids
+
+
+def _numeric_bins(bins: List[Any]) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Numeric-bin mask and midpoints of a histogram's bins as NumPy arrays.
+
+    Always derived from the bins passed in, so histograms whose bins were
+    replaced or edited after parsing are measured on their current bins.
+
+    Args:
+        bins: Histogram bins (empty for histograms without 'bins')
+    """
+    kinds, mids = _bin_layout(bins)
+    numeric = np.frombuffer(kinds, dtype='S1') != b'L'
+    return numeric, np.asarray(mids, dtype=np.float64)
+
+
+def _token_value(text: str) -> float:
+    """
+    Convert the value part of a "label:value[%]" token.
+
+    Any float() syntax is accepted (including exponents, inf and nan);
+    raises ValueError otherwise. Generic and generated parsers share it, so
+    they accept the same tokens.
+    """
+    return float(text.replace('%', '').strip())
+
+
+def _parse_bin(label: str) -> Any:
+    """Parse a token label as a numeric range ("60-70") or keep it as a label."""
+    if '-' in label:
+        try:
+            min_val, max_val = label.split('-')
+            return (float(min_val.strip()), float(max_val.strip()))
+        except ValueError:
+            pass
+    return label.strip()
+
+
+def _single_delimiter(data: str) -> Optional[str]:
+    """Return the token delimiter if data uses exactly one of '|' and ','."""
+    if '|' in data:
+        return None if ',' in data else '|'
+    return ',' if ',' in data else None
+
+
+def _schema_key(data: str, sep: str) -> Tuple[str, int, str]:
+    """Cheap layout fingerprint used to find a generated parser for data."""
+    return sep, data.count(sep), data[:data.find(':') + 1]
+
+
+def _build_schema_parser(sep: str, prefixes: Tuple[str, ...],
+                         histogram: Dict[str, Any]) -> Callable[[str], Optional[Dict[str, Any]]]:
+    """
+    Generate a parser specialized to one delimited histogram layout.
+
+    The generated function splits on the known delimiter, checks every token
+    against its known "label:" prefix and converts the values at the known
+    offsets. Bins are constants of the layout. It returns None when the
+    input does not have this layout.
+
+    Args:
+        sep: Token delimiter
+        prefixes: "label:" prefix of each token, in order
+        histogram: Result of the generic parse that defined the layout
+
+    Returns:
+        Specialized parse function
+    """
+    names = [f't{i}' for i in range(len(prefixes))]
+    checks = ' and '.join(
+        f'{name}.startswith({prefix!r})' for name, prefix in zip(names, prefixes)
+    )
+    values = ', '.join(
+        f'_value({name}[{len(prefix)}:])' for name, prefix in zip(names, prefixes)
+    )
+    source = (
+        f"def _parse_schema(data):\n"
+        f"    try:\n"
+        f"        {', '.join(names)}, = data.split({sep!r})\n"
+        f"    except ValueError:\n"
+        f"        return None\n"
+        f"    if not ({checks}):\n"
+        f"        return None\n"
+        f"    try:\n"
+        f"        percentages = [{values}]\n"
+        f"    except ValueError:\n"
+        f"        return None\n"
+        f"    return {{'bins': list(BINS), 'percentages': percentages,\n"
+        f"            'bin_count': {len(prefixes)}}}\n"
+    )
+    namespace = {
+        '_value': _token_value,
+        'BINS': tuple(histogram['bins']),
+    }
+    exec(source, namespace)
+    return namespace['_parse_schema']
+
+
+def _sum_and_pct(counts: List[float]) -> Tuple[float, List[float]]:
+    """
+    Total of counts and each count as a percentage of it.
+
+    Short inputs use a plain loop (cheaper than building an array); longer
+    ones are summed and scaled with NumPy.
+
+    Args:
+        counts: Bin counts
+
+    Returns:
+        Tuple of (total, percentages); percentages is empty unless total > 0
+    """
+    if len(counts) < _SMALL_COUNTS:
+        total = 0.0
+        for count in counts:
+            total += count
+        if total <= 0:
+            return total, []
+        scale = 100.0 / total
+        return total, [count * scale for count in counts]
+
+    count_array = np.asarray(counts, dtype=np.float64)
+    total = float(count_array.sum())
+    if total <= 0:
+        return total, []
+    return total, (count_array * (100.0 / total)).tolist()
+
+
+def _histogram_from_matches(matches: Iterable[re.Match]) -> Optional[Dict[str, Any]]:
+    """
+    Build a delimited histogram from "label:value" token matches.
+
+    Args:
+        matches: Matches of _TOKEN_RE (or _BATCH_TOKEN_RE), in order
+
+    Returns:
+        Parsed histogram dictionary, or None if there are no tokens
+    """
+    bins = []
+    percentages = []
+
+    for match in matches:
+        label, value = match.groups()
+        try:
+            pct = _token_value(value)
+        except ValueError:
+            continue
+
+        # Numeric range ("60-70") or label ("rest", "light", "60")
+        bins.append(_parse_bin(label))
+        percentages.append(pct)
+
+    if not bins:
+        return None
+
+    return {
+        'bins': bins,
+        'percentages': percentages,
+        'bin_count': len(bins),
+    }
+
+
+def _copy_histogram(histogram: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    """Shallow-copy a cached histogram and its containers for the caller."""
+    if histogram is None:
+        return None
+    return {key: copy.copy(value) for key, value in histogram.items()}
+
 
 class HistogramParser:
     """
@@ -41,23 +326,73 @@ class HistogramParser:
         if not histogram_data:
             return None
 
-        # Try JSON format first
-        try:
-            data = json.loads(histogram_data)
-            return HistogramParser._parse_json_histogram(data, 'rate')
-        except (json.JSONDecodeError, TypeError):
-            pass
+        return _copy_histogram(HistogramParser._parse_rate_histogram_cached(histogram_data))
 
-        # Try pipe-delimited format: "60-70:10%|70-80:45%|80-90:30%"
-        if '|' in histogram_data:
-            return HistogramParser._parse_piped_histogram(histogram_data)
+    @staticmethod
+    @functools.lru_cache(maxsize=_PARSE_CACHE_SIZE)
+    def _parse_rate_histogram_cached(histogram_data: str) -> Optional[Dict[str, Any]]:
+        """Parse rate histogram (memoized; callers must not mutate the result)."""
+        histogram_format = _detect_format(histogram_data)
+        if histogram_format == 'json':
+            data = _load_json_object(histogram_data)
+            if data is not None:
+                return HistogramParser._parse_json_histogram(data, 'rate')
+            # Malformed JSON may still carry delimited tokens
+            histogram_format = _delimited_format(histogram_data)
+
+        match histogram_format:
+            # Pipe-delimited format: "60-70:10%|70-80:45%|80-90:30%"
+            # or comma-separated format: "60-70:10,70-80:45,80-90:30"
+            case 'piped' | 'csv':
+                return HistogramParser._parse_piped_histogram(histogram_data)
+            case _:
+                logger.warning(f"Could not parse rate histogram: {histogram_data[:100]}")
+                return None
 
-        # Try comma-separated format: "60-70:10,70-80:45,80-90:30"
-        if ',' in histogram_data and ':' in histogram_data:
-            return HistogramParser._parse_csv_histogram(histogram_data)
+    @staticmethod
+    def parse_rate_histogram_batch(histograms: Sequence[str]) -> List[Optional[Dict[str, Any]]]:
+        """
+        Parse many heart rate histograms at once.
 
-        logger.warning(f"Could not parse rate histogram: {histogram_data[:100]}")
-        return None
+        Delimited histograms are joined into one buffer and tokenized by a
+        single regex scan; each token is assigned back to its source string
+        by binary search over the string offsets. JSON and other inputs go
+        through parse_rate_histogram individually.
+
+        Args:
+            histograms: Raw histogram strings or JSON
+
+        Returns:
+            Parsed histograms (or None) in input order, as parse_rate_histogram
+        """
+        results = [None] * len(histograms)
+        delimited = []
+
+        for i, histogram_data in enumerate(histograms):
+            if not histogram_data:
+                continue
+            if (_BATCH_SEP in histogram_data or
+                    _detect_format(histogram_data) not in ('piped', 'csv')):
+                results[i] = HistogramParser.parse_rate_histogram(histogram_data)
+            else:
+                delimited.append(i)
+
+        if not delimited:
+            return results
+
+        buffer = _BATCH_SEP.join(histograms[i] for i in delimited)
+        ends = np.cumsum([len(histograms[i]) + 1 for i in delimited])
+        matches = list(_BATCH_TOKEN_RE.finditer(buffer))
+        owners = np.searchsorted(ends, [match.start() for match in matches], side='right')
+
+        grouped = [[] for _ in delimited]
+        for owner, match in zip(owners.tolist(), matches):
+            grouped[owner].append(match)
+
+        for i, group in zip(delimited, grouped):
+            results[i] = _histogram_from_matches(group)
+
+        return results
 
     @staticmethod
     def parse_activity_histogram(histogram_data: str) -> Optional[Dict[str, Any]]:
@@ -75,24 +410,32 @@ class HistogramParser:
         if not histogram_data:
             return None
 
+        return _copy_histogram(HistogramParser._parse_activity_histogram_cached(histogram_data))
+
+    @staticmethod
+    @functools.lru_cache(maxsize=_PARSE_CACHE_SIZE)
+    def _parse_activity_histogram_cached(histogram_data: str) -> Optional[Dict[str, Any]]:
+        """Parse activity histogram (memoized; callers must not mutate the result)."""
         # Activity histograms often use labels
         # Format: "rest:40%|light:30%|moderate:20%|vigorous:10%"
 
-        try:
-            data = json.loads(histogram_data)
-            return HistogramParser._parse_json_histogram(data, 'activity')
-        except (json.JSONDecodeError, TypeError):
-            pass
-
-        if '|' in histogram_data:
-            result = HistogramParser._parse_piped_histogram(histogram_data)
-            if result:
-                # Convert to activity-specific format
-                return {
-                    'activity_levels': result['bins'],
-                    'percentages': result['percentages'],
-                    'type': 'activity'
-                }
+        histogram_format = _detect_format(histogram_data)
+        if histogram_format == 'json':
+            data = _load_json_object(histogram_data)
+            if data is not None:
+                return HistogramParser._parse_json_histogram(data, 'activity')
+            histogram_format = _delimited_format(histogram_data)
+
+        match histogram_format:
+            case 'piped':
+                result = HistogramParser._parse_piped_histogram(histogram_data)
+                if result:
+                    # Convert to activity-specific format
+                    return {
+                        'activity_levels': result['bins'],
+                        'percentages': result['percentages'],
+                        'type': 'activity'
+                    }
 
         return None
 
@@ -112,93 +455,92 @@ class HistogramParser:
         if not histogram_data:
             return None
 
-        try:
-            data = json.loads(histogram_data)
-            return HistogramParser._parse_json_histogram(data, 'pacing')
-        except (json.JSONDecodeError, TypeError):
-            pass
+        return _copy_histogram(HistogramParser._parse_pacing_histogram_cached(histogram_data))
 
-        # Pacing histograms might show: "intrinsic:25%|paced:75%"
-        if '|' in histogram_data or ',' in histogram_data:
-            result = HistogramParser._parse_piped_histogram(histogram_data)
-            if result:
-                return {
-                    **result,
-                    'type': 'pacing'
-                }
+    @staticmethod
+    @functools.lru_cache(maxsize=_PARSE_CACHE_SIZE)
+    def _parse_pacing_histogram_cached(histogram_data: str) -> Optional[Dict[str, Any]]:
+        """Parse pacing histogram (memoized; callers must not mutate the result)."""
+        histogram_format = _detect_format(histogram_data)
+        if histogram_format == 'json':
+            data = _load_json_object(histogram_data)
+            if data is not None:
+                return HistogramParser._parse_json_histogram(data, 'pacing')
+            histogram_format = _delimited_format(histogram_data)
+
+        match histogram_format:
+            # Pacing histograms might show: "intrinsic:25%|paced:75%"
+            case 'piped' | 'csv':
+                result = HistogramParser._parse_piped_histogram(histogram_data)
+                if result:
+                    return {
+                        **result,
+                        'type': 'pacing'
+                    }
 
         return None
 
     @staticmethod
     def _parse_piped_histogram(data: str) -> Optional[Dict[str, Any]]:
         """
-        Parse pipe-delimited histogram format.
+        Parse pipe- or comma-delimited histogram format.
 
         Format: "60-70:10%|70-80:45%|80-90:30%|90-100:15%"
+            or: "60-70:10,70-80:45,80-90:30"
+
+        Strings using a single delimiter are routed to a parser generated
+        for their layout once that layout has been parsed generically; any
+        mismatch drops the generated parser and falls back to the regex.
 
         Args:
-            data: Pipe-delimited string
+            data: Delimited string
 
         Returns:
             Parsed histogram dictionary
         """
-        bins = []
-        percentages = []
-
-        parts = data.split('|')
-        for part in parts:
-            if ':' not in part:
-                continue
-
-            range_part, pct_part = part.split(':', 1)
-
-            # Parse percentage
-            pct_str = pct_part.replace('%', '').strip()
-            try:
-                pct = float(pct_str)
-            except ValueError:
-                continue
-
-            # Parse range
-            if '-' in range_part:
-                # Numeric range: "60-70"
-                try:
-                    min_val, max_val = range_part.split('-')
-                    bins.append((float(min_val.strip()), float(max_val.strip())))
-                except ValueError:
-                    # Label range: "rest", "light", etc.
-                    bins.append(range_part.strip())
-            else:
-                # Single value or label
-                bins.append(range_part.strip())
-
-            percentages.append(pct)
-
-        if not bins:
-            return None
-
-        return {
-            'bins': bins,
-            'percentages': percentages,
-            'bin_count': len(bins),
-        }
+        sep = _single_delimiter(data)
+        if sep is None:
+            return HistogramParser._parse_tokens(data)
+
+        key = _schema_key(data, sep)
+        with _schema_parsers_lock:
+            parser = _schema_parsers.get(key)
+            if parser is not None:
+                _schema_parsers.move_to_end(key)
+
+        if parser is not None:
+            result = parser(data)
+            if result is not None:
+                return result
+            with _schema_parsers_lock:
+                _schema_parsers.pop(key, None)
+
+        result = HistogramParser._parse_tokens(data)
+
+        # Only layouts where every token parsed can be specialized
+        tokens = data.split(sep)
+        if result and result['bin_count'] == len(tokens):
+            prefixes = tuple(token[:token.index(':') + 1] for token in tokens)
+            parser = _build_schema_parser(sep, prefixes, result)
+            with _schema_parsers_lock:
+                _schema_parsers[key] = parser
+                if len(_schema_parsers) > _SCHEMA_PARSER_CACHE_SIZE:
+                    _schema_parsers.popitem(last=False)
+
+        return result
 
     @staticmethod
-    def _parse_csv_histogram(data: str) -> Optional[Dict[str, Any]]:
+    def _parse_tokens(data: str) -> Optional[Dict[str, Any]]:
         """
-        Parse comma-separated histogram format.
-
-        Format: "60-70:10,70-80:45,80-90:30"
+        Parse delimited histogram tokens with the generic token regex.
 
         Args:
-            data: Comma-separated string
+            data: Delimited string
 
         Returns:
             Parsed histogram dictionary
         """
-        # Convert to pipe format and reuse parser
-        piped_data = data.replace(',', '|')
-        return HistogramParser._parse_piped_histogram(piped_data)
+        return _histogram_from_matches(_TOKEN_RE.finditer(data))
 
     @staticmethod
     def _parse_json_histogram(data: Dict, histogram_type: str) -> Dict[str, Any]:
@@ -224,17 +566,23 @@ class HistogramParser:
 
         # If counts but no percentages, calculate percentages
         if counts and not percentages:
-            total = sum(counts)
-            if total > 0:
-                percentages = [(count / total) * 100 for count in counts]
+            percentages = _sum_and_pct(counts)[1]
 
-        # Convert bins to ranges
+        # Convert bin edges to (low, high) ranges using shifted views
         bin_ranges = []
-        for i in range(len(bins) - 1):
-            bin_ranges.append((bins[i], bins[i + 1]))
+        if len(bins) > 1:
+            try:
+                edges = np.asarray(bins, dtype=np.float64)
+            except (TypeError, ValueError):
+                # Non-numeric edges: pair them as given
+                bin_ranges = list(zip(bins[:-1], bins[1:]))
+            else:
+                bin_ranges = list(zip(edges[:-1].tolist(), edges[1:].tolist()))
+
+        bins = bin_ranges if bin_ranges else bins
 
         return {
-            'bins': bin_ranges if bin_ranges else bins,
+            'bins': bins,
             'percentages': percentages,
             'counts': counts,
             'type': histogram_type,
@@ -246,6 +594,9 @@ class HistogramParser:
         """
         Calculate summary statistics from histogram.
 
+        All measures come from one set of NumPy reductions over the bin
+        midpoints and percentages.
+
         Args:
             histogram: Parsed histogram dictionary
 
@@ -261,46 +612,43 @@ class HistogramParser:
         bins = histogram['bins']
         percentages = histogram['percentages']
 
-        if len(bins) != len(percentages):
+        if len(bins) != len(percentages) or len(percentages) == 0:
             return {}
 
-        # Calculate weighted mean (for numeric bins)
+        pcts = np.asarray(percentages, dtype=np.float64)
+        numeric, mids = _numeric_bins(bins)
+
+        # Weighted mean over numeric bins (midpoint for ranges)
         weighted_mean = None
-        numeric_bins = []
-
-        for bin_val, pct in zip(bins, percentages):
-            if isinstance(bin_val, tuple):
-                # Range: use midpoint
-                mid = (bin_val[0] + bin_val[1]) / 2
-                numeric_bins.append(mid)
-            elif isinstance(bin_val, (int, float)):
-                numeric_bins.append(float(bin_val))
-
-        if numeric_bins:
-            weighted_sum = sum(val * (pct / 100) for val, pct in zip(numeric_bins, percentages))
-            weighted_mean = weighted_sum
-
-        # Find mode (bin with highest percentage)
-        max_pct_idx = percentages.index(max(percentages))
-        mode_bin = bins[max_pct_idx]
-
-        # Find median bin (50th percentile)
-        cumulative = 0
-        median_bin = bins[0]
-        for bin_val, pct in zip(bins, percentages):
-            cumulative += pct
-            if cumulative >= 50:
-                median_bin = bin_val
-                break
+        if numeric.any():
+            weighted_mean = float(mids[numeric] @ (pcts[numeric] / 100))
+
+        # Mode: first bin with the highest percentage
+        mode_idx = int(pcts.argmax())
+
+        # Median: first bin where the cumulative percentage reaches 50
+        median_idx = int(np.searchsorted(pcts.cumsum(), 50, side='left'))
+        if median_idx == len(bins):
+            median_idx = 0
 
         return {
             'weighted_mean': weighted_mean,
-            'mode_bin': mode_bin,
-            'median_bin': median_bin,
-            'max_percentage': max(percentages),
+            'mode_bin': bins[mode_idx],
+            'median_bin': bins[median_idx],
+            'max_percentage': percentages[mode_idx],
         }
 
 
+# Standard heart rate zones (as percentage of max HR or absolute bpm)
+_STANDARD_HR_ZONES = {
+    'bradycardia': (0, 60),
+    'normal_rest': (60, 100),
+    'elevated': (100, 120),
+    'tachycardia': (120, 200),
+    'extreme': (200, 300),
+}
+
+
 class TimeInZoneCalculator:
     """
     Calculates time spent in different heart rate or pacing zones.
@@ -309,13 +657,7 @@ class TimeInZoneCalculator:
     """
 
     # Standard heart rate zones (as percentage of max HR or absolute bpm)
-    STANDARD_HR_ZONES = {
-        'bradycardia': (0, 60),
-        'normal_rest': (60, 100),
-        'elevated': (100, 120),
-        'tachycardia': (120, 200),
-        'extreme': (200, 300),
-    }
+    STANDARD_HR_ZONES = _STANDARD_HR_ZONES
 
     @staticmethod
     def calculate_time_in_zones(histogram: Dict[str, Any],
@@ -331,30 +673,67 @@ class TimeInZoneCalculator:
             Dictionary mapping zone names to percentages
         """
         if not zone_definitions:
-            zone_definitions = TimeInZoneCalculator.STANDARD_HR_ZONES
+            zone_definitions = _STANDARD_HR_ZONES
 
         bins = histogram.get('bins', [])
         percentages = histogram.get('percentages', [])
 
         zone_times = {zone: 0.0 for zone in zone_definitions.keys()}
 
-        for bin_val, pct in zip(bins, percentages):
-            # Determine bin range
-            if isinstance(bin_val, tuple):
-                bin_min, bin_max = bin_val
-            elif isinstance(bin_val, (int, float)):
-                # Single value - treat as point
-                bin_min = bin_max = float(bin_val)
-            else:
-                # Non-numeric bin, skip
-                continue
+        # Bin midpoints for numeric bins; non-numeric (label) bins are skipped
+        count = min(len(bins), len(percentages))
+        numeric, mids = _numeric_bins(bins)
+        numeric = numeric[:count]
+        mids = mids[:count]
+        if not numeric.any():
+            return zone_times
+
+        names, mins, maxs, overlapping = TimeInZoneCalculator._zone_table(
+            tuple((name, tuple(bounds)) for name, bounds in zone_definitions.items())
+        )
+        mids = mids[numeric]
+        pcts = np.asarray(percentages[:count], dtype=np.float64)[numeric]
+
+        if overlapping:
+            # First zone (in definition order) containing each midpoint
+            inside = (mins <= mids[:, None]) & (mids[:, None] < maxs)
+            zone_ids = inside.argmax(axis=1)
+            matched = inside.any(axis=1)
+        else:
+            # Zones sorted by lower bound: one binary search per midpoint
+            zone_ids = np.searchsorted(mins, mids, side='right') - 1
+            clipped = np.clip(zone_ids, 0, len(names) - 1)
+            matched = (zone_ids >= 0) & (mids < maxs[clipped])
+            zone_ids = clipped
+
+        totals = np.bincount(zone_ids[matched], weights=pcts[matched], minlength=len(names))
+        for name, total in zip(names, totals.tolist()):
+            zone_times[name] += total
 
-            # Check which zones this bin overlaps
-            bin_mid = (bin_min + bin_max) / 2
+        return zone_times
 
-            for zone_name, (zone_min, zone_max) in zone_definitions.items():
-                if zone_min <= bin_mid < zone_max:
-                    zone_times[zone_name] += pct
-                    break
+    @staticmethod
+    @functools.lru_cache(maxsize=32)
+    def _zone_table(zones: Tuple[Tuple[str, Tuple[float, float]], ...]
+                    ) -> Tuple[Tuple[str, ...], np.ndarray, np.ndarray, bool]:
+        """
+        Precompute zone bounds for vectorized zone assignment.
 
-        return zone_times
+        Args:
+            zones: (name, (min, max)) pairs in definition order
+
+        Returns:
+            Tuple of (names, mins, maxs, overlapping). Non-overlapping zones
+            are sorted by lower bound; overlapping zones keep definition order.
+        """
+        ordered = sorted(zones, key=lambda zone: zone[1][0])
+        overlapping = any(
+            ordered[i][1][1] > ordered[i + 1][1][0] for i in range(len(ordered) - 1)
+        )
+        if overlapping:
+            ordered = list(zones)
+
+        names = tuple(name for name, _ in ordered)
+        mins = np.array([bounds[0] for _, bounds in ordered], dtype=np.float64)
+        maxs = np.array([bounds[1] for _, bounds in ordered], dtype=np.float64)
+        return names, mins, maxs, overlapping
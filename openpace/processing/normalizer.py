@@ -5,13 +5,64 @@ Converts vendor-specific data into standardized formats with consistent units,
 validates ranges, and applies quality checks.
 """
 
-from typing import Optional, Dict, Any, Tuple
+from typing import Optional, Dict, Any, List, Sequence, Tuple
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from types import MappingProxyType
 import logging
+import os
+import threading
+import numpy as np
+
+from openpace.utils.jit import NUMBA_AVAILABLE, njit, prange
 
 logger = logging.getLogger(__name__)
 
 
+# Standard units for each observation type
+_STANDARD_UNITS = {
+    'battery_voltage': 'V',
+    'battery_percent': '%',
+    'lead_impedance_atrial': 'Ohm',
+    'lead_impedance_ventricular': 'Ohm',
+    'lead_impedance_lv': 'Ohm',
+    'afib_burden_percent': '%',
+    'heart_rate': 'bpm',
+    'heart_rate_mean': 'bpm',
+    'heart_rate_max': 'bpm',
+    'heart_rate_min': 'bpm',
+    'pacing_percent_atrial': '%',
+    'pacing_percent_ventricular': '%',
+    'pacing_percent_biventricular': '%',
+    'lower_rate_limit': 'bpm',
+    'upper_rate_limit': 'bpm',
+    'av_delay': 'ms',
+    'atrial_sensitivity': 'mV',
+    'ventricular_sensitivity': 'mV',
+}
+
+# Conversion factors: source_unit -> (multiplier, target_unit)
+_CONVERSION_FACTORS = {
+    # Voltage
+    ('mV', 'V'): 0.001,
+    ('V', 'mV'): 1000,
+
+    # Impedance
+    ('kOhm', 'Ohm'): 1000,
+    ('Ohm', 'kOhm'): 0.001,
+
+    # Time
+    ('s', 'ms'): 1000,
+    ('ms', 's'): 0.001,
+    ('min', 's'): 60,
+    ('s', 'min'): 1/60,
+
+    # Percentage (sometimes expressed as decimal)
+    ('decimal', '%'): 100,
+    ('%', 'decimal'): 0.01,
+}
+
+
 class UnitConverter:
     """
     Converts between different units for pacemaker observations.
@@ -20,47 +71,10 @@ class UnitConverter:
     """
 
     # Standard units for each observation type
-    STANDARD_UNITS = {
-        'battery_voltage': 'V',
-        'battery_percent': '%',
-        'lead_impedance_atrial': 'Ohm',
-        'lead_impedance_ventricular': 'Ohm',
-        'lead_impedance_lv': 'Ohm',
-        'afib_burden_percent': '%',
-        'heart_rate': 'bpm',
-        'heart_rate_mean': 'bpm',
-        'heart_rate_max': 'bpm',
-        'heart_rate_min': 'bpm',
-        'pacing_percent_atrial': '%',
-        'pacing_percent_ventricular': '%',
-        'pacing_percent_biventricular': '%',
-        'lower_rate_limit': 'bpm',
-        'upper_rate_limit': 'bpm',
-        'av_delay': 'ms',
-        'atrial_sensitivity': 'mV',
-        'ventricular_sensitivity': 'mV',
-    }
+    STANDARD_UNITS = _STANDARD_UNITS
 
     # Conversion factors: source_unit -> (multiplier, target_unit)
-    CONVERSION_FACTORS = {
-        # Voltage
-        ('mV', 'V'): 0.001,
-        ('V', 'mV'): 1000,
-
-        # Impedance
-        ('kOhm', 'Ohm'): 1000,
-        ('Ohm', 'kOhm'): 0.001,
-
-        # Time
-        ('s', 'ms'): 1000,
-        ('ms', 's'): 0.001,
-        ('min', 's'): 60,
-        ('s', 'min'): 1/60,
-
-        # Percentage (sometimes expressed as decimal)
-        ('decimal', '%'): 100,
-        ('%', 'decimal'): 0.01,
-    }
+    CONVERSION_FACTORS = _CONVERSION_FACTORS
 
     @classmethod
     def convert(cls, value: float, from_unit: str, to_unit: str) -> float:
@@ -81,15 +95,17 @@ class UnitConverter:
         if from_unit == to_unit:
             return value
 
+        get_factor = _CONVERSION_FACTORS.get
+
         # Try direct conversion
-        key = (from_unit, to_unit)
-        if key in cls.CONVERSION_FACTORS:
-            return value * cls.CONVERSION_FACTORS[key]
+        factor = get_factor((from_unit, to_unit))
+        if factor is not None:
+            return value * factor
 
         # Try reverse conversion
-        reverse_key = (to_unit, from_unit)
-        if reverse_key in cls.CONVERSION_FACTORS:
-            return value / cls.CONVERSION_FACTORS[reverse_key]
+        factor = get_factor((to_unit, from_unit))
+        if factor is not None:
+            return value / factor
 
         raise ValueError(f"No conversion available from {from_unit} to {to_unit}")
 
@@ -106,21 +122,112 @@ class UnitConverter:
         Returns:
             Tuple of (normalized_value, standard_unit)
         """
-        standard_unit = cls.STANDARD_UNITS.get(variable_name)
+        entry = _NORM_TABLE.get((variable_name, unit))
+        if entry is not None:
+            multiplier, standard_unit = entry
+            return value * multiplier, standard_unit
+
+        standard_unit = _STANDARD_UNITS.get(variable_name)
 
         if not standard_unit:
             # No standard unit defined, return as-is
             return value, unit
 
-        if unit == standard_unit:
-            return value, unit
+        logger.warning(f"Could not convert {variable_name} from {unit} to {standard_unit}")
+        return value, unit
 
-        try:
-            normalized_value = cls.convert(value, unit, standard_unit)
-            return normalized_value, standard_unit
-        except ValueError:
-            logger.warning(f"Could not convert {variable_name} from {unit} to {standard_unit}")
-            return value, unit
+    @classmethod
+    def normalize_many(cls, variable_names: Sequence[str], values: Sequence[float],
+                       units: Sequence[str]) -> Tuple[np.ndarray, List[str]]:
+        """
+        Normalize parallel columns of values to their variables' standard units.
+
+        Multipliers for every (variable, unit) pair are gathered from a
+        precomputed table and applied in one array multiply.
+
+        Args:
+            variable_names: Universal variable names
+            values: Numeric values
+            units: Current units
+
+        Returns:
+            Tuple of (normalized float64 values, units); rows that cannot be
+            converted keep their value and unit, as with normalize()
+        """
+        var_ids = np.fromiter((_var_id(name) for name in variable_names),
+                              dtype=np.intp, count=len(variable_names))
+        unit_ids = np.fromiter((_UNIT_INDEX.get(unit or '', _UNKNOWN_UNIT) for unit in units),
+                               dtype=np.intp, count=len(units))
+        normalized, convertible = _convert_ids(var_ids, unit_ids,
+                                               np.asarray(values, dtype=np.float64))
+
+        get_standard_unit = _STANDARD_UNITS.get
+        result_units = []
+        unconvertible = set()
+        for name, unit, converted in zip(variable_names, units, convertible.tolist()):
+            standard_unit = get_standard_unit(name)
+            if converted:
+                unit = standard_unit
+            elif standard_unit and (name, unit) not in unconvertible:
+                unconvertible.add((name, unit))
+                logger.warning(f"Could not convert {name} from {unit} to {standard_unit}")
+            result_units.append(unit)
+
+        return normalized, result_units
+
+
+def _build_norm_table() -> Dict[Tuple[str, str], Tuple[float, str]]:
+    """
+    Precompute (variable_name, unit) -> (multiplier, standard_unit).
+
+    Covers identity and every direct or reverse conversion into each
+    variable's standard unit, so normalize() is a single dict lookup.
+    """
+    source_units = {unit for pair in _CONVERSION_FACTORS for unit in pair}
+    table = {}
+    for variable_name, standard_unit in _STANDARD_UNITS.items():
+        table[(variable_name, standard_unit)] = (1, standard_unit)
+        for unit in source_units:
+            if (unit, standard_unit) in _CONVERSION_FACTORS:
+                multiplier = _CONVERSION_FACTORS[(unit, standard_unit)]
+            elif (standard_unit, unit) in _CONVERSION_FACTORS:
+                multiplier = 1 / _CONVERSION_FACTORS[(standard_unit, unit)]
+            else:
+                continue
+            table.setdefault((variable_name, unit), (multiplier, standard_unit))
+    return table
+
+
+_NORM_TABLE = _build_norm_table()
+
+
+# Normal ranges for observations (min, max)
+_NORMAL_RANGES = {
+    'battery_voltage': (2.0, 3.5),  # Volts
+    'battery_percent': (0, 100),
+    'lead_impedance_atrial': (200, 1500),  # Ohms
+    'lead_impedance_ventricular': (200, 1500),
+    'lead_impedance_lv': (200, 1500),
+    'afib_burden_percent': (0, 100),
+    'heart_rate': (30, 200),  # bpm
+    'heart_rate_mean': (40, 150),
+    'heart_rate_max': (50, 250),
+    'heart_rate_min': (30, 100),
+    'pacing_percent_atrial': (0, 100),
+    'pacing_percent_ventricular': (0, 100),
+    'pacing_percent_biventricular': (0, 100),
+    'lower_rate_limit': (30, 100),
+    'upper_rate_limit': (100, 180),
+    'av_delay': (0, 400),  # ms
+}
+
+# Critical ranges (outside these = device malfunction or data error)
+_CRITICAL_RANGES = {
+    'battery_voltage': (1.5, 4.0),
+    'lead_impedance_atrial': (50, 3000),
+    'lead_impedance_ventricular': (50, 3000),
+    'heart_rate': (20, 300),
+}
 
 
 class DataQualityValidator:
@@ -131,32 +238,10 @@ class DataQualityValidator:
     """
 
     # Normal ranges for observations (min, max)
-    NORMAL_RANGES = {
-        'battery_voltage': (2.0, 3.5),  # Volts
-        'battery_percent': (0, 100),
-        'lead_impedance_atrial': (200, 1500),  # Ohms
-        'lead_impedance_ventricular': (200, 1500),
-        'lead_impedance_lv': (200, 1500),
-        'afib_burden_percent': (0, 100),
-        'heart_rate': (30, 200),  # bpm
-        'heart_rate_mean': (40, 150),
-        'heart_rate_max': (50, 250),
-        'heart_rate_min': (30, 100),
-        'pacing_percent_atrial': (0, 100),
-        'pacing_percent_ventricular': (0, 100),
-        'pacing_percent_biventricular': (0, 100),
-        'lower_rate_limit': (30, 100),
-        'upper_rate_limit': (100, 180),
-        'av_delay': (0, 400),  # ms
-    }
+    NORMAL_RANGES = _NORMAL_RANGES
 
     # Critical ranges (outside these = device malfunction or data error)
-    CRITICAL_RANGES = {
-        'battery_voltage': (1.5, 4.0),
-        'lead_impedance_atrial': (50, 3000),
-        'lead_impedance_ventricular': (50, 3000),
-        'heart_rate': (20, 300),
-    }
+    CRITICAL_RANGES = _CRITICAL_RANGES
 
     @classmethod
     def validate(cls, variable_name: str, value: float) -> Dict[str, Any]:
@@ -172,64 +257,403 @@ class DataQualityValidator:
                 - is_valid: bool
                 - in_normal_range: bool
                 - in_critical_range: bool
-                - flags: list of quality flags
+                - flags: tuple of quality flags
                 - severity: 'normal', 'warning', 'critical'
+
+            Unflagged values share one read-only result mapping.
         """
-        flags = []
+        checks = _SCALAR_TABLE[_var_id(variable_name)]
+        if checks is None:
+            # No ranges or rules for this variable
+            return _OK_RESULT
+
+        normal_min, normal_max, crit_min, crit_max, rule, rule_low, rule_high = checks
+        flag_bits = 0
         severity = 'normal'
 
-        # Check critical range
-        critical_range = cls.CRITICAL_RANGES.get(variable_name)
-        in_critical_range = True
-        if critical_range:
-            min_val, max_val = critical_range
-            if value < min_val or value > max_val:
-                flags.append('OUTSIDE_CRITICAL_RANGE')
-                severity = 'critical'
-                in_critical_range = False
+        # Check critical range (NaN bounds: no range defined, never fires)
+        if value < crit_min or value > crit_max:
+            flag_bits |= _OUTSIDE_CRITICAL_RANGE
+            severity = 'critical'
 
         # Check normal range
-        normal_range = cls.NORMAL_RANGES.get(variable_name)
-        in_normal_range = True
-        if normal_range:
-            min_val, max_val = normal_range
-            if value < min_val:
-                flags.append('BELOW_NORMAL_RANGE')
-                if severity == 'normal':
-                    severity = 'warning'
-                in_normal_range = False
-            elif value > max_val:
-                flags.append('ABOVE_NORMAL_RANGE')
-                if severity == 'normal':
-                    severity = 'warning'
-                in_normal_range = False
+        if value < normal_min:
+            flag_bits |= _BELOW_NORMAL_RANGE
+            if severity == 'normal':
+                severity = 'warning'
+        elif value > normal_max:
+            flag_bits |= _ABOVE_NORMAL_RANGE
+            if severity == 'normal':
+                severity = 'warning'
 
         # Variable-specific validation
-        if variable_name == 'battery_voltage' and value < 2.2:
-            flags.append('LOW_BATTERY_ERI')
-            severity = 'critical'
+        if rule is not None:
+            extra = rule(value, rule_low, rule_high)
+            if extra is not None:
+                flag_bits |= _FLAG_BITS[extra[0]]
+                severity = extra[1]
+
+        if not flag_bits:
+            return _OK_RESULT
+        return _flagged_result(flag_bits, severity)
+
+
+# Shared read-only result for observations that raise no flags
+_OK_RESULT = MappingProxyType({
+    'is_valid': True,
+    'in_normal_range': True,
+    'in_critical_range': True,
+    'flags': (),
+    'severity': 'normal',
+})
+
+
+def _flagged_result(flag_bits: int, severity: str) -> Dict[str, Any]:
+    """Build validate()'s result for a non-zero flag bitmask."""
+    return {
+        'is_valid': severity != 'critical',
+        'in_normal_range': not flag_bits & (_BELOW_NORMAL_RANGE | _ABOVE_NORMAL_RANGE),
+        'in_critical_range': not flag_bits & _OUTSIDE_CRITICAL_RANGE,
+        'flags': _FLAG_TUPLES[flag_bits],
+        'severity': severity,
+    }
 
-        if variable_name.startswith('lead_impedance'):
-            if value > 1500:
-                flags.append('POSSIBLE_LEAD_FRACTURE')
-                severity = 'critical'
-            elif value < 200:
-                flags.append('POSSIBLE_INSULATION_FAILURE')
-                severity = 'critical'
 
-        if variable_name == 'afib_burden_percent' and value > 20:
-            flags.append('HIGH_AFIB_BURDEN')
-            severity = 'warning'
+# =============================================================================
+# VARIABLE-ID TABLES FOR NORMALIZATION AND VALIDATION
+# =============================================================================
+
+# Quality flags as bit positions, in the order validate() reports them
+_FLAG_NAMES = (
+    'OUTSIDE_CRITICAL_RANGE',
+    'BELOW_NORMAL_RANGE',
+    'ABOVE_NORMAL_RANGE',
+    'LOW_BATTERY_ERI',
+    'POSSIBLE_LEAD_FRACTURE',
+    'POSSIBLE_INSULATION_FAILURE',
+    'HIGH_AFIB_BURDEN',
+)
+
+# Flag name tuple for every possible bitmask
+_FLAG_TUPLES = tuple(
+    tuple(name for bit, name in enumerate(_FLAG_NAMES) if mask >> bit & 1)
+    for mask in range(1 << len(_FLAG_NAMES))
+)
+
+# Bitmask value of each quality flag
+_FLAG_BITS = {name: 1 << bit for bit, name in enumerate(_FLAG_NAMES)}
+_OUTSIDE_CRITICAL_RANGE = 1 << _FLAG_NAMES.index('OUTSIDE_CRITICAL_RANGE')
+_BELOW_NORMAL_RANGE = 1 << _FLAG_NAMES.index('BELOW_NORMAL_RANGE')
+_ABOVE_NORMAL_RANGE = 1 << _FLAG_NAMES.index('ABOVE_NORMAL_RANGE')
+_LOW_BATTERY_ERI = 1 << _FLAG_NAMES.index('LOW_BATTERY_ERI')
+_POSSIBLE_LEAD_FRACTURE = 1 << _FLAG_NAMES.index('POSSIBLE_LEAD_FRACTURE')
+_POSSIBLE_INSULATION_FAILURE = 1 << _FLAG_NAMES.index('POSSIBLE_INSULATION_FAILURE')
+_HIGH_AFIB_BURDEN = 1 << _FLAG_NAMES.index('HIGH_AFIB_BURDEN')
+
+_SEVERITY_NAMES = ('normal', 'warning', 'critical')
+
+# Clinical thresholds of the variable-specific rules
+_ERI_VOLTAGE = 2.2  # Volts; battery below this is at elective replacement
+_LEAD_FRACTURE_IMPEDANCE = 1500  # Ohms; above suggests a lead fracture
+_INSULATION_FAILURE_IMPEDANCE = 200  # Ohms; below suggests insulation failure
+_HIGH_AFIB_BURDEN_PERCENT = 20  # %; above warrants review
+
+
+def _battery_rule(value: float, low: float, high: float) -> Optional[Tuple[str, str]]:
+    """Battery at or past the elective replacement indicator (low)."""
+    if value < low:
+        return 'LOW_BATTERY_ERI', 'critical'
+    return None
+
+
+def _lead_rule(value: float, low: float, high: float) -> Optional[Tuple[str, str]]:
+    """Lead impedance above the fracture or below the insulation failure bound."""
+    if value > high:
+        return 'POSSIBLE_LEAD_FRACTURE', 'critical'
+    if value < low:
+        return 'POSSIBLE_INSULATION_FAILURE', 'critical'
+    return None
+
+
+def _afib_rule(value: float, low: float, high: float) -> Optional[Tuple[str, str]]:
+    """AFib burden high enough to warrant review (high)."""
+    if value > high:
+        return 'HIGH_AFIB_BURDEN', 'warning'
+    return None
+
+
+# (low, high) thresholds of each rule, NaN where the rule has no bound.
+# Stored per variable in _TABLES so every validation path reads one copy.
+_RULE_BOUNDS = {
+    _battery_rule: (_ERI_VOLTAGE, np.nan),
+    _lead_rule: (_INSULATION_FAILURE_IMPEDANCE, _LEAD_FRACTURE_IMPEDANCE),
+    _afib_rule: (np.nan, _HIGH_AFIB_BURDEN_PERCENT),
+}
+
+# Variable-specific rules: each is called with the value and the variable's
+# rule bounds and returns (flag name, severity) or None.
+# Unknown lead_impedance_* variables also get _lead_rule (see _var_id).
+_SPECIAL_RULES = {
+    'battery_voltage': _battery_rule,
+    'lead_impedance_atrial': _lead_rule,
+    'lead_impedance_ventricular': _lead_rule,
+    'lead_impedance_lv': _lead_rule,
+    'afib_burden_percent': _afib_rule,
+}
+
+# Integer ids for every known variable and unit. Unknown variables share one
+# id, except unknown lead impedance variables which still get the lead rules.
+_VAR_NAMES = tuple(dict.fromkeys([
+    *_STANDARD_UNITS,
+    *_NORMAL_RANGES,
+    *_CRITICAL_RANGES,
+]))
+_VAR_INDEX = {name: i for i, name in enumerate(_VAR_NAMES)}
+_UNKNOWN_VAR = len(_VAR_NAMES)
+_UNKNOWN_IMPEDANCE_VAR = len(_VAR_NAMES) + 1
+
+_UNIT_NAMES = tuple(dict.fromkeys(unit for _, unit in _NORM_TABLE))
+_UNIT_INDEX = {unit: i for i, unit in enumerate(_UNIT_NAMES)}
+_UNKNOWN_UNIT = len(_UNIT_NAMES)
+
+
+def _var_id(variable_name: str) -> int:
+    """Map a variable name to its table id."""
+    var_id = _VAR_INDEX.get(variable_name)
+    if var_id is not None:
+        return var_id
+    if variable_name.startswith('lead_impedance'):
+        return _UNKNOWN_IMPEDANCE_VAR
+    return _UNKNOWN_VAR
+
+
+def _build_columnar_tables() -> Dict[str, np.ndarray]:
+    """Materialize unit multipliers, validation ranges and rule bounds as arrays by id."""
+    n_vars = len(_VAR_NAMES) + 2
+    tables = {
+        'mult': np.full((n_vars, len(_UNIT_NAMES) + 1), np.nan),
+        'normal_min': np.full(n_vars, np.nan),
+        'normal_max': np.full(n_vars, np.nan),
+        'crit_min': np.full(n_vars, np.nan),
+        'crit_max': np.full(n_vars, np.nan),
+        'rule_low': np.full(n_vars, np.nan),
+        'rule_high': np.full(n_vars, np.nan),
+        'is_battery': np.zeros(n_vars, dtype=bool),
+        'is_impedance': np.zeros(n_vars, dtype=bool),
+        'is_afib': np.zeros(n_vars, dtype=bool),
+    }
 
-        is_valid = len(flags) == 0 or severity != 'critical'
+    for (variable_name, unit), (multiplier, _) in _NORM_TABLE.items():
+        tables['mult'][_VAR_INDEX[variable_name], _UNIT_INDEX[unit]] = multiplier
 
-        return {
-            'is_valid': is_valid,
-            'in_normal_range': in_normal_range,
-            'in_critical_range': in_critical_range,
-            'flags': flags,
-            'severity': severity,
-        }
+    for variable_name, (min_val, max_val) in _NORMAL_RANGES.items():
+        tables['normal_min'][_VAR_INDEX[variable_name]] = min_val
+        tables['normal_max'][_VAR_INDEX[variable_name]] = max_val
+
+    for variable_name, (min_val, max_val) in _CRITICAL_RANGES.items():
+        tables['crit_min'][_VAR_INDEX[variable_name]] = min_val
+        tables['crit_max'][_VAR_INDEX[variable_name]] = max_val
+
+    rules = _rule_table()
+    tables['is_battery'][:] = [rule is _battery_rule for rule in rules]
+    tables['is_impedance'][:] = [rule is _lead_rule for rule in rules]
+    tables['is_afib'][:] = [rule is _afib_rule for rule in rules]
+    for var_id, rule in enumerate(rules):
+        if rule is not None:
+            tables['rule_low'][var_id], tables['rule_high'][var_id] = _RULE_BOUNDS[rule]
+
+    return tables
+
+
+def _convert_ids(var_ids: np.ndarray, unit_ids: np.ndarray,
+                 values: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Apply standard-unit multipliers by (variable id, unit id).
+
+    Returns:
+        Tuple of (normalized values, convertible mask); a NaN multiplier
+        means no conversion into the standard unit and keeps the value
+    """
+    multipliers = _TABLES['mult'][var_ids, unit_ids]
+    convertible = ~np.isnan(multipliers)
+    return np.where(convertible, values * multipliers, values), convertible
+
+
+def _rule_table() -> List[Optional[Any]]:
+    """Variable-specific rule function (or None) for every variable id."""
+    rules = [_SPECIAL_RULES.get(name) for name in _VAR_NAMES]
+    rules.append(None)  # _UNKNOWN_VAR
+    rules.append(_lead_rule)  # _UNKNOWN_IMPEDANCE_VAR
+    return rules
+
+
+_TABLES = _build_columnar_tables()
+
+# Per-id (normal_min, normal_max, crit_min, crit_max, rule, rule_low,
+# rule_high) as Python scalars for the one-observation validate() path;
+# None if nothing to check
+_SCALAR_TABLE = [
+    None if all(bound != bound for bound in checks[:4]) and checks[4] is None else checks
+    for checks in zip(
+        _TABLES['normal_min'].tolist(), _TABLES['normal_max'].tolist(),
+        _TABLES['crit_min'].tolist(), _TABLES['crit_max'].tolist(),
+        _rule_table(),
+        _TABLES['rule_low'].tolist(), _TABLES['rule_high'].tolist(),
+    )
+]
+
+
+@njit(parallel=True, cache=True)
+def _validate_kernel(var_ids, values, normal_min, normal_max, crit_min, crit_max,
+                     rule_low, rule_high, is_battery, is_impedance, is_afib):
+    """
+    Element-wise validation kernel (compiled when Numba is available).
+
+    Mirrors DataQualityValidator.validate one row at a time, writing the
+    flag bitmask (bit order of _FLAG_NAMES) and severity index per row.
+    """
+    n = len(values)
+    flags = np.zeros(n, dtype=np.uint32)
+    severity = np.zeros(n, dtype=np.uint8)
+
+    for i in prange(n):
+        vid = var_ids[i]
+        value = values[i]
+        row_flags = 0
+        row_severity = 0
+
+        if value < crit_min[vid] or value > crit_max[vid]:
+            row_flags |= _OUTSIDE_CRITICAL_RANGE
+            row_severity = 2
+
+        if value < normal_min[vid]:
+            row_flags |= _BELOW_NORMAL_RANGE
+            if row_severity == 0:
+                row_severity = 1
+        elif value > normal_max[vid]:
+            row_flags |= _ABOVE_NORMAL_RANGE
+            if row_severity == 0:
+                row_severity = 1
+
+        if is_battery[vid] and value < rule_low[vid]:
+            row_flags |= _LOW_BATTERY_ERI
+            row_severity = 2
+
+        if is_impedance[vid]:
+            if value > rule_high[vid]:
+                row_flags |= _POSSIBLE_LEAD_FRACTURE
+                row_severity = 2
+            elif value < rule_low[vid]:
+                row_flags |= _POSSIBLE_INSULATION_FAILURE
+                row_severity = 2
+
+        if is_afib[vid] and value > rule_high[vid]:
+            row_flags |= _HIGH_AFIB_BURDEN
+            row_severity = 1
+
+        flags[i] = row_flags
+        severity[i] = row_severity
+
+    return flags, severity
+
+
+def _validate_arrays(var_ids: np.ndarray, values: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Vectorized equivalent of DataQualityValidator.validate.
+
+    Uses the compiled kernel when Numba is installed, NumPy otherwise.
+
+    Args:
+        var_ids: Variable ids (see _VAR_INDEX)
+        values: Values in standard units
+
+    Returns:
+        Tuple of (flag bitmask per row, severity index per row)
+    """
+    if NUMBA_AVAILABLE:
+        return _validate_kernel(
+            var_ids, values,
+            _TABLES['normal_min'], _TABLES['normal_max'],
+            _TABLES['crit_min'], _TABLES['crit_max'],
+            _TABLES['rule_low'], _TABLES['rule_high'],
+            _TABLES['is_battery'], _TABLES['is_impedance'], _TABLES['is_afib'],
+        )
+    return _validate_arrays_numpy(var_ids, values)
+
+
+def _validate_arrays_numpy(var_ids: np.ndarray,
+                           values: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    NumPy implementation of _validate_arrays.
+
+    Args:
+        var_ids: Variable ids (see _VAR_INDEX)
+        values: Values in standard units
+
+    Returns:
+        Tuple of (flag bitmask per row, severity index per row)
+    """
+    # NaN range bounds (variables without a range) compare False
+    with np.errstate(invalid='ignore'):
+        outside_critical = ((values < _TABLES['crit_min'][var_ids]) |
+                            (values > _TABLES['crit_max'][var_ids]))
+        below = values < _TABLES['normal_min'][var_ids]
+        above = ~below & (values > _TABLES['normal_max'][var_ids])
+
+        # Rule bounds are NaN for variables without that rule
+        rule_low = _TABLES['rule_low'][var_ids]
+        rule_high = _TABLES['rule_high'][var_ids]
+        is_impedance = _TABLES['is_impedance'][var_ids]
+        low_battery = _TABLES['is_battery'][var_ids] & (values < rule_low)
+        lead_fracture = is_impedance & (values > rule_high)
+        insulation_failure = is_impedance & ~lead_fracture & (values < rule_low)
+        high_afib = _TABLES['is_afib'][var_ids] & (values > rule_high)
+
+    flags = np.zeros(len(values), dtype=np.uint32)
+    for flag_bit, mask in ((_OUTSIDE_CRITICAL_RANGE, outside_critical),
+                           (_BELOW_NORMAL_RANGE, below),
+                           (_ABOVE_NORMAL_RANGE, above),
+                           (_LOW_BATTERY_ERI, low_battery),
+                           (_POSSIBLE_LEAD_FRACTURE, lead_fracture),
+                           (_POSSIBLE_INSULATION_FAILURE, insulation_failure),
+                           (_HIGH_AFIB_BURDEN, high_afib)):
+        flags |= mask.astype(np.uint32) * flag_bit
+
+    # Same escalation order as validate(): later rules override earlier ones
+    severity = np.zeros(len(values), dtype=np.uint8)
+    severity[outside_critical] = 2
+    severity[(below | above) & (severity == 0)] = 1
+    severity[low_battery | lead_fracture | insulation_failure] = 2
+    severity[high_afib] = 1
+
+    return flags, severity
+
+
+def _enrich(observation_data: Dict[str, Any], normalized_value: float,
+            standard_unit: str, validation_result: Dict[str, Any]) -> Dict[str, Any]:
+    """Write normalization results into an observation dictionary."""
+    # Records get a plain dict with list flags, never the shared read-only result
+    flags = list(validation_result['flags'])
+    observation_data['normalized_value'] = normalized_value
+    observation_data['standard_unit'] = standard_unit
+    observation_data['validation_result'] = dict(validation_result, flags=flags)
+    observation_data['quality_flags'] = flags
+    observation_data['severity'] = validation_result['severity']
+    return observation_data
+
+
+_batch_executor: Optional[ThreadPoolExecutor] = None
+_batch_executor_lock = threading.Lock()
+
+
+def _get_batch_executor() -> ThreadPoolExecutor:
+    """Return the shared batch normalization pool, creating it on first use."""
+    global _batch_executor
+    if _batch_executor is None:
+        with _batch_executor_lock:
+            if _batch_executor is None:
+                _batch_executor = ThreadPoolExecutor(thread_name_prefix='normalize')
+    return _batch_executor
 
 
 class DataNormalizer:
@@ -262,6 +686,27 @@ class DataNormalizer:
         """
         variable_name = observation_data.get('variable_name')
         value = observation_data.get('value_numeric')
+
+        if not variable_name or value is None:
+            return observation_data
+
+        return self.normalize_observation_inplace(dict(observation_data))
+
+    def normalize_observation_inplace(self, observation_data: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Normalize a single observation by enriching the given dictionary.
+
+        Same as normalize_observation, but the result keys are written into
+        observation_data instead of a copy. Use when the caller owns the dict.
+
+        Args:
+            observation_data: Observation dictionary (modified in place)
+
+        Returns:
+            observation_data
+        """
+        variable_name = observation_data.get('variable_name')
+        value = observation_data.get('value_numeric')
         unit = observation_data.get('unit')
 
         if not variable_name or value is None:
@@ -276,23 +721,111 @@ class DataNormalizer:
         validation_result = self.validator.validate(variable_name, normalized_value)
 
         # Enrich observation data
-        return {
-            **observation_data,
-            'normalized_value': normalized_value,
-            'standard_unit': standard_unit,
-            'validation_result': validation_result,
-            'quality_flags': validation_result['flags'],
-            'severity': validation_result['severity'],
-        }
-
-    def normalize_batch(self, observations: list) -> list:
+        _enrich(observation_data, normalized_value, standard_unit, validation_result)
+        return observation_data
+
+    def normalize_batch(self, observations: list, copy: bool = True,
+                        parallel_threshold: int = 1000) -> list:
         """
         Normalize a batch of observations.
 
+        Batches of at least parallel_threshold observations are split into
+        chunks and normalized on a shared thread pool. Threads (not
+        processes) are used so that copy=False can still enrich the caller's
+        dictionaries, and NumPy releases the GIL during array operations.
+
+        Args:
+            observations: List of observation dictionaries
+            copy: If False, enrich the given dictionaries in place instead
+                of returning new ones
+            parallel_threshold: Minimum batch size for parallel dispatch
+
+        Returns:
+            List of normalized observation dictionaries
+        """
+        observations = list(observations)
+        if len(observations) < parallel_threshold:
+            return self._normalize_chunk(observations, copy)
+
+        chunk_size = max(1, len(observations) // (4 * (os.cpu_count() or 1)))
+        chunks = [observations[i:i + chunk_size]
+                  for i in range(0, len(observations), chunk_size)]
+        executor = _get_batch_executor()
+        # Chunks validate with NumPy: the Numba kernel runs its own thread
+        # pool and must not be launched from several Python threads
+        futures = [executor.submit(self._normalize_chunk, chunk, copy, _validate_arrays_numpy)
+                   for chunk in chunks]
+
+        results = []
+        for future in futures:
+            results.extend(future.result())
+        return results
+
+    def _normalize_chunk(self, observations: list, copy: bool,
+                         validate=_validate_arrays) -> list:
+        """
+        Normalize a chunk of observations serially (columnar fast path).
+
         Args:
             observations: List of observation dictionaries
+            copy: If False, enrich the given dictionaries in place
+            validate: Columnar validation function (see _validate_arrays)
 
         Returns:
             List of normalized observation dictionaries
         """
-        return [self.normalize_observation(obs) for obs in observations]
+        results = list(observations)
+
+        # Rows with a name and numeric value go through the columnar path;
+        # anything else keeps the scalar behaviour
+        rows = []
+        for i, obs in enumerate(observations):
+            value = obs.get('value_numeric')
+            if obs.get('variable_name') and isinstance(value, (int, float)):
+                rows.append(i)
+            elif copy:
+                results[i] = self.normalize_observation(obs)
+            else:
+                results[i] = self.normalize_observation_inplace(obs)
+
+        if not rows:
+            return results
+
+        batch = [observations[i] for i in rows]
+        var_ids = np.fromiter(
+            (_var_id(obs['variable_name']) for obs in batch),
+            dtype=np.intp, count=len(batch)
+        )
+        unit_ids = np.fromiter(
+            (_UNIT_INDEX.get(obs.get('unit') or '', _UNKNOWN_UNIT) for obs in batch),
+            dtype=np.intp, count=len(batch)
+        )
+        values = np.fromiter(
+            (obs['value_numeric'] for obs in batch), dtype=np.float64, count=len(batch)
+        )
+
+        normalized, convertible = _convert_ids(var_ids, unit_ids, values)
+
+        flags, severity = validate(var_ids, normalized)
+
+        get_standard_unit = _STANDARD_UNITS.get
+        for i, obs, converted, value, flag_bits, severity_id in zip(
+                rows, batch, convertible.tolist(), normalized.tolist(),
+                flags.tolist(), severity.tolist()):
+            variable_name = obs['variable_name']
+            unit = obs.get('unit') or ''
+            standard_unit = get_standard_unit(variable_name)
+
+            if converted:
+                unit = standard_unit
+            elif standard_unit:
+                logger.warning(f"Could not convert {variable_name} from {unit} to {standard_unit}")
+
+            if flag_bits:
+                validation_result = _flagged_result(flag_bits, _SEVERITY_NAMES[severity_id])
+            else:
+                validation_result = _OK_RESULT
+
+            results[i] = _enrich(dict(obs) if copy else obs, value, unit, validation_result)
+
+        return results
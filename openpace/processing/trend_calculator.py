@@ -7,16 +7,98 @@ Calculates battery depletion rates, lead impedance trends, and arrhythmia burden
 
 from typing import List, Dict, Any, Optional, Tuple
 from datetime import datetime, timedelta
+from itertools import groupby
+from operator import itemgetter
+from sqlalchemy import func
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.orm import Session
 import numpy as np
-from scipy import stats
 import logging
 
-from openpace.database.models import Patient, Observation, LongitudinalTrend
+from openpace.database.models import Patient, Transmission, Observation, LongitudinalTrend
+from openpace.utils.arrays import rolling_mean
+from openpace.utils.jit import NUMBA_AVAILABLE, njit, prange
+from openpace.utils.regression import linear_fit, slope_p_value
 
 logger = logging.getLogger(__name__)
 
 
+@njit(cache=True)
+def _summary_stats_kernel(values):
+    """
+    Min, max, mean and population std in one pass (compiled when Numba is
+    available), using Welford's update for the variance.
+    """
+    min_value = values[0]
+    max_value = values[0]
+    mean = 0.0
+    m2 = 0.0
+    for i in range(values.shape[0]):
+        value = values[i]
+        if value < min_value:
+            min_value = value
+        if value > max_value:
+            max_value = value
+        delta = value - mean
+        mean += delta / (i + 1)
+        m2 += delta * (value - mean)
+    return min_value, max_value, mean, np.sqrt(m2 / values.shape[0])
+
+
+@njit(parallel=True, cache=True)
+def _stability_kernel(values, offsets):
+    """
+    Lead stability score of every trend in values[offsets[t]:offsets[t+1]]
+    (compiled when Numba is available); mirrors calculate_stability_score
+    with a one-pass Welford mean/std per trend, trends in parallel.
+    """
+    n_trends = offsets.shape[0] - 1
+    scores = np.empty(n_trends, dtype=np.float64)
+
+    for t in prange(n_trends):
+        start = offsets[t]
+        count = offsets[t + 1] - start
+        if count < 2:
+            scores[t] = 100.0
+            continue
+
+        mean = 0.0
+        m2 = 0.0
+        for i in range(count):
+            value = values[start + i]
+            delta = value - mean
+            mean += delta / (i + 1)
+            m2 += delta * (value - mean)
+
+        if mean == 0:
+            scores[t] = 0.0
+        else:
+            cv = np.sqrt(m2 / count) / mean * 100
+            scores[t] = max(0.0, 100 - cv * 2)
+
+    return scores
+
+
+def _summary_stats(values: np.ndarray) -> Tuple[float, float, float, float]:
+    """
+    Trend summary statistics of a non-empty float64 array.
+
+    One pass through the compiled kernel when Numba is installed, separate
+    NumPy reductions otherwise.
+
+    Args:
+        values: Observation values
+
+    Returns:
+        Tuple of (min, max, mean, std)
+    """
+    if NUMBA_AVAILABLE:
+        min_value, max_value, mean, std = _summary_stats_kernel(values)
+    else:
+        min_value, max_value, mean, std = values.min(), values.max(), values.mean(), values.std()
+    return float(min_value), float(max_value), float(mean), float(std)
+
+
 class TrendCalculator:
     """
     Calculates longitudinal trends from observations.
@@ -25,118 +107,448 @@ class TrendCalculator:
     for fast retrieval during visualization.
     """
 
+    FETCH_BATCH_SIZE = 10_000  # Observation rows fetched per batch
+    PATIENT_BATCH_SIZE = 500  # Patients (and reloaded trends) per IN query
+
     def __init__(self, db_session: Session):
         self.session = db_session
 
     def calculate_trend(self, patient_id: str, variable_name: str,
                        start_date: datetime = None,
-                       end_date: datetime = None) -> Optional[LongitudinalTrend]:
+                       end_date: datetime = None,
+                       commit: bool = True,
+                       force: bool = False) -> Optional[LongitudinalTrend]:
         """
         Calculate trend for a specific variable over time.
 
+        The stored trend is returned as is when the observations it would
+        be computed from still have the same first and last time and count.
+
         Args:
             patient_id: Patient identifier
             variable_name: Universal variable name
             start_date: Optional start date filter
             end_date: Optional end date filter
+            commit: If False, leave the change pending so several trends can
+                be written in one transaction
+            force: If True, recompute even if the stored trend looks current
 
         Returns:
             LongitudinalTrend object or None if insufficient data
         """
-        # Query observations
-        query = self.session.query(Observation).join(
-            Observation.transmission
-        ).filter(
-            Observation.transmission.has(patient_id=patient_id),
-            Observation.variable_name == variable_name,
-            Observation.value_numeric.isnot(None)
-        )
+        filters = self._series_filters(patient_id, variable_name, start_date, end_date)
 
-        if start_date:
-            query = query.filter(Observation.observation_time >= start_date)
-        if end_date:
-            query = query.filter(Observation.observation_time <= end_date)
+        if not force:
+            trend = self._current_trend(patient_id, variable_name, filters)
+            if trend is not None:
+                return trend
 
-        observations = query.order_by(Observation.observation_time).all()
+        series = self._load_series(filters)
 
-        if len(observations) == 0:
+        if series is None:
             logger.info(f"No data for trend: {variable_name}")
             return None
 
+        times, values = series
+
         # Allow single point trends for basic visualization
         # (statistical analysis requires 2+ points)
 
-        # Extract time points and values
-        time_points = [obs.observation_time.isoformat() for obs in observations]
-        values = [obs.value_numeric for obs in observations]
+        # Create or update trend
+        row = self._trend_row(patient_id, variable_name, times, values)
+        trend = self._upsert_trends([row])[(patient_id, variable_name)]
 
-        # Calculate statistics
-        min_value = float(np.min(values))
-        max_value = float(np.max(values))
-        mean_value = float(np.mean(values))
-        std_dev = float(np.std(values))
+        if commit:
+            self.session.commit()
+        return trend
 
-        # Create or update trend
+    @staticmethod
+    def _series_filters(patient_id: str, variable_name: str,
+                        start_date: datetime = None,
+                        end_date: datetime = None) -> List[Any]:
+        """
+        Filter criteria selecting the numeric observations of one trend.
+
+        Args:
+            patient_id: Patient identifier
+            variable_name: Universal variable name
+            start_date: Optional start date filter
+            end_date: Optional end date filter
+
+        Returns:
+            List of criteria (the query must join Observation.transmission)
+        """
+        filters = [
+            Transmission.patient_id == patient_id,
+            Observation.variable_name == variable_name,
+            Observation.value_numeric.isnot(None),
+        ]
+
+        if start_date:
+            filters.append(Observation.observation_time >= start_date)
+        if end_date:
+            filters.append(Observation.observation_time <= end_date)
+
+        return filters
+
+    def _current_trend(self, patient_id: str, variable_name: str,
+                       filters: List[Any]) -> Optional[LongitudinalTrend]:
+        """
+        Stored trend, if it still matches the observations it covers.
+
+        Compares the trend's start/end dates and point count with MIN/MAX
+        observation_time and COUNT of the matching observations (one
+        aggregate query), so a new or removed observation anywhere in the
+        range triggers a recompute.
+
+        Args:
+            patient_id: Patient identifier
+            variable_name: Universal variable name
+            filters: Criteria from _series_filters
+
+        Returns:
+            The stored trend, or None if it is missing or out of date
+        """
         trend = self.session.query(LongitudinalTrend).filter_by(
             patient_id=patient_id,
             variable_name=variable_name
         ).first()
 
-        if trend:
-            # Update existing
-            trend.time_points = time_points
-            trend.values = values
-            trend.min_value = min_value
-            trend.max_value = max_value
-            trend.mean_value = mean_value
-            trend.std_dev = std_dev
-            trend.start_date = observations[0].observation_time
-            trend.end_date = observations[-1].observation_time
-            trend.computed_at = datetime.utcnow()
-        else:
-            # Create new
-            trend = LongitudinalTrend(
-                patient_id=patient_id,
-                variable_name=variable_name,
-                time_points=time_points,
-                values=values,
-                min_value=min_value,
-                max_value=max_value,
-                mean_value=mean_value,
-                std_dev=std_dev,
-                start_date=observations[0].observation_time,
-                end_date=observations[-1].observation_time
+        if trend is None:
+            return None
+
+        first_time, last_time, count = self.session.query(
+            func.min(Observation.observation_time),
+            func.max(Observation.observation_time),
+            func.count(),
+        ).join(
+            Observation.transmission
+        ).filter(*filters).one()
+
+        if (count == len(trend.values) and
+                first_time == trend.start_date and last_time == trend.end_date):
+            return trend
+        return None
+
+    def _load_series(self, filters: List[Any]) -> Optional[Tuple[List[datetime], np.ndarray]]:
+        """
+        Load the time-ordered numeric series of one variable.
+
+        Args:
+            filters: Criteria from _series_filters
+
+        Returns:
+            Tuple of (observation times, float64 values) or None if no data
+        """
+        # Query only the two needed columns, streamed in batches as plain
+        # rows (no ORM instances, bounded memory for long histories)
+        query = self.session.query(
+            Observation.observation_time,
+            Observation.value_numeric,
+        ).join(
+            Observation.transmission
+        ).filter(*filters)
+
+        times = []
+        value_chunks = []
+        result = self.session.execute(
+            query.order_by(Observation.observation_time).statement,
+            execution_options={'yield_per': self.FETCH_BATCH_SIZE},
+        )
+        for rows in result.partitions():
+            times.extend(row[0] for row in rows)
+            value_chunks.append(np.fromiter((row[1] for row in rows),
+                                            dtype=np.float64, count=len(rows)))
+
+        if len(times) == 0:
+            return None
+
+        return times, np.concatenate(value_chunks)
+
+    def calculate_statistics(self, patient_id: str) -> Dict[str, Dict[str, Any]]:
+        """
+        Summary statistics of every numeric variable, aggregated in the database.
+
+        Use this when only the statistics are needed; it returns one row per
+        variable instead of every observation. SQLite has no STDDEV_POP, so
+        the population std is the square root of AVG((value - mean)^2) over
+        a grouped subquery of the means.
+
+        Args:
+            patient_id: Patient identifier
+
+        Returns:
+            Dictionary keyed by variable name with count, min_value,
+            max_value, mean_value and std_dev
+        """
+        value = Observation.value_numeric
+        filters = (
+            Transmission.patient_id == patient_id,
+            value.isnot(None),
+        )
+
+        aggregates = self.session.query(
+            Observation.variable_name.label('variable_name'),
+            func.count(value).label('count'),
+            func.min(value).label('min_value'),
+            func.max(value).label('max_value'),
+            func.avg(value).label('mean_value'),
+        ).join(
+            Observation.transmission
+        ).filter(*filters).group_by(Observation.variable_name).subquery()
+
+        deviation = value - aggregates.c.mean_value
+        rows = self.session.query(
+            aggregates.c.variable_name,
+            aggregates.c.count,
+            aggregates.c.min_value,
+            aggregates.c.max_value,
+            aggregates.c.mean_value,
+            func.avg(deviation * deviation),
+        ).select_from(Observation).join(
+            Observation.transmission
+        ).join(
+            aggregates, aggregates.c.variable_name == Observation.variable_name
+        ).filter(*filters).group_by(
+            aggregates.c.variable_name,
+            aggregates.c.count,
+            aggregates.c.min_value,
+            aggregates.c.max_value,
+            aggregates.c.mean_value,
+        ).all()
+
+        return {
+            var_name: {
+                'count': count,
+                'min_value': float(min_value),
+                'max_value': float(max_value),
+                'mean_value': float(mean_value),
+                'std_dev': float(np.sqrt(variance)),
+            }
+            for var_name, count, min_value, max_value, mean_value, variance in rows
+        }
+
+    def _upsert_trends(self,
+                       rows: List[Dict[str, Any]]) -> Dict[Tuple[str, str], LongitudinalTrend]:
+        """
+        Insert or update trends in a single statement.
+
+        INSERT ... ON CONFLICT (patient_id, variable_name) DO UPDATE, with
+        RETURNING handing back populated instances (existing instances in
+        the session are refreshed). Does not commit.
+
+        Args:
+            rows: Column values from _trend_row, one per patient and variable
+
+        Returns:
+            Stored trends keyed by (patient_id, variable_name)
+        """
+        if not rows:
+            return {}
+
+        stmt = sqlite_insert(LongitudinalTrend)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=['patient_id', 'variable_name'],
+            set_={
+                column: stmt.excluded[column]
+                for column in rows[0]
+                if column not in ('patient_id', 'variable_name')
+            },
+        ).returning(LongitudinalTrend)
+
+        # RETURNING order is not guaranteed, so key by patient and variable
+        return {
+            (trend.patient_id, trend.variable_name): trend
+            for trend in self.session.scalars(
+                stmt, rows, execution_options={'populate_existing': True}
             )
-            self.session.add(trend)
+        }
 
-        self.session.commit()
-        return trend
+    @staticmethod
+    def _trend_row(patient_id: str, variable_name: str, times: List[datetime],
+                   values: np.ndarray) -> Dict[str, Any]:
+        """
+        Column values of a trend computed from time-ordered observations.
+
+        Args:
+            patient_id: Patient identifier
+            variable_name: Universal variable name
+            times: Observation times, ascending
+            values: float64 observation values, parallel to times
+
+        Returns:
+            Dictionary of LongitudinalTrend column values
+        """
+        min_value, max_value, mean_value, std_dev = _summary_stats(values)
+        times_blob, values_blob = LongitudinalTrend.pack_arrays(times, values)
+
+        # Battery depletion fit is stored so analysis reads it back
+        fit = None
+        if variable_name == 'battery_voltage':
+            fit = BatteryTrendAnalyzer.fit_depletion(
+                np.frombuffer(times_blob, dtype=np.int64).view('datetime64[us]'), values
+            )
+        slope, intercept, r_value, eri_date = fit or (None, None, None, None)
+
+        return {
+            'patient_id': patient_id,
+            'variable_name': variable_name,
+            'time_points': [time.isoformat() for time in times],
+            'values': values.tolist(),
+            'times_blob': times_blob,
+            'values_blob': values_blob,
+            'min_value': min_value,
+            'max_value': max_value,
+            'mean_value': mean_value,
+            'std_dev': std_dev,
+            'slope': slope,
+            'intercept': intercept,
+            'r_squared': r_value ** 2 if fit else None,
+            'eri_date': eri_date,
+            'start_date': times[0],
+            'end_date': times[-1],
+            'computed_at': datetime.utcnow(),
+        }
 
     def calculate_all_trends(self, patient_id: str) -> List[LongitudinalTrend]:
         """
         Calculate trends for all variables for a patient.
 
+        Fetches every numeric observation for the patient in one query,
+        groups them by variable and writes all trends in one commit.
+
         Args:
             patient_id: Patient identifier
 
         Returns:
             List of computed trends
         """
-        # Get unique variables for this patient
-        variables = self.session.query(Observation.variable_name).join(
-            Observation.transmission
-        ).filter(
-            Observation.transmission.has(patient_id=patient_id),
-            Observation.value_numeric.isnot(None)
-        ).distinct().all()
+        return self.calculate_all_trends_batch([patient_id]).get(patient_id, [])
+
+    def calculate_all_trends_batch(self,
+                                   patient_ids: List[str]) -> Dict[str, List[LongitudinalTrend]]:
+        """
+        Calculate trends for all variables of many patients.
+
+        Patients are processed PATIENT_BATCH_SIZE at a time with one
+        observation query and one upsert per batch; everything is written
+        in one commit.
+
+        Args:
+            patient_ids: Patient identifiers
 
-        trends = []
-        for (var_name,) in variables:
-            trend = self.calculate_trend(patient_id, var_name)
-            if trend:
-                trends.append(trend)
+        Returns:
+            Computed trends per patient (patients without numeric data are
+            left out)
+        """
+        results: Dict[str, List[LongitudinalTrend]] = {}
+        trend_ids = []
+
+        try:
+            for start in range(0, len(patient_ids), self.PATIENT_BATCH_SIZE):
+                batch = patient_ids[start:start + self.PATIENT_BATCH_SIZE]
+                rows = self.session.query(
+                    Transmission.patient_id,
+                    Observation.variable_name,
+                    Observation.observation_time,
+                    Observation.value_numeric,
+                ).join(
+                    Observation.transmission
+                ).filter(
+                    Transmission.patient_id.in_(batch),
+                    Observation.value_numeric.isnot(None)
+                ).order_by(
+                    Transmission.patient_id,
+                    Observation.variable_name,
+                    Observation.observation_time
+                ).all()
+
+                trend_rows = []
+                for (patient_id, var_name), group in groupby(rows, key=itemgetter(0, 1)):
+                    group = list(group)
+                    trend_rows.append(self._trend_row(
+                        patient_id, var_name,
+                        [obs[2] for obs in group],
+                        np.fromiter((obs[3] for obs in group),
+                                    dtype=np.float64, count=len(group)),
+                    ))
+
+                stored = self._upsert_trends(trend_rows)
+                for row in trend_rows:
+                    trend = stored[(row['patient_id'], row['variable_name'])]
+                    results.setdefault(row['patient_id'], []).append(trend)
+                    trend_ids.append(trend.trend_id)
+
+            self.session.commit()
+        except Exception:
+            self.session.rollback()
+            raise
+
+        # Commit expires every instance; reload them with one query per
+        # batch rather than one lazy refresh per trend on first access
+        for start in range(0, len(trend_ids), self.PATIENT_BATCH_SIZE):
+            self.session.query(LongitudinalTrend).filter(
+                LongitudinalTrend.trend_id.in_(trend_ids[start:start + self.PATIENT_BATCH_SIZE])
+            ).all()
+
+        return results
+
+    def detect_lead_anomalies(self,
+                              patient_ids: List[str] = None) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Detect sudden lead impedance changes for many patients in one query.
 
-        return trends
+        The consecutive differences are computed by a LAG() window over each
+        patient's lead series and thresholded in the database, so only
+        anomaly rows are returned.
+
+        Args:
+            patient_ids: Optional patient identifiers (default: all patients)
+
+        Returns:
+            Anomalies per patient, in the shape of
+            LeadImpedanceTrendAnalyzer.detect_anomalies plus 'variable_name'
+        """
+        series = [
+            Observation.variable_name.like('lead_impedance%'),
+            Observation.value_numeric.isnot(None),
+        ]
+        if patient_ids is not None:
+            series.append(Transmission.patient_id.in_(patient_ids))
+
+        previous = func.lag(Observation.value_numeric).over(
+            partition_by=(Transmission.patient_id, Observation.variable_name),
+            order_by=Observation.observation_time,
+        )
+        deltas = self.session.query(
+            Transmission.patient_id.label('patient_id'),
+            Observation.variable_name.label('variable_name'),
+            Observation.observation_time.label('observation_time'),
+            previous.label('previous_value'),
+            Observation.value_numeric.label('current_value'),
+            (Observation.value_numeric - previous).label('delta'),
+        ).join(
+            Observation.transmission
+        ).filter(*series).subquery()
+
+        rows = self.session.query(deltas).filter(
+            (deltas.c.delta > LeadImpedanceTrendAnalyzer.FRACTURE_THRESHOLD) |
+            (deltas.c.delta < LeadImpedanceTrendAnalyzer.FAILURE_THRESHOLD)
+        ).order_by(
+            deltas.c.patient_id,
+            deltas.c.variable_name,
+            deltas.c.observation_time
+        ).all()
+
+        anomalies: Dict[str, List[Dict[str, Any]]] = {}
+        for patient_id, variable_name, time, previous_value, current_value, delta in rows:
+            anomaly = LeadImpedanceTrendAnalyzer._anomaly(
+                time.isoformat(), previous_value, current_value, delta
+            )
+            anomaly['variable_name'] = variable_name
+            anomalies.setdefault(patient_id, []).append(anomaly)
+
+        return anomalies
 
 
 class BatteryTrendAnalyzer:
@@ -149,11 +561,55 @@ class BatteryTrendAnalyzer:
 
     ERI_THRESHOLD = 2.2  # Volts
 
+    @staticmethod
+    def fit_depletion(times: np.ndarray, values: np.ndarray
+                      ) -> Optional[Tuple[float, float, float, Optional[datetime]]]:
+        """
+        Fit battery voltage against days since the first observation.
+
+        Args:
+            times: datetime64[us] observation times, ascending
+            values: Battery voltages, parallel to times
+
+        Returns:
+            Tuple of (slope in V/day, intercept, r_value, predicted ERI
+            date or None), or None with fewer than 3 points or a single
+            distinct time
+        """
+        if len(values) < 3:
+            return None
+
+        # Days since first observation (one vector subtraction)
+        days = (times - times[0]) / np.timedelta64(1, 'D')
+
+        try:
+            slope, intercept, r_value = linear_fit(days, values)
+        except ValueError:
+            return None
+
+        eri_date = None
+        days_to_eri = BatteryTrendAnalyzer._days_to_eri(slope, intercept)
+        if days_to_eri is not None and days_to_eri > 0:
+            eri_date = times[0].item() + timedelta(days=days_to_eri)
+
+        return slope, intercept, r_value, eri_date
+
+    @staticmethod
+    def _days_to_eri(slope: float, intercept: float) -> Optional[float]:
+        """Days from the first observation until ERI (None unless depleting)."""
+        if slope < 0:  # Battery is depleting
+            # Calculate when voltage reaches ERI threshold
+            return (BatteryTrendAnalyzer.ERI_THRESHOLD - intercept) / slope
+        return None
+
     @staticmethod
     def analyze_battery_depletion(trend: LongitudinalTrend) -> Dict[str, Any]:
         """
         Analyze battery voltage trend and predict ERI date.
 
+        Uses the fit stored with the trend when present; otherwise (trends
+        written before it was stored, or not yet saved) fits it here.
+
         Args:
             trend: LongitudinalTrend for battery_voltage
 
@@ -166,30 +622,29 @@ class BatteryTrendAnalyzer:
         if len(trend.values) < 3:
             return {'error': 'Insufficient data points for analysis'}
 
-        # Convert time points to days since first observation
-        time_points = [datetime.fromisoformat(tp) for tp in trend.time_points]
-        start_time = time_points[0]
-        days = [(tp - start_time).total_days for tp in time_points]
-
-        # Linear regression
-        slope, intercept, r_value, p_value, std_err = stats.linregress(days, trend.values)
-
-        # Predict ERI date
-        eri_date = None
-        days_to_eri = None
-
-        if slope < 0:  # Battery is depleting
-            # Calculate when voltage reaches ERI threshold
-            days_to_eri = (BatteryTrendAnalyzer.ERI_THRESHOLD - intercept) / slope
+        if trend.slope is not None:
+            slope = trend.slope
+            intercept = trend.intercept
+            # SQLite stores NaN as NULL (constant voltage has no r)
+            r_squared = trend.r_squared if trend.r_squared is not None else np.nan
+            r_value = np.copysign(np.sqrt(r_squared), slope)
+            eri_date = trend.eri_date
+        else:
+            times, values = trend.load_arrays()
+            fit = BatteryTrendAnalyzer.fit_depletion(times, values)
+            if fit is None:
+                raise ValueError("Cannot calculate a linear regression "
+                                 "if all x values are identical")
+            slope, intercept, r_value, eri_date = fit
 
-            if days_to_eri > 0:
-                eri_date = start_time + timedelta(days=days_to_eri)
+        p_value = slope_p_value(r_value, len(trend.values))
+        days_to_eri = BatteryTrendAnalyzer._days_to_eri(slope, intercept)
 
         # Calculate depletion rate (V/year)
         depletion_rate_per_year = slope * 365.25
 
         return {
-            'current_voltage': trend.values[-1],
+            'current_voltage': float(trend.values[-1]),
             'depletion_rate_v_per_year': depletion_rate_per_year,
             'slope': slope,
             'intercept': intercept,
@@ -230,37 +685,60 @@ class LeadImpedanceTrendAnalyzer:
             return []
 
         anomalies = []
-        values = trend.values
-        time_points = [datetime.fromisoformat(tp) for tp in trend.time_points]
-
-        # Calculate differences between consecutive measurements
-        for i in range(1, len(values)):
-            delta = values[i] - values[i-1]
-
-            if delta > LeadImpedanceTrendAnalyzer.FRACTURE_THRESHOLD:
-                anomalies.append({
-                    'type': 'possible_fracture',
-                    'timestamp': time_points[i].isoformat(),
-                    'previous_value': values[i-1],
-                    'current_value': values[i],
-                    'delta': delta,
-                    'severity': 'critical',
-                    'description': f"Sudden increase of {delta:.0f} Ohms suggests possible lead fracture"
-                })
-
-            elif delta < LeadImpedanceTrendAnalyzer.FAILURE_THRESHOLD:
-                anomalies.append({
-                    'type': 'possible_insulation_failure',
-                    'timestamp': time_points[i].isoformat(),
-                    'previous_value': values[i-1],
-                    'current_value': values[i],
-                    'delta': delta,
-                    'severity': 'critical',
-                    'description': f"Sudden decrease of {abs(delta):.0f} Ohms suggests possible insulation failure"
-                })
+        _, value_array = trend.load_arrays()
+        values = value_array.tolist()
+
+        # Consecutive differences and threshold checks in one vector pass;
+        # anomalies are sparse, so only hits are turned into dictionaries
+        deltas = np.diff(value_array)
+        fracture = deltas > LeadImpedanceTrendAnalyzer.FRACTURE_THRESHOLD
+        failure = deltas < LeadImpedanceTrendAnalyzer.FAILURE_THRESHOLD
+
+        for i in (np.flatnonzero(fracture | failure) + 1).tolist():
+            anomalies.append(LeadImpedanceTrendAnalyzer._anomaly(
+                trend.time_points[i], values[i-1], values[i], values[i] - values[i-1]
+            ))
 
         return anomalies
 
+    @staticmethod
+    def _anomaly(timestamp: str, previous_value: float, current_value: float,
+                 delta: float) -> Dict[str, Any]:
+        """
+        Describe one impedance change beyond the fracture/failure thresholds.
+
+        Args:
+            timestamp: ISO timestamp of the later observation
+            previous_value: Impedance before the change (Ohms)
+            current_value: Impedance after the change (Ohms)
+            delta: current_value - previous_value
+
+        Returns:
+            Anomaly dictionary
+        """
+        if delta > LeadImpedanceTrendAnalyzer.FRACTURE_THRESHOLD:
+            return {
+                'type': 'possible_fracture',
+                'timestamp': timestamp,
+                'previous_value': previous_value,
+                'current_value': current_value,
+                'delta': delta,
+                'severity': 'critical',
+                'description': (f"Sudden increase of {delta:.0f} Ohms "
+                                "suggests possible lead fracture")
+            }
+
+        return {
+            'type': 'possible_insulation_failure',
+            'timestamp': timestamp,
+            'previous_value': previous_value,
+            'current_value': current_value,
+            'delta': delta,
+            'severity': 'critical',
+            'description': (f"Sudden decrease of {abs(delta):.0f} Ohms "
+                            "suggests possible insulation failure")
+        }
+
     @staticmethod
     def calculate_stability_score(trend: LongitudinalTrend) -> float:
         """
@@ -278,8 +756,9 @@ class LeadImpedanceTrendAnalyzer:
             return 100.0
 
         # Calculate coefficient of variation
-        mean_val = np.mean(trend.values)
-        std_val = np.std(trend.values)
+        _, values = trend.load_arrays()
+        mean_val = values.mean()
+        std_val = values.std()
 
         if mean_val == 0:
             return 0.0
@@ -292,6 +771,33 @@ class LeadImpedanceTrendAnalyzer:
 
         return stability_score
 
+    @staticmethod
+    def stability_scores_batch(trends: List[LongitudinalTrend]) -> np.ndarray:
+        """
+        Calculate stability scores of many lead impedance trends at once.
+
+        With Numba installed all trends are scored by one parallel kernel
+        call over their concatenated values; otherwise each trend goes
+        through calculate_stability_score.
+
+        Args:
+            trends: LongitudinalTrends for lead impedance
+
+        Returns:
+            float64 array of stability scores (0-100), one per trend
+        """
+        if not NUMBA_AVAILABLE:
+            return np.array(
+                [LeadImpedanceTrendAnalyzer.calculate_stability_score(trend) for trend in trends],
+                dtype=np.float64,
+            )
+
+        arrays = [trend.load_arrays()[1] for trend in trends]
+        offsets = np.zeros(len(arrays) + 1, dtype=np.int64)
+        np.cumsum([len(values) for values in arrays], out=offsets[1:])
+        values = np.concatenate(arrays) if arrays else np.empty(0, dtype=np.float64)
+        return _stability_kernel(values, offsets)
+
 
 class ArrhythmiaBurdenAnalyzer:
     """
@@ -319,29 +825,24 @@ class ArrhythmiaBurdenAnalyzer:
         if len(trend.values) < 2:
             return {'error': 'Insufficient data'}
 
-        time_points = [datetime.fromisoformat(tp) for tp in trend.time_points]
-        values = np.array(trend.values)
+        _, values = trend.load_arrays()
 
         # Calculate rolling average (if enough points)
         rolling_avg = None
         if len(values) >= 7:
-            rolling_avg = np.convolve(values, np.ones(min(7, len(values))) / min(7, len(values)), mode='valid')
+            rolling_avg = rolling_mean(values, 7)
 
-        # Identify high burden episodes (>20%)
-        high_burden_episodes = []
-        for i, (tp, val) in enumerate(zip(time_points, values)):
-            if val > 20:
-                high_burden_episodes.append({
-                    'timestamp': tp.isoformat(),
-                    'burden_percent': val
-                })
+        # Identify high burden episodes (>20%); timestamps are the stored
+        # ISO strings, so nothing is parsed
+        time_points = trend.time_points
+        high_burden_episodes = [
+            {'timestamp': time_points[i], 'burden_percent': float(values[i])}
+            for i in np.flatnonzero(values[:len(time_points)] > 20).tolist()
+        ]
 
         # Calculate trend (increasing/decreasing)
         if len(values) >= 3:
-            slope, _, r_value, _, _ = stats.linregress(
-                range(len(values)),
-                values
-            )
+            slope, _, r_value = linear_fit(np.arange(len(values)), values)
             trend_direction = 'increasing' if slope > 0 else 'decreasing'
         else:
             slope = 0
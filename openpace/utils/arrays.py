@@ -0,0 +1,28 @@
+"""
+Array Helpers
+
+Small NumPy helpers shared by the trend calculator and the analyzers.
+"""
+
+import numpy as np
+
+
+def rolling_mean(values, window: int) -> np.ndarray:
+    """
+    Moving average over full windows only.
+
+    Same result as ``np.convolve(values, np.ones(window) / window, 'valid')``
+    (``len(values) - window + 1`` points) but computed from a cumulative
+    sum, so the cost does not grow with the window size.
+
+    Args:
+        values: 1-D sequence of numbers
+        window: Window size (1 to len(values))
+
+    Returns:
+        float64 array of window means
+    """
+    totals = np.cumsum(values, dtype=np.float64)
+    sums = totals[window - 1:].copy()
+    sums[1:] -= totals[:-window]
+    return sums / window
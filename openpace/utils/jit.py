@@ -0,0 +1,25 @@
+"""
+Optional Numba JIT Support
+
+Numeric kernels are decorated with ``njit`` from this module. Numba is an
+optional dependency: when it is not installed ``njit`` is a no-op decorator,
+``prange`` is ``range`` and ``NUMBA_AVAILABLE`` is False, so callers keep a
+NumPy implementation as their default path.
+"""
+
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+    prange = range
+
+    def njit(*args, **kwargs):
+        """No-op stand-in for numba.njit (supports bare and called forms)."""
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+
+        def decorator(func):
+            return func
+
+        return decorator
@@ -0,0 +1,141 @@
+"""
+Least-Squares Line Fitting
+
+Closed-form simple linear regression shared by the trend calculator and the
+analyzers. Results match scipy.stats.linregress without its per-call
+argument handling, which dominates on short trends. The centered sums are
+computed by a Numba kernel when Numba is installed.
+"""
+
+from typing import Tuple
+import numpy as np
+from scipy.special import stdtr
+
+from openpace.utils.jit import NUMBA_AVAILABLE, njit
+
+# Guards the p-value t statistic against division by zero at |r| == 1
+_TINY = 1.0e-20
+
+
+@njit(cache=True)
+def _centered_sums_kernel(x, y):
+    """Means and centered sums of squares/products in two passes."""
+    n = x.shape[0]
+    x_mean = 0.0
+    y_mean = 0.0
+    for i in range(n):
+        x_mean += x[i]
+        y_mean += y[i]
+    x_mean /= n
+    y_mean /= n
+
+    sxx = 0.0
+    sxy = 0.0
+    syy = 0.0
+    for i in range(n):
+        dx = x[i] - x_mean
+        dy = y[i] - y_mean
+        sxx += dx * dx
+        sxy += dx * dy
+        syy += dy * dy
+    return x_mean, y_mean, sxx, sxy, syy
+
+
+def _centered_sums(x: np.ndarray, y: np.ndarray) -> Tuple[float, float, float, float, float]:
+    """
+    Means and centered sums of two equal-length series.
+
+    Args:
+        x: Independent values (float64)
+        y: Dependent values (float64)
+
+    Returns:
+        Tuple of (x_mean, y_mean, sxx, sxy, syy)
+    """
+    if NUMBA_AVAILABLE:
+        return _centered_sums_kernel(x, y)
+
+    x_mean = x.mean()
+    y_mean = y.mean()
+    dx = x - x_mean
+    dy = y - y_mean
+    return x_mean, y_mean, dx @ dx, dx @ dy, dy @ dy
+
+
+def _fit(x: np.ndarray, y: np.ndarray) -> Tuple[float, float, float, float, float]:
+    """Slope, intercept, r and the centered sums sxx, syy of float64 series."""
+    x_mean, y_mean, sxx, sxy, syy = _centered_sums(x, y)
+
+    if sxx == 0:
+        raise ValueError("Cannot calculate a linear regression if all x values are identical")
+
+    if syy == 0:
+        r_value = np.nan if sxy == 0 else 0.0
+    else:
+        r_value = min(max(sxy / np.sqrt(sxx * syy), -1.0), 1.0)
+
+    slope = sxy / sxx
+    intercept = y_mean - slope * x_mean
+    return float(slope), float(intercept), float(r_value), float(sxx), float(syy)
+
+
+def linear_fit(x: np.ndarray, y: np.ndarray) -> Tuple[float, float, float]:
+    """
+    Closed-form least-squares line through (x, y).
+
+    Args:
+        x: Independent values
+        y: Dependent values (same length as x)
+
+    Returns:
+        Tuple of (slope, intercept, r_value)
+
+    Raises:
+        ValueError: If all x values are identical
+    """
+    x = np.ascontiguousarray(x, dtype=np.float64)
+    y = np.ascontiguousarray(y, dtype=np.float64)
+    return _fit(x, y)[:3]
+
+
+def slope_p_value(r_value: float, n: int) -> float:
+    """
+    Two-sided p-value for a non-zero slope (as scipy.stats.linregress).
+
+    Args:
+        r_value: Correlation coefficient from linear_fit
+        n: Number of points (at least 3)
+
+    Returns:
+        p-value
+    """
+    df = n - 2
+    t = r_value * np.sqrt(df / ((1.0 - r_value + _TINY) * (1.0 + r_value + _TINY)))
+    return float(2 * stdtr(df, -abs(t)))
+
+
+def linregress(x: np.ndarray, y: np.ndarray) -> Tuple[float, float, float, float, float]:
+    """
+    Drop-in for the five values of scipy.stats.linregress.
+
+    Args:
+        x: Independent values
+        y: Dependent values (same length as x, at least 2 points)
+
+    Returns:
+        Tuple of (slope, intercept, r_value, p_value, std_err)
+
+    Raises:
+        ValueError: If all x values are identical
+    """
+    x = np.ascontiguousarray(x, dtype=np.float64)
+    y = np.ascontiguousarray(y, dtype=np.float64)
+    slope, intercept, r_value, sxx, syy = _fit(x, y)
+    n = len(y)
+
+    if n == 2:
+        # A line through two points is exact
+        return slope, intercept, r_value, 1.0 if y[0] == y[1] else 0.0, 0.0
+
+    std_err = float(np.sqrt((1 - r_value ** 2) * syy / sxx / (n - 2)))
+    return slope, intercept, r_value, slope_p_value(r_value, n), std_err
@@ -20,8 +20,9 @@ try:
     HAS_PYQT = True
 except ImportError:
     HAS_PYQT = False
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
 from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import StaticPool
 
 # Add the project root to the Python path
 project_root = Path(__file__).parent.parent
@@ -30,6 +31,55 @@ sys.path.insert(0, str(project_root))
 from openpace.database.models import Base
 
 
+def pytest_addoption(parser):
+    """Register the --fast option for the developer inner loop."""
+    parser.addoption(
+        "--fast",
+        action="store_true",
+        default=False,
+        help="Skip slow rendering paths such as PDF report generation"
+    )
+
+
+def pytest_configure(config):
+    """Expose --fast to the tests as OPENPACE_FAST_TESTS=1."""
+    if config.getoption("--fast"):
+        os.environ["OPENPACE_FAST_TESTS"] = "1"
+
+
+# Sample HL7 payloads, allocated once and returned by the fixtures below
+_HL7_ORU_R01: str = """MSH|^~\\&|PACEMAKER^1.0|MEDTRONIC|OPENPACE|CLINIC|20240115120000||ORU^R01|MSG00001|P|2.5.1|||AL|AL|USA
+PID|1||TEST001^^^CLINIC^MR||DOE^JOHN^A||19600101|M|||123 MAIN ST^^ANYTOWN^CA^12345^USA|||||||123456789
+PV1|1|O|CARDIO^^^^CLINIC||||1234^SMITH^JANE^M^^^MD|1234^SMITH^JANE^M^^^MD|||||||||1234^SMITH^JANE^M^^^MD||VIS001|||||||||||||||||||||||||20240115120000
+OBR|1|ORD001|SPEC001|DEVICE_INTERROGATION^Device Interrogation^LN|||20240115120000|||||||||1234^SMITH^JANE^M^^^MD
+OBX|1|ST|DEVICE_MODEL^Device Model^LN||ADVISA DR MRI A3DR01|||||F|||20240115120000
+OBX|2|ST|DEVICE_SERIAL^Device Serial Number^LN||PMC123456|||||F|||20240115120000
+OBX|3|NM|BATTERY_VOLTAGE^Battery Voltage^LN||2.78|V|2.5-2.8||||F|||20240115120000
+OBX|4|NM|BATTERY_IMPEDANCE^Battery Impedance^LN||5500|Ohm|<10000||||F|||20240115120000
+OBX|5|NM|RA_LEAD_IMPEDANCE^RA Lead Impedance^LN||520|Ohm|200-1500||||F|||20240115120000
+OBX|6|NM|RV_LEAD_IMPEDANCE^RV Lead Impedance^LN||680|Ohm|200-1500||||F|||20240115120000
+OBX|7|NM|PACING_PERCENT_A^Atrial Pacing Percent^LN||15.2|%|||||F|||20240115120000
+OBX|8|NM|PACING_PERCENT_V^Ventricular Pacing Percent^LN||98.5|%|||||F|||20240115120000
+OBX|9|NM|HEART_RATE_AVG^Average Heart Rate^LN||72|bpm|||||F|||20240115120000
+OBX|10|ST|MODE^Pacing Mode^LN||DDDR|||||F|||20240115120000
+OBX|11|NM|LOWER_RATE_LIMIT^Lower Rate Limit^LN||60|bpm|||||F|||20240115120000
+OBX|12|NM|UPPER_RATE_LIMIT^Upper Rate Limit^LN||130|bpm|||||F|||20240115120000
+OBX|13|NM|AF_BURDEN^Atrial Fibrillation Burden^LN||2.3|%|||||F|||20240115120000
+"""
+
+
+_HL7_MULTIPLE_SEGMENTS: str = """MSH|^~\\&|PACEMAKER^1.0|BOSTON_SCIENTIFIC|OPENPACE|CLINIC|20240115120000||ORU^R01|MSG00002|P|2.5.1|||AL|AL|USA
+PID|1||TEST002^^^CLINIC^MR||SMITH^JANE^B||19650515|F|||456 ELM ST^^TESTCITY^NY^67890^USA
+OBR|1|ORD002|SPEC002|ARRHYTHMIA_LOG^Arrhythmia Log^LN|||20240115120000
+OBX|1|NM|AF_EPISODE_COUNT^AF Episode Count^LN||5|episodes|||||F|||20240115120000
+OBX|2|TS|AF_EPISODE_1_START^AF Episode 1 Start^LN||20240110083000|||||F|||20240115120000
+OBX|3|NM|AF_EPISODE_1_DURATION^AF Episode 1 Duration^LN||320|seconds|||||F|||20240115120000
+OBX|4|NM|AF_EPISODE_1_HR_AVG^AF Episode 1 Avg HR^LN||145|bpm|||||F|||20240115120000
+OBR|2|ORD003|SPEC003|EGM^Electrogram^LN|||20240115120000
+OBX|1|ED|EGM_STRIP_1^EGM Strip 1^LN||^APPLICATION^BASE64^SGVsbG8gV29ybGQgLSBUaGlzIGlzIGEgc2FtcGxlIEVHTSBkYXRh|||||F|||20240115120000
+"""
+
+
 @pytest.fixture(scope="session")
 def qapp():
     """
@@ -46,15 +96,37 @@ def qapp():
     return app
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def test_db_engine():
     """
     Create an in-memory SQLite database engine for testing.
 
+    Session-scoped: the schema DDL runs once for the whole test run, and
+    db_session isolates each test in a transaction that is rolled back.
+
     Yields:
         Engine: SQLAlchemy engine connected to in-memory SQLite database
     """
-    engine = create_engine("sqlite:///:memory:", echo=False)
+    # One connection shared by every session and thread, so they all see
+    # the same in-memory schema
+    engine = create_engine(
+        "sqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+        echo=False
+    )
+
+    # pysqlite defers BEGIN until the first write, so a SAVEPOINT could open
+    # (and its RELEASE commit) a transaction of its own; let SQLAlchemy emit
+    # BEGIN itself so per-test savepoints nest inside the outer transaction
+    @event.listens_for(engine, "connect")
+    def _disable_pysqlite_begin(dbapi_connection, connection_record):
+        dbapi_connection.isolation_level = None
+
+    @event.listens_for(engine, "begin")
+    def _emit_begin(connection):
+        connection.exec_driver_sql("BEGIN")
+
     Base.metadata.create_all(engine)
     yield engine
     engine.dispose()
@@ -65,8 +137,12 @@ def db_session(test_db_engine) -> Generator[Session, None, None]:
     """
     Create a database session for testing.
 
-    The session is automatically rolled back after each test to ensure
-    test isolation.
+    The session is bound to a connection inside an outer transaction that is
+    rolled back on teardown, so nothing a test writes reaches the shared
+    schema. commit() inside a test only releases a savepoint, and autoflush
+    is disabled so inserts are flushed together instead of before every
+    query. Use session.begin_nested() for a savepoint when a test needs to
+    roll back part of its work.
 
     Args:
         test_db_engine: SQLAlchemy engine fixture
@@ -74,14 +150,19 @@ def db_session(test_db_engine) -> Generator[Session, None, None]:
     Yields:
         Session: SQLAlchemy session for database operations
     """
-    SessionLocal = sessionmaker(bind=test_db_engine)
+    connection = test_db_engine.connect()
+    transaction = connection.begin()
+    SessionLocal = sessionmaker(bind=connection, autoflush=False,
+                                expire_on_commit=False,
+                                join_transaction_mode="create_savepoint")
     session = SessionLocal()
 
     try:
         yield session
     finally:
-        session.rollback()
         session.close()
+        transaction.rollback()
+        connection.close()
 
 
 @pytest.fixture
@@ -102,7 +183,7 @@ def temp_db_file() -> Generator[Path, None, None]:
             tmp_path.unlink()
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def sample_hl7_oru_r01() -> str:
     """
     Sample HL7 ORU^R01 message for pacemaker data.
@@ -112,27 +193,10 @@ def sample_hl7_oru_r01() -> str:
     Returns:
         str: HL7 message in standard HL7 format
     """
-    return """MSH|^~\\&|PACEMAKER^1.0|MEDTRONIC|OPENPACE|CLINIC|20240115120000||ORU^R01|MSG00001|P|2.5.1|||AL|AL|USA
-PID|1||TEST001^^^CLINIC^MR||DOE^JOHN^A||19600101|M|||123 MAIN ST^^ANYTOWN^CA^12345^USA|||||||123456789
-PV1|1|O|CARDIO^^^^CLINIC||||1234^SMITH^JANE^M^^^MD|1234^SMITH^JANE^M^^^MD|||||||||1234^SMITH^JANE^M^^^MD||VIS001|||||||||||||||||||||||||20240115120000
-OBR|1|ORD001|SPEC001|DEVICE_INTERROGATION^Device Interrogation^LN|||20240115120000|||||||||1234^SMITH^JANE^M^^^MD
-OBX|1|ST|DEVICE_MODEL^Device Model^LN||ADVISA DR MRI A3DR01|||||F|||20240115120000
-OBX|2|ST|DEVICE_SERIAL^Device Serial Number^LN||PMC123456|||||F|||20240115120000
-OBX|3|NM|BATTERY_VOLTAGE^Battery Voltage^LN||2.78|V|2.5-2.8||||F|||20240115120000
-OBX|4|NM|BATTERY_IMPEDANCE^Battery Impedance^LN||5500|Ohm|<10000||||F|||20240115120000
-OBX|5|NM|RA_LEAD_IMPEDANCE^RA Lead Impedance^LN||520|Ohm|200-1500||||F|||20240115120000
-OBX|6|NM|RV_LEAD_IMPEDANCE^RV Lead Impedance^LN||680|Ohm|200-1500||||F|||20240115120000
-OBX|7|NM|PACING_PERCENT_A^Atrial Pacing Percent^LN||15.2|%|||||F|||20240115120000
-OBX|8|NM|PACING_PERCENT_V^Ventricular Pacing Percent^LN||98.5|%|||||F|||20240115120000
-OBX|9|NM|HEART_RATE_AVG^Average Heart Rate^LN||72|bpm|||||F|||20240115120000
-OBX|10|ST|MODE^Pacing Mode^LN||DDDR|||||F|||20240115120000
-OBX|11|NM|LOWER_RATE_LIMIT^Lower Rate Limit^LN||60|bpm|||||F|||20240115120000
-OBX|12|NM|UPPER_RATE_LIMIT^Upper Rate Limit^LN||130|bpm|||||F|||20240115120000
-OBX|13|NM|AF_BURDEN^Atrial Fibrillation Burden^LN||2.3|%|||||F|||20240115120000
-"""
+    return _HL7_ORU_R01
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def sample_hl7_multiple_segments() -> str:
     """
     Sample HL7 message with multiple OBR/OBX segments for testing complex parsing.
@@ -140,16 +204,7 @@ def sample_hl7_multiple_segments() -> str:
     Returns:
         str: HL7 message with arrhythmia episodes
     """
-    return """MSH|^~\\&|PACEMAKER^1.0|BOSTON_SCIENTIFIC|OPENPACE|CLINIC|20240115120000||ORU^R01|MSG00002|P|2.5.1|||AL|AL|USA
-PID|1||TEST002^^^CLINIC^MR||SMITH^JANE^B||19650515|F|||456 ELM ST^^TESTCITY^NY^67890^USA
-OBR|1|ORD002|SPEC002|ARRHYTHMIA_LOG^Arrhythmia Log^LN|||20240115120000
-OBX|1|NM|AF_EPISODE_COUNT^AF Episode Count^LN||5|episodes|||||F|||20240115120000
-OBX|2|TS|AF_EPISODE_1_START^AF Episode 1 Start^LN||20240110083000|||||F|||20240115120000
-OBX|3|NM|AF_EPISODE_1_DURATION^AF Episode 1 Duration^LN||320|seconds|||||F|||20240115120000
-OBX|4|NM|AF_EPISODE_1_HR_AVG^AF Episode 1 Avg HR^LN||145|bpm|||||F|||20240115120000
-OBR|2|ORD003|SPEC003|EGM^Electrogram^LN|||20240115120000
-OBX|1|ED|EGM_STRIP_1^EGM Strip 1^LN||^APPLICATION^BASE64^SGVsbG8gV29ybGQgLSBUaGlzIGlzIGEgc2FtcGxlIEVHTSBkYXRh|||||F|||20240115120000
-"""
+    return _HL7_MULTIPLE_SEGMENTS
 
 
 @pytest.fixture
@@ -0,0 +1,37 @@
+"""
+Shared test helpers.
+
+Helpers that test modules import directly. Fixtures stay in conftest.py,
+which pytest loads as a plugin rather than as an importable module.
+"""
+
+import contextlib
+from typing import Generator, List
+
+from sqlalchemy import event
+
+
+@contextlib.contextmanager
+def count_queries(connectable) -> Generator[List[str], None, None]:
+    """
+    Record the SQL statements executed on an engine or connection.
+
+    Lets tests assert how many queries a load path issues, so a silent
+    regression to per-row lazy loading fails the test.
+
+    Args:
+        connectable: SQLAlchemy Engine or Connection to listen on
+
+    Yields:
+        List[str]: Statements executed inside the block, in order
+    """
+    queries = []
+
+    def _record(conn, cursor, statement, parameters, context, executemany):
+        queries.append(statement)
+
+    event.listen(connectable, "before_cursor_execute", _record)
+    try:
+        yield queries
+    finally:
+        event.remove(connectable, "before_cursor_execute", _record)
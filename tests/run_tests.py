@@ -21,36 +21,59 @@ Options:
     --verbose       Verbose output
     --markers       List all available test markers
     --failed        Re-run only failed tests from last run
+    --subprocess    Run pytest in a separate process instead of in-process
 """
 
+import os
 import sys
 import subprocess
 from pathlib import Path
 
+PROJECT_ROOT = Path(__file__).parent.parent
 
-def run_command(cmd):
-    """Execute a shell command and return the result."""
+
+def run_command(cmd, use_subprocess=False):
+    """
+    Run a pytest command and return its exit code.
+
+    pytest runs inside this interpreter unless use_subprocess is set, which
+    avoids a second interpreter startup and plugin discovery.
+
+    Args:
+        cmd: Command line starting with "pytest"
+        use_subprocess: Spawn pytest as a separate process
+
+    Returns:
+        Exit code
+    """
     print(f"\n{'='*60}")
     print(f"Running: {' '.join(cmd)}")
     print(f"{'='*60}\n")
 
-    result = subprocess.run(cmd, cwd=Path(__file__).parent.parent)
-    return result.returncode
+    if use_subprocess:
+        result = subprocess.run(cmd, cwd=PROJECT_ROOT)
+        return result.returncode
+
+    import pytest
+
+    os.chdir(PROJECT_ROOT)
+    return int(pytest.main(cmd[1:]))
 
 
 def main():
     """Main test runner function."""
     args = sys.argv[1:]
+    use_subprocess = "--subprocess" in args
 
     # Base pytest command
     base_cmd = ["pytest"]
 
     # Handle special commands
     if "--markers" in args:
-        return run_command(base_cmd + ["--markers"])
+        return run_command(base_cmd + ["--markers"], use_subprocess)
 
     if "--failed" in args:
-        return run_command(base_cmd + ["--lf"])
+        return run_command(base_cmd + ["--lf"], use_subprocess)
 
     # Build command based on arguments
     if "--all" in args or len(args) == 0:
@@ -81,7 +104,7 @@ def main():
     if "--verbose" in args:
         cmd.append("-vv")
 
-    return run_command(cmd)
+    return run_command(cmd, use_subprocess)
 
 
 if __name__ == "__main__":
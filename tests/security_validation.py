@@ -19,6 +19,11 @@ from pathlib import Path
 # Add project root to path
 sys.path.insert(0, str(Path(__file__).parent))
 
+# Minimal valid HL7 message shared by the validation tests
+_MINIMAL_HL7 = "MSH|^~\\&|SENDING_APP|FACILITY|RCV_APP|RCV_FAC|20240101120000||ORU^R01|MSG001|P|2.5\r" \
+               "PID|1||PT12345^^^FACILITY||DOE^JOHN||19600101|M\r" \
+               "OBX|1|NM|BATT^Battery Voltage^LN||2.78|V||||F"
+
 
 def print_header(text):
     """Print formatted section header."""
@@ -139,12 +144,8 @@ def test_hl7_validation():
     parser = HL7Parser(db_session)
 
     # Test 2.1: Valid HL7 message (minimal)
-    valid_hl7 = "MSH|^~\\&|SENDING_APP|FACILITY|RCV_APP|RCV_FAC|20240101120000||ORU^R01|MSG001|P|2.5\r" \
-                "PID|1||PT12345^^^FACILITY||DOE^JOHN||19600101|M\r" \
-                "OBX|1|NM|BATT^Battery Voltage^LN||2.78|V||||F"
-
     try:
-        parser.validate_hl7_message(valid_hl7)
+        parser.validate_hl7_message(_MINIMAL_HL7)
         print_test("Valid HL7 message accepted", True, "Validation passed")
     except Exception as e:
         print_test("Valid HL7 message accepted", False, f"Unexpected error: {e}")
@@ -221,10 +222,7 @@ def test_file_validation():
     # Test 3.1: Valid file
     with tempfile.NamedTemporaryFile(mode='w', suffix='.hl7', delete=False) as f:
         # Write valid HL7 content
-        valid_hl7 = "MSH|^~\\&|SENDING_APP|FACILITY|RCV_APP|RCV_FAC|20240101120000||ORU^R01|MSG001|P|2.5\r" \
-                    "PID|1||PT12345^^^FACILITY||DOE^JOHN||19600101|M\r" \
-                    "OBX|1|NM|BATT^Battery Voltage^LN||2.78|V||||F"
-        f.write(valid_hl7)
+        f.write(_MINIMAL_HL7)
         valid_file_path = f.name
 
     try:
@@ -255,10 +253,11 @@ def test_file_validation():
             print_test("Directory path blocked", False, f"Wrong exception: {e}")
 
     # Test 3.4: Oversized file
-    with tempfile.NamedTemporaryFile(mode='wb', suffix='.hl7', delete=False) as f:
-        # Write file larger than 50 MB
-        f.write(b'A' * (50 * 1024 * 1024 + 1000))
-        oversized_file_path = f.name
+    # Extend an empty file past 50 MB: a sparse file, so no data is
+    # materialized in memory or written to disk
+    fd, oversized_file_path = tempfile.mkstemp(suffix='.hl7')
+    os.ftruncate(fd, 50 * 1024 * 1024 + 1000)
+    os.close(fd)
 
     try:
         main_window._validate_import_file(oversized_file_path)
@@ -288,10 +287,7 @@ def test_file_validation():
     # Test 3.6: Symlink (if supported on platform)
     if hasattr(os, 'symlink'):
         with tempfile.NamedTemporaryFile(mode='w', suffix='.hl7', delete=False) as f:
-            valid_hl7 = "MSH|^~\\&|SENDING_APP|FACILITY|RCV_APP|RCV_FAC|20240101120000||ORU^R01|MSG001|P|2.5\r" \
-                        "PID|1||PT12345^^^FACILITY||DOE^JOHN||19600101|M\r" \
-                        "OBX|1|NM|BATT^Battery Voltage^LN||2.78|V||||F"
-            f.write(valid_hl7)
+            f.write(_MINIMAL_HL7)
             real_file = f.name
 
         symlink_path = real_file + ".symlink"
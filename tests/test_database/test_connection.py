@@ -296,3 +296,40 @@ class TestDatabaseConfiguration:
         assert len(sessions) == 5
         for session in sessions:
             session.close()
+
+
+class TestSchemaUpgrade:
+    """Test upgrading databases created by earlier versions."""
+
+    def test_duplicate_trends_block_unique_index(self, tmp_path, caplog):
+        """Duplicate trends are kept and the unique index is skipped with a warning."""
+        from openpace.database.connection import init_database, get_db_session, close_database
+
+        db_path = tmp_path / "legacy.db"
+        init_database(str(db_path))
+        session = get_db_session()
+        session.add(Patient(patient_id="P1", patient_name="Jane Roe"))
+        session.commit()
+        session.close()
+        engine = DatabaseManager().engine
+        with engine.begin() as conn:
+            conn.execute(text("DROP INDEX uq_trend_patient_variable"))
+            for _ in range(2):
+                conn.execute(text(
+                    "INSERT INTO longitudinal_trends (patient_id, variable_name, time_points, "
+                    "\"values\", start_date, end_date, computed_at) VALUES ('P1', "
+                    "'heart_rate', '[]', '[]', '2024-01-01', '2024-01-01', '2024-01-01')"
+                ))
+        close_database()
+
+        init_database(str(db_path))
+        engine = DatabaseManager().engine
+        indexes = inspect(engine).get_indexes("longitudinal_trends")
+        index_names = {index['name'] for index in indexes}
+        with engine.connect() as conn:
+            row_count = conn.execute(text("SELECT COUNT(*) FROM longitudinal_trends")).scalar()
+        close_database()
+
+        assert row_count == 2
+        assert "uq_trend_patient_variable" not in index_names
+        assert "migrate_trend_duplicates.py" in caplog.text
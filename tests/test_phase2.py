@@ -6,6 +6,7 @@ Test Script: Phase 2 - Data Normalization
 Tests unit conversion, histogram parsing, EGM decoding, and trend calculation.
 """
 
+import json
 import sys
 from pathlib import Path
 import numpy as np
@@ -18,6 +19,12 @@ if sys.platform == 'win32':
 from openpace.processing.normalizer import UnitConverter, DataQualityValidator, DataNormalizer
 from openpace.processing.histogram_parser import HistogramParser, TimeInZoneCalculator
 from openpace.processing.egm_decoder import EGMDecoder, EGMProcessor
+from openpace.processing.trend_calculator import BatteryTrendAnalyzer, LeadImpedanceTrendAnalyzer
+from openpace.database.models import LongitudinalTrend
+from openpace.utils.regression import linregress
+
+# Seeded generator so the synthetic EGM (and its peak count) is reproducible
+_RNG = np.random.default_rng(42)
 
 
 def test_unit_conversion():
@@ -41,6 +48,13 @@ def test_unit_conversion():
     print(f"V Normalized battery: {value} {unit}")
     assert value == 2.65 and unit == 'V', "Normalization failed"
 
+    # Column-wise normalization matches normalize() row by row
+    rows = [('battery_voltage', 2650, 'mV'), ('lead_impedance_atrial', 1.5, 'kOhm'),
+            ('heart_rate', 72, 'bpm'), ('custom_metric', 5, 'widgets')]
+    values, units = UnitConverter.normalize_many(*zip(*rows))
+    assert list(zip(values.tolist(), units)) == [UnitConverter.normalize(*row) for row in rows], \
+        "normalize_many should match normalize"
+
     print("V All unit conversion tests passed")
 
 
@@ -54,6 +68,7 @@ def test_data_quality():
     result = DataQualityValidator.validate('battery_voltage', 2.65)
     print(f"V Battery 2.65V: {result['severity']} - {result['flags']}")
     assert result['severity'] == 'normal', "Should be normal"
+    assert result['flags'] == (), "Normal values should have no flags"
 
     # Test low battery (ERI)
     result = DataQualityValidator.validate('battery_voltage', 2.1)
@@ -87,6 +102,47 @@ def test_histogram_parsing():
     assert len(result['bins']) == 4, "Should have 4 bins"
     assert result['percentages'][1] == 45.0, "Second bin should be 45%"
 
+    # Test comma-separated format (same token grammar)
+    csv_result = HistogramParser.parse_rate_histogram("60-70:10,70-80:45,80-90:30")
+    assert csv_result['bins'] == [(60.0, 70.0), (70.0, 80.0), (80.0, 90.0)], "CSV bins mismatch"
+    assert csv_result['percentages'] == [10.0, 45.0, 30.0], "CSV percentages mismatch"
+
+    # Results are plain JSON-serializable dicts without private keys
+    for parsed in (result, csv_result, HistogramParser.parse_rate_histogram(histogram_str)):
+        json.dumps(parsed)
+        assert not any(key.startswith('_') for key in parsed), "Private keys in result"
+
+    # Values accept any float syntax, as float() parsing always did
+    exp_result = HistogramParser.parse_rate_histogram("60-70:1e1%|70-80:90%")
+    assert exp_result['bins'] == [(60.0, 70.0), (70.0, 80.0)], "Exponent bin should be kept"
+    assert exp_result['percentages'] == [10.0, 90.0], "Exponent percentage mismatch"
+
+    # Batch parsing matches parsing each string on its own
+    batch_inputs = [histogram_str, "", "60-70:10,70-80:45,80-90:30", "not a histogram",
+                    "rest:40%|light:60%", "60-70:1e1,70-80:9e1"]
+    batch_results = HistogramParser.parse_rate_histogram_batch(batch_inputs)
+    for raw, parsed in zip(batch_inputs, batch_results):
+        single = HistogramParser.parse_rate_histogram(raw)
+        assert (parsed is None) == (single is None), f"Batch result mismatch for {raw!r}"
+        if single is not None:
+            assert parsed['bins'] == single['bins'], f"Batch bins mismatch for {raw!r}"
+            assert parsed['percentages'] == single['percentages'], \
+                f"Batch percentages mismatch for {raw!r}"
+
+    # Parsing is memoized; callers still get independent copies
+    result_again = HistogramParser.parse_rate_histogram(histogram_str)
+    result_again['percentages'].append(0.0)
+    assert len(HistogramParser.parse_rate_histogram(histogram_str)['percentages']) == 4, \
+        "Cached histogram should not be mutated by callers"
+
+    # Same-layout histograms use a generated parser; other layouts fall back
+    same_layout = HistogramParser.parse_rate_histogram("60-70:20%|70-80:35%|80-90:25%|90-100:20%")
+    assert same_layout['bins'] == result['bins'], "Same layout should keep bins"
+    assert same_layout['percentages'] == [20.0, 35.0, 25.0, 20.0], \
+        "Same layout percentages mismatch"
+    changed = HistogramParser.parse_rate_histogram("60-70:20%|70-80:abc|80-90:25%|90-100:20%")
+    assert changed['bins'] == [(60.0, 70.0), (80.0, 90.0), (90.0, 100.0)], "Malformed token should be skipped"
+
     # Calculate statistics
     stats = HistogramParser.calculate_statistics(result)
     print(f"  Weighted mean: {stats['weighted_mean']:.1f} bpm")
@@ -95,6 +151,26 @@ def test_histogram_parsing():
 
     # Test time in zones
     zones = TimeInZoneCalculator.calculate_time_in_zones(result)
+    assert zones['normal_rest'] == 100.0, "All bins should fall in normal_rest"
+    assert zones['bradycardia'] == 0.0, "No bins should fall in bradycardia"
+
+    # Statistics and zones follow edits made to a histogram after parsing
+    edited = HistogramParser.parse_rate_histogram("60-70:50%|70-80:50%")
+    assert HistogramParser.calculate_statistics(edited)['weighted_mean'] == 70.0
+    edited['percentages'] = [100.0, 0.0]
+    assert HistogramParser.calculate_statistics(edited)['weighted_mean'] == 65.0, \
+        "Statistics should reflect the new percentages"
+    assert '_stats' not in edited, "Statistics should not be stored on the histogram"
+    edited['bins'] = [(100.0, 110.0), (110.0, 120.0)]
+    assert HistogramParser.calculate_statistics(edited)['weighted_mean'] == 105.0, \
+        "Statistics should use midpoints of the new bins"
+    assert TimeInZoneCalculator.calculate_time_in_zones(edited)['elevated'] == 100.0, \
+        "Zones should use midpoints of the new bins"
+
+    # Histograms without numeric 'bins' yield all-zero zones
+    for no_bins in ({}, HistogramParser.parse_activity_histogram('rest:40%|light:60%')):
+        assert not any(TimeInZoneCalculator.calculate_time_in_zones(no_bins).values()), \
+            "Histogram without bins should give all-zero zones"
     print(f"V Time in zones:")
     for zone, pct in zones.items():
         if pct > 0:
@@ -115,26 +191,26 @@ def test_egm_processing():
     sample_count = sample_rate * duration
 
     # Create signal with simulated QRS complexes
-    t = np.linspace(0, duration, sample_count)
     signal_data = np.zeros(sample_count)
 
-    # Add 6 heartbeats (72 bpm)
+    # Add 6 heartbeats (72 bpm): simplified 50-sample QRS complexes
+    # scattered into the signal in one step
     beat_times = [0.8, 1.6, 2.4, 3.2, 4.0]
-    for beat_time in beat_times:
-        idx = int(beat_time * sample_rate)
-        if idx < len(signal_data) - 50:
-            # Simplified QRS complex
-            signal_data[idx:idx+50] = np.random.randn(50) * 100 + 500
+    qrs = _RNG.standard_normal((len(beat_times), 50)) * 100 + 500
+    idx = (np.asarray(beat_times) * sample_rate).astype(np.int64)
+    valid = idx < sample_count - 50
+    offsets = np.add.outer(idx[valid], np.arange(50)).ravel()
+    signal_data[offsets] = qrs[valid].ravel()
 
     # Add noise
-    signal_data += np.random.randn(sample_count) * 20
+    signal_data += _RNG.standard_normal(sample_count) * 20
 
     # Filter signal
-    filtered = EGMProcessor.filter_signal(signal_data.tolist(), sample_rate)
+    filtered = EGMProcessor.filter_signal(signal_data, sample_rate)
     print(f"V Filtered {len(filtered)} samples")
 
     # Detect peaks
-    peaks = EGMProcessor.detect_peaks(filtered.tolist(), sample_rate)
+    peaks = EGMProcessor.detect_peaks(filtered, sample_rate)
     print(f"V Detected {len(peaks)} peaks")
 
     if len(peaks) >= 2:
@@ -149,6 +225,13 @@ def test_egm_processing():
         print(f"  Mean HR: {hr_stats['mean_hr']:.0f} bpm")
         print(f"  Range: {hr_stats['min_hr']:.0f}-{hr_stats['max_hr']:.0f} bpm")
 
+    # Heart rate and HRV statistics on known intervals (non-positive skipped)
+    hr_stats = EGMProcessor.calculate_heart_rate([800.0, 0.0, 750.0, 1000.0])
+    assert hr_stats['max_hr'] == 80.0 and hr_stats['min_hr'] == 60.0, "HR range mismatch"
+    assert abs(hr_stats['sdnn'] - np.std([800.0, 750.0, 1000.0], ddof=1)) < 1e-9, "SDNN mismatch"
+    assert abs(hr_stats['rmssd'] - np.sqrt((50.0 ** 2 + 250.0 ** 2) / 2)) < 1e-9, "RMSSD mismatch"
+    assert EGMProcessor.calculate_heart_rate([800.0])['rmssd'] is None, "RMSSD needs two intervals"
+
     print("V All EGM processing tests passed")
 
 
@@ -189,9 +272,118 @@ def test_data_normalizer():
     for r in results:
         print(f"  {r['variable_name']}: {r['normalized_value']} {r['standard_unit']} [{r['severity']}]")
 
+    # Columnar batch path must agree with the per-observation path
+    assert results == [normalizer.normalize_observation(obs) for obs in batch], \
+        "Batch normalization should match normalize_observation"
+
+    # In-place batch normalization enriches the caller's dictionaries
+    owned = [dict(obs) for obs in batch]
+    inplace_results = normalizer.normalize_batch(owned, copy=False)
+    assert all(r is obs for r, obs in zip(inplace_results, owned)), "Should reuse input dicts"
+    assert inplace_results == results, "In-place results should match copied results"
+
+    # Normalized records hold plain dicts with list flags, so they serialize
+    for r in [result] + results:
+        assert type(r['validation_result']) is dict, "validation_result should be a plain dict"
+        assert r['validation_result']['flags'] == r['quality_flags'], "Flags should be lists"
+    json.dumps([result] + results)
+
+    # Large batches are chunked across the thread pool; order is preserved
+    large = batch * 400
+    parallel_results = normalizer.normalize_batch(large, parallel_threshold=100)
+    assert parallel_results == normalizer.normalize_batch(large, parallel_threshold=len(large) + 1), \
+        "Parallel batch normalization should match serial results"
+
     print("V All normalization pipeline tests passed")
 
 
+def test_battery_trend_analyzer():
+    """Test battery depletion regression on stored trend time points."""
+    print("\n" + "=" * 60)
+    print("TEST 6: Battery Trend Analysis")
+    print("=" * 60)
+
+    trend = LongitudinalTrend(
+        patient_id="PT12345",
+        variable_name="battery_voltage",
+        time_points=["2024-01-01T00:00:00", "2024-01-11T00:00:00", "2024-01-21T00:00:00"],
+        values=[2.80, 2.79, 2.78],
+    )
+
+    analysis = BatteryTrendAnalyzer.analyze_battery_depletion(trend)
+    print(f"V Slope: {analysis['slope']:.4f} V/day, ERI: {analysis['predicted_eri_date']}")
+    assert abs(analysis['slope'] + 0.001) < 1e-9, "Slope should be -0.001 V/day"
+    assert abs(analysis['days_to_eri'] - 600) < 1e-6, "ERI should be 600 days out"
+    assert analysis['predicted_eri_date'].startswith("2025-08-23"), "ERI date mismatch"
+
+    # Binary arrays load back without parsing and give the same analysis
+    trend.set_arrays(trend.time_points, trend.values)
+    times, values = trend.load_arrays()
+    assert times.dtype == np.dtype('datetime64[us]'), "Times should load as datetime64[us]"
+    assert values.tolist() == trend.values, "Values should round-trip through the blob"
+    assert BatteryTrendAnalyzer.analyze_battery_depletion(trend) == analysis, \
+        "Blob-backed trend should give the same analysis"
+
+    # Reassigning the JSON series drops the now-stale binary copy
+    relabeled = LongitudinalTrend(time_points=trend.time_points, values=trend.values)
+    relabeled.set_arrays(relabeled.time_points, relabeled.values)
+    relabeled.values = [3.0, 2.9, 2.8]
+    assert relabeled.values_blob is None, "Assigning values should clear the blobs"
+    assert relabeled.load_arrays()[1].tolist() == [3.0, 2.9, 2.8], \
+        "load_arrays should read the assigned values"
+
+    # A fit stored with the trend is used instead of refitting
+    times, values = trend.load_arrays()
+    trend.slope, trend.intercept, r_value, trend.eri_date = \
+        BatteryTrendAnalyzer.fit_depletion(times, values)
+    trend.r_squared = r_value ** 2
+    stored = BatteryTrendAnalyzer.analyze_battery_depletion(trend)
+    assert stored['predicted_eri_date'] == analysis['predicted_eri_date'], \
+        "Stored ERI date mismatch"
+    assert abs(stored['p_value'] - analysis['p_value']) < 1e-12, "Stored fit p-value mismatch"
+
+    # Reassigning the series drops the stored fit, so the new series is refitted
+    trend.values = [2.80, 2.78, 2.76]
+    assert trend.slope is None, "Assigning values should clear the stored fit"
+    assert abs(BatteryTrendAnalyzer.analyze_battery_depletion(trend)['slope'] + 0.002) < 1e-9, \
+        "New series should be refitted"
+
+    # Shared regression helper agrees with scipy.stats.linregress
+    from scipy import stats
+    days = [0.0, 10.0, 21.0, 35.0, 50.0]
+    volts = [2.80, 2.79, 2.785, 2.77, 2.76]
+    for ours, ref in zip(linregress(days, volts), stats.linregress(days, volts)[:5]):
+        assert abs(ours - ref) <= 1e-9 * max(1.0, abs(ref)), "linregress should match scipy"
+
+    print("V All battery trend tests passed")
+
+
+def test_lead_stability_batch():
+    """Test batched lead stability scores against the per-trend method."""
+    print("\n" + "=" * 60)
+    print("TEST 7: Batched Lead Stability Scores")
+    print("=" * 60)
+
+    series = [[620, 625, 630, 615], [500, 900, 450], [600], [0, 0, 0], []]
+    trends = [
+        LongitudinalTrend(
+            variable_name="lead_impedance_atrial",
+            time_points=["2024-01-01T00:00:00"] * len(values),
+            values=values,
+        )
+        for values in series
+    ]
+
+    scores = LeadImpedanceTrendAnalyzer.stability_scores_batch(trends)
+    print(f"V Scores: {scores.round(1).tolist()}")
+    assert len(scores) == len(trends), "Should score every trend"
+    for score, trend in zip(scores, trends):
+        expected = LeadImpedanceTrendAnalyzer.calculate_stability_score(trend)
+        assert abs(score - expected) < 1e-9, "Batch score should match calculate_stability_score"
+
+    print("V All lead stability tests passed")
+
+
 def main():
     print("=" * 60)
     print("OpenPace - Phase 2 Data Normalization Tests")
@@ -203,6 +395,8 @@ def main():
         test_histogram_parsing()
         test_egm_processing()
         test_data_normalizer()
+        test_battery_trend_analyzer()
+        test_lead_stability_batch()
 
         print("\n" + "=" * 60)
         print("V ALL PHASE 2 TESTS PASSED!")
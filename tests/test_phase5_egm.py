@@ -208,6 +208,30 @@ def test_egm_decoder():
     return True
 
 
+def test_egm_decode_many():
+    """Test batch EGM decoding across worker processes."""
+    print("\n" + "=" * 70)
+    print("Testing Batch EGM Decoding")
+    print("=" * 70)
+
+    blobs = [
+        create_synthetic_egm_blob(duration_seconds=5, sample_rate=512, heart_rate=rate)
+        for rate in (60, 72, 90)
+    ]
+
+    batch = EGMDecoder.decode_many(blobs, max_workers=2)
+    serial = [EGMDecoder.decode_blob(blob) for blob in blobs]
+
+    print(f"\nDecoded {len(batch)} blobs in parallel")
+
+    assert len(batch) == len(blobs)
+    for parallel_data, serial_data in zip(batch, serial):
+        assert parallel_data['samples'] == serial_data['samples']
+        assert parallel_data['sample_rate'] == serial_data['sample_rate']
+
+    return True
+
+
 def test_egm_processor():
     """Test EGM processor."""
     print("\n" + "=" * 70)
@@ -278,6 +302,28 @@ def test_egm_filtering():
     return len(filtered) == len(samples)
 
 
+def test_multichannel_filtering():
+    """Test threaded multi-channel filtering against single-channel filtering."""
+    print("\n" + "=" * 70)
+    print("Testing Multi-Channel Filtering")
+    print("=" * 70)
+
+    channels = {}
+    for name, rate in [('atrial', 72), ('ventricular', 60), ('shock', 90)]:
+        blob = create_synthetic_egm_blob(duration_seconds=5, sample_rate=512, heart_rate=rate)
+        channels[name] = np.asarray(EGMDecoder.decode_blob(blob)['samples'], dtype=np.float64)
+
+    filtered = EGMProcessor.filter_channels(channels, 512, max_workers=3)
+    print(f"\nFiltered channels: {list(filtered)}")
+
+    assert list(filtered) == list(channels), "Channel order not preserved"
+    for name, samples in channels.items():
+        assert np.array_equal(filtered[name], EGMProcessor.filter_signal(samples, 512)), \
+            f"Channel {name} differs from filter_signal"
+
+    return True
+
+
 def test_peak_detection():
     """Test R-peak detection."""
     print("\n" + "=" * 70)
@@ -292,7 +338,7 @@ def test_peak_detection():
         egm_data = EGMDecoder.decode_blob(blob)
 
         filtered = EGMProcessor.filter_signal(egm_data['samples'], egm_data['sample_rate'])
-        peaks = EGMProcessor.detect_peaks(filtered.tolist(), egm_data['sample_rate'])
+        peaks = EGMProcessor.detect_peaks(filtered, egm_data['sample_rate'])
 
         expected_beats = int(rate * 10 / 60)
         tolerance = 2
@@ -317,8 +363,10 @@ def main():
     results = []
 
     results.append(("EGM Decoder", test_egm_decoder()))
+    results.append(("Batch EGM Decoding", test_egm_decode_many()))
     results.append(("EGM Processor", test_egm_processor()))
     results.append(("Signal Filtering", test_egm_filtering()))
+    results.append(("Multi-Channel Filtering", test_multichannel_filtering()))
     results.append(("Peak Detection", test_peak_detection()))
 
     # Summary
@@ -10,11 +10,21 @@ import sys
 from pathlib import Path
 from datetime import datetime
 
+import numpy as np
+
 # Add parent directory to path
 sys.path.insert(0, str(Path(__file__).parent))
 
 from openpace.database.connection import init_database, get_db_session
 from openpace.database.models import Patient, Transmission, Observation, LongitudinalTrend
+from openpace.database.queries import latest_transmission, patient_trends
+
+# Observation variables that are device settings rather than measurements
+_SETTINGS_VARS = frozenset({
+    'pacing_mode', 'lower_rate', 'max_tracking_rate',
+    'atrial_sensitivity', 'ventricular_sensitivity',
+    'atrial_amplitude', 'ventricular_amplitude',
+})
 
 
 def create_test_data():
@@ -75,8 +85,8 @@ def create_test_data():
         {'var': 'ventricular_amplitude', 'value_num': 2.5, 'unit': 'V'},
     ]
 
-    for i, obs_data in enumerate(observations):
-        obs = Observation(
+    session.add_all([
+        Observation(
             transmission_id=transmission.transmission_id,
             observation_time=transmission.transmission_date,
             sequence_number=i+1,
@@ -87,7 +97,8 @@ def create_test_data():
             unit=obs_data.get('unit'),
             observation_status='F'
         )
-        session.add(obs)
+        for i, obs_data in enumerate(observations)
+    ])
 
     # Create trends
     trends = [
@@ -114,17 +125,22 @@ def create_test_data():
     ]
 
     for trend_data in trends:
+        # Parse all time points in one call, as LongitudinalTrend.load_arrays does
+        times = np.array(trend_data['times'], dtype='datetime64[us]')
+        values = np.array(trend_data['values'], dtype=np.float64)
         trend = LongitudinalTrend(
             patient_id=patient.patient_id,
             variable_name=trend_data['var'],
             time_points=trend_data['times'],
             values=trend_data['values'],
-            start_date=datetime.fromisoformat(trend_data['times'][0]),
-            end_date=datetime.fromisoformat(trend_data['times'][-1]),
-            min_value=min(trend_data['values']),
-            max_value=max(trend_data['values']),
-            mean_value=sum(trend_data['values']) / len(trend_data['values'])
+            start_date=times[0].item(),
+            end_date=times[-1].item(),
+            min_value=float(values.min()),
+            max_value=float(values.max()),
+            mean_value=float(values.mean())
         )
+        # Binary copy read by the analyzers (as TrendCalculator stores it)
+        trend.set_arrays(times, values)
         session.add(trend)
 
     session.commit()
@@ -146,9 +162,7 @@ def test_settings_panel_integration():
     session, patient, transmission = create_test_data()
 
     # Test that we can query the transmission
-    query_transmission = session.query(Transmission).filter_by(
-        patient_id=patient.patient_id
-    ).order_by(Transmission.transmission_date.desc()).first()
+    query_transmission = latest_transmission(session, patient.patient_id)
 
     assert query_transmission is not None, "Failed to query transmission"
     assert query_transmission.transmission_id == transmission.transmission_id
@@ -164,9 +178,7 @@ def test_settings_panel_integration():
     measurement_count = 0
 
     for obs in query_transmission.observations:
-        if obs.variable_name in ['pacing_mode', 'lower_rate', 'max_tracking_rate',
-                                  'atrial_sensitivity', 'ventricular_sensitivity',
-                                  'atrial_amplitude', 'ventricular_amplitude']:
+        if obs.variable_name in _SETTINGS_VARS:
             settings_count += 1
         else:
             measurement_count += 1
@@ -177,13 +189,15 @@ def test_settings_panel_integration():
     print("")
 
     # Test trend loading
-    trends = session.query(LongitudinalTrend).filter_by(
-        patient_id=patient.patient_id
-    ).all()
+    trends = patient_trends(session, patient.patient_id)
 
     print(f"[OK] Trend query successful: {len(trends)} trends")
     for trend in trends:
         print(f"     - {trend.variable_name}: {len(trend.values)} points")
+        times, values = trend.load_arrays()
+        assert values.tolist() == trend.values, "Binary values should match the JSON values"
+        assert times.tolist() == [datetime.fromisoformat(t) for t in trend.time_points], \
+            "Binary times should match the JSON time points"
     print("")
 
     print("=" * 70)
@@ -7,21 +7,44 @@ Tests the pacemaker settings panel logic without opening GUI.
 """
 
 import sys
+from collections import defaultdict
 from pathlib import Path
 from datetime import datetime
 
+from sqlalchemy import select
+from sqlalchemy.orm import selectinload, raiseload
+
 # Add parent directory to path
 sys.path.insert(0, str(Path(__file__).parent))
 
 from openpace.database.connection import init_database, get_db_session
 from openpace.database.models import Patient, Transmission, Observation
+from tests.helpers import count_queries
+
+BANNER = "=" * 70
+
+# Display categories of the extracted settings, in display order
+CATEGORY_SCHEMA = (
+    ("BRADYCARDIA PACING", ('pacing_mode', 'base_rate', 'lower_rate', 'max_tracking_rate',
+                            'max_sensor_rate', 'sav_delay_high', 'sav_delay_low',
+                            'pav_delay_high', 'pav_delay_low', 'sensor_type',
+                            'mode_switch', 'mode_switch_rate')),
+    ("SENSING CONFIGURATION", ('atrial_sensitivity', 'ventricular_sensitivity',
+                               'atrial_adaptation', 'ventricular_adaptation')),
+    ("LEAD CHANNELS", ('atrial_amplitude', 'ventricular_amplitude',
+                       'atrial_pulse_width', 'ventricular_pulse_width',
+                       'atrial_polarity', 'ventricular_polarity')),
+    ("ADVANCED FEATURES", ('magnet_response', 'capture_management')),
+)
+
+# Reverse lookup: variable name -> category header
+_VAR_TO_CATEGORY = {var: header for header, category_vars in CATEGORY_SCHEMA
+                    for var in category_vars}
 
 
 def create_test_transmission_with_settings():
     """Create test transmission with pacemaker settings."""
-    print("=" * 70)
-    print("Creating Test Data with Pacemaker Settings")
-    print("=" * 70)
+    sys.stdout.write(f"{BANNER}\nCreating Test Data with Pacemaker Settings\n{BANNER}\n")
 
     # Initialize in-memory database
     init_database(':memory:', echo=False)
@@ -37,7 +60,7 @@ def create_test_transmission_with_settings():
     session.add(patient)
     session.flush()
 
-    print(f"\nCreated patient: {patient.patient_name}")
+    sys.stdout.write(f"\nCreated patient: {patient.patient_name}\n")
 
     # Create transmission
     transmission = Transmission(
@@ -55,7 +78,7 @@ def create_test_transmission_with_settings():
     session.add(transmission)
     session.flush()
 
-    print(f"Created transmission: {transmission.transmission_date}")
+    sys.stdout.write(f"Created transmission: {transmission.transmission_date}\n")
 
     # Create settings observations
     settings = [
@@ -92,137 +115,133 @@ def create_test_transmission_with_settings():
         {'var': 'capture_management', 'value_text': 'On', 'unit': None},
     ]
 
-    for i, setting in enumerate(settings):
-        obs = Observation(
-            transmission_id=transmission.transmission_id,
-            observation_time=transmission.transmission_date,
-            sequence_number=i+1,
-            variable_name=setting['var'],
-            vendor_code=f'CODE_{i+1}',
-            value_numeric=setting.get('value_num'),
-            value_text=setting.get('value_text'),
-            unit=setting.get('unit'),
-            observation_status='F'
-        )
-        session.add(obs)
-
-    session.commit()
-
-    print(f"Created {len(settings)} settings observations")
-    print("")
+    # One executemany INSERT, without building an ORM instance per row
+    rows = [
+        {
+            'transmission_id': transmission.transmission_id,
+            'observation_time': transmission.transmission_date,
+            'sequence_number': i+1,
+            'variable_name': setting['var'],
+            'vendor_code': f'CODE_{i+1}',
+            'value_numeric': setting.get('value_num'),
+            'value_text': setting.get('value_text'),
+            'unit': setting.get('unit'),
+            'observation_status': 'F'
+        }
+        for i, setting in enumerate(settings)
+    ]
+    session.bulk_insert_mappings(Observation, rows)
+    session.flush()
+
+    sys.stdout.write(f"Created {len(settings)} settings observations\n\n")
 
     return session, transmission
 
 
 def test_settings_extraction():
     """Test settings extraction logic."""
-    print("=" * 70)
-    print("Testing Settings Extraction")
-    print("=" * 70)
+    sys.stdout.write(f"{BANNER}\nTesting Settings Extraction\n{BANNER}\n")
 
     session, transmission = create_test_transmission_with_settings()
+    transmission_id = transmission.transmission_id
+
+    with count_queries(session.connection()) as queries:
+        # Refetch with all observations in one extra query, loading only the
+        # columns displayed; raiseload flags any other relationship access
+        # as an unintended lazy load
+        transmission = session.execute(
+            select(Transmission)
+            .options(
+                selectinload(Transmission.observations).load_only(
+                    Observation.variable_name,
+                    Observation.value_numeric,
+                    Observation.value_text,
+                    Observation.unit,
+                    Observation.vendor_code
+                ),
+                raiseload('*')
+            )
+            .where(Transmission.transmission_id == transmission_id)
+        ).scalar_one()
+
+        # Extract settings
+        settings_data = {}
+        for obs in transmission.observations:
+            var_name = obs.variable_name
+
+            # Get value (numeric or text)
+            if obs.value_numeric is not None:
+                value = obs.value_numeric
+                if obs.unit:
+                    value_str = f"{value} {obs.unit}"
+                else:
+                    value_str = str(value)
+            elif obs.value_text:
+                value_str = obs.value_text
+            else:
+                continue
 
-    # Extract settings
-    settings_data = {}
-    for obs in transmission.observations:
-        var_name = obs.variable_name
+            settings_data[var_name] = {
+                'value': obs.value_numeric if obs.value_numeric is not None else obs.value_text,
+                'value_str': value_str,
+                'unit': obs.unit,
+                'vendor_code': obs.vendor_code
+            }
 
-        # Get value (numeric or text)
-        if obs.value_numeric is not None:
-            value = obs.value_numeric
-            if obs.unit:
-                value_str = f"{value} {obs.unit}"
-            else:
-                value_str = str(value)
-        elif obs.value_text:
-            value_str = obs.value_text
-        else:
-            continue
-
-        settings_data[var_name] = {
-            'value': obs.value_numeric if obs.value_numeric is not None else obs.value_text,
-            'value_str': value_str,
-            'unit': obs.unit,
-            'vendor_code': obs.vendor_code
-        }
+    # The transmission and its observations: no per-row lazy loads
+    assert len(queries) <= 2, f"Settings load issued {len(queries)} queries"
 
-    print(f"\nExtracted {len(settings_data)} settings:")
-    print("")
+    sys.stdout.write(f"\nExtracted {len(settings_data)} settings:\n\n")
 
     # Display by category
-    print("DEVICE INFORMATION:")
-    print(f"  Manufacturer: {transmission.device_manufacturer}")
-    print(f"  Model: {transmission.device_model}")
-    print(f"  Serial: {transmission.device_serial}")
-    print(f"  Firmware: {transmission.device_firmware}")
-    print("")
-
-    print("BRADYCARDIA PACING:")
-    brady_vars = ['pacing_mode', 'base_rate', 'lower_rate', 'max_tracking_rate',
-                  'max_sensor_rate', 'sav_delay_high', 'sav_delay_low',
-                  'pav_delay_high', 'pav_delay_low', 'sensor_type',
-                  'mode_switch', 'mode_switch_rate']
-    for var in brady_vars:
-        if var in settings_data:
-            print(f"  {var}: {settings_data[var]['value_str']}")
-    print("")
-
-    print("SENSING CONFIGURATION:")
-    sensing_vars = ['atrial_sensitivity', 'ventricular_sensitivity',
-                    'atrial_adaptation', 'ventricular_adaptation']
-    for var in sensing_vars:
-        if var in settings_data:
-            print(f"  {var}: {settings_data[var]['value_str']}")
-    print("")
-
-    print("LEAD CHANNELS:")
-    lead_vars = ['atrial_amplitude', 'ventricular_amplitude',
-                 'atrial_pulse_width', 'ventricular_pulse_width',
-                 'atrial_polarity', 'ventricular_polarity']
-    for var in lead_vars:
-        if var in settings_data:
-            print(f"  {var}: {settings_data[var]['value_str']}")
-    print("")
-
-    print("ADVANCED FEATURES:")
-    advanced_vars = ['magnet_response', 'capture_management']
-    for var in advanced_vars:
-        if var in settings_data:
-            print(f"  {var}: {settings_data[var]['value_str']}")
-    print("")
+    sys.stdout.write(
+        "DEVICE INFORMATION:\n"
+        f"  Manufacturer: {transmission.device_manufacturer}\n"
+        f"  Model: {transmission.device_model}\n"
+        f"  Serial: {transmission.device_serial}\n"
+        f"  Firmware: {transmission.device_firmware}\n\n"
+    )
+
+    # Bucket the settings by category in one pass (observation order)
+    buckets = defaultdict(list)
+    for var_name, setting in settings_data.items():
+        header = _VAR_TO_CATEGORY.get(var_name)
+        if header:
+            buckets[header].append(f"  {var_name}: {setting['value_str']}")
+
+    for header, _ in CATEGORY_SCHEMA:
+        sys.stdout.write(f"{header}:\n" + "".join(line + "\n" for line in buckets[header]) + "\n")
 
     return True
 
 
 def main():
     """Main test function."""
-    print("\nOpenPace - Settings Panel Widget Test (CLI)")
-    print("=" * 70)
-    print("")
+    sys.stdout.write(f"\nOpenPace - Settings Panel Widget Test (CLI)\n{BANNER}\n\n")
 
     success = test_settings_extraction()
 
     if success:
-        print("=" * 70)
-        print("SUCCESS! Settings panel logic tested successfully.")
-        print("=" * 70)
-        print("\nSettings panel features:")
-        print("  - Organizes settings into logical groups")
-        print("  - Device Information (manufacturer, model, serial)")
-        print("  - Bradycardia Pacing (modes, rates, AV delays)")
-        print("  - Tachycardia Therapy (ICD only, hidden if not present)")
-        print("  - Sensing Configuration (sensitivities, adaptation)")
-        print("  - Lead Channels (amplitudes, pulse widths, polarities)")
-        print("  - Advanced Features (magnet response, capture mgmt)")
-        print("  - Text export functionality")
-        print("")
-        print("To test GUI: python test_settings_panel.py")
-        print("=" * 70)
+        sys.stdout.write(f"""{BANNER}
+SUCCESS! Settings panel logic tested successfully.
+{BANNER}
+
+Settings panel features:
+  - Organizes settings into logical groups
+  - Device Information (manufacturer, model, serial)
+  - Bradycardia Pacing (modes, rates, AV delays)
+  - Tachycardia Therapy (ICD only, hidden if not present)
+  - Sensing Configuration (sensitivities, adaptation)
+  - Lead Channels (amplitudes, pulse widths, polarities)
+  - Advanced Features (magnet response, capture mgmt)
+  - Text export functionality
+
+To test GUI: python test_settings_panel.py
+{BANNER}
+""")
         return 0
     else:
-        print("=" * 70)
-        print("FAILED! Settings panel test failed.")
-        print("=" * 70)
+        sys.stdout.write(f"{BANNER}\nFAILED! Settings panel test failed.\n{BANNER}\n")
         return 1
 
 